@@ -0,0 +1,422 @@
+import datetime
+import threading
+import numpy as np
+import pandas as pd
+
+# Joins title and description so each keyword is searched once per job; it
+# cannot occur in a keyword typed into the alert form
+TEXT_SEPARATOR = "\x00"
+
+def _lower_strings(series):
+    """Lowercase a text column with str.lower(), '' where the value is missing."""
+    return [value.lower() if isinstance(value, str) else '' for value in series.tolist()]
+
+class AlertMatcher:
+    """
+    Evaluates job alerts against a batch of jobs with vectorized masks
+
+    Job text is lowercased once per batch. Every predicate of an alert
+    (keywords, location, job type, date) becomes a boolean mask over the whole
+    batch; masks for a keyword, location or job type are computed once and
+    shared by every alert that uses it. Matches are the same as testing each
+    job with
+
+        all(kw.lower() in title.lower() or kw.lower() in description.lower())
+        and (not location or location.lower() in job location.lower())
+        and (not job_type or job_type.lower() in job job_type.lower())
+        and date_posted >= created_date
+    """
+
+    def __init__(self, jobs_df):
+        self.jobs_df = jobs_df.reset_index(drop=True)
+        self._size = len(self.jobs_df)
+        self._text = None
+        self._titles = None
+        self._descriptions = None
+        self._keyword_masks = {}
+        self._field_masks = {}
+
+        if 'date_posted' in self.jobs_df.columns and self._size:
+            self._dates = pd.to_datetime(self.jobs_df['date_posted']).to_numpy()
+        else:
+            self._dates = None
+        if 'first_seen' in self.jobs_df.columns and self._size:
+            self._first_seen = pd.to_datetime(self.jobs_df['first_seen'], format='ISO8601').to_numpy()
+        else:
+            self._first_seen = None
+
+    def _column(self, name):
+        if name in self.jobs_df.columns:
+            return self.jobs_df[name]
+        return pd.Series([None] * self._size, dtype=object)
+
+    def _contains(self, values, needle):
+        """Mask of the lowercased values that contain `needle`."""
+        # Plain `in` over a list beats both the object and the Arrow .str.contains kernels here
+        return np.fromiter((needle in value for value in values), dtype=bool, count=self._size)
+
+    def job_text(self):
+        """Lowercased title and description of every job, joined by TEXT_SEPARATOR."""
+        if self._text is None:
+            titles = _lower_strings(self._column('title'))
+            descriptions = _lower_strings(self._column('description'))
+            self._text = [title + TEXT_SEPARATOR + description
+                          for title, description in zip(titles, descriptions)]
+        return self._text
+
+    def _keyword_mask(self, keyword):
+        keyword = keyword.lower()
+        mask = self._keyword_masks.get(keyword)
+        if mask is None:
+            if TEXT_SEPARATOR in keyword:
+                if self._titles is None:
+                    self._titles = _lower_strings(self._column('title'))
+                    self._descriptions = _lower_strings(self._column('description'))
+                mask = self._contains(self._titles, keyword) | self._contains(self._descriptions, keyword)
+            else:
+                mask = self._contains(self.job_text(), keyword)
+            self._keyword_masks[keyword] = mask
+        return mask
+
+    def _field_mask(self, field, value):
+        """Mask of jobs whose `field` contains `value`, computed on the distinct values only."""
+        value = value.lower()
+        key = (field, value)
+        mask = self._field_masks.get(key)
+        if mask is None:
+            codes, uniques = pd.factorize(self._column(field).astype(object), use_na_sentinel=True)
+            distinct = np.array([isinstance(unique, str) and value in unique.lower() for unique in uniques] + [False])
+            # Missing values get code -1, which picks the trailing False
+            mask = distinct[codes]
+            self._field_masks[key] = mask
+        return mask
+
+    def match(self, alert):
+        """
+        Find the jobs matching one alert
+
+        Args:
+            alert (dict): Alert with 'keywords', 'location', 'job_type' and 'created_date'
+
+        Returns:
+            numpy.ndarray: Row positions of the matching jobs, in order
+        """
+        mask = self._filter_mask(alert, slice(None))
+        for keyword in alert['keywords']:
+            if not mask.any():
+                break
+            mask &= self._keyword_mask(keyword)
+        return np.flatnonzero(mask)
+
+    def _filter_mask(self, alert, positions, seen_after=None):
+        """Mask over `positions` of the jobs passing the alert's date, location and job type."""
+        if self._dates is None:
+            return np.zeros(self._size, dtype=bool)[positions]
+        mask = self._dates[positions] >= np.datetime64(pd.Timestamp(alert['created_date']))
+        if seen_after is not None and self._first_seen is not None:
+            mask &= self._first_seen[positions] > np.datetime64(pd.Timestamp(seen_after))
+        if alert.get('location'):
+            mask &= self._field_mask('location', alert['location'])[positions]
+        if alert.get('job_type'):
+            mask &= self._field_mask('job_type', alert['job_type'])[positions]
+        return mask
+
+    def filter(self, alert, positions, seen_after=None):
+        """
+        Keep the jobs that pass an alert's date, location and job type tests
+
+        Args:
+            alert (dict): Alert to evaluate
+            positions (numpy.ndarray): Row positions of jobs whose keywords matched
+            seen_after (datetime.datetime, optional): Also drop jobs first seen at
+                or before this time
+
+        Returns:
+            numpy.ndarray: The positions that also pass the other tests
+        """
+        return positions[self._filter_mask(alert, positions, seen_after)]
+
+    def jobs_at(self, positions):
+        """Job dictionaries of the rows at `positions`, in order."""
+        if len(positions) == 0:
+            return []
+        return self.jobs_df.iloc[positions].to_dict('records')
+
+    def matching_jobs(self, alert):
+        """
+        Get the jobs matching one alert as dictionaries
+
+        Args:
+            alert (dict): Alert to evaluate
+
+        Returns:
+            list: Matching job dictionaries, in order
+        """
+        return self.jobs_at(self.match(alert))
+
+def match_alerts(alerts, jobs_df):
+    """
+    Evaluate several alerts against the same jobs
+
+    Args:
+        alerts (list): Alert dictionaries
+        jobs_df (pandas.DataFrame): Jobs to match
+
+    Returns:
+        list: (alert, list of matching job dicts) for every alert, in order
+    """
+    matcher = AlertMatcher(jobs_df)
+    return [(alert, matcher.matching_jobs(alert)) for alert in alerts]
+
+def _parse_alert(alert):
+    """Copy of an alert with its created date as a datetime."""
+    alert = dict(alert)
+    if isinstance(alert.get('created_date'), str):
+        alert['created_date'] = datetime.datetime.fromisoformat(alert['created_date'])
+    return alert
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton reporting which of a set of keywords occur in a text
+
+    Keywords live in a trie that grows as they are added; removing one only
+    clears its output, and the trie is rebuilt once most of it is unused. The
+    goto/failure transitions are compiled into one dict per state (a DFA) the
+    first time the automaton is used after a change, so a scan is a single dict
+    lookup per character whatever the number of keywords.
+    """
+
+    def __init__(self):
+        self._counts = {}
+        self._reset()
+
+    def _reset(self):
+        self._children = [{}]
+        self._outputs = [None]
+        self._delta = None
+        self._found = None
+
+    def __len__(self):
+        return len(self._counts)
+
+    def add(self, keyword):
+        """
+        Add a keyword; adding it again only counts another user of it
+
+        Args:
+            keyword (str): Lowercase keyword
+        """
+        count = self._counts.get(keyword, 0)
+        self._counts[keyword] = count + 1
+        if count == 0:
+            self._insert(keyword)
+            self._delta = None
+
+    def remove(self, keyword):
+        """
+        Drop one user of a keyword, removing it when it has no users left
+
+        Args:
+            keyword (str): Lowercase keyword
+        """
+        count = self._counts.get(keyword, 0)
+        if count > 1:
+            self._counts[keyword] = count - 1
+            return
+        if count == 0:
+            return
+        del self._counts[keyword]
+        self._outputs[self._node(keyword)] = None
+        self._delta = None
+        if len(self._children) > 2 * sum(map(len, self._counts)) + 64:
+            self._reset()
+            for keyword in self._counts:
+                self._insert(keyword)
+
+    def _insert(self, keyword):
+        children = self._children
+        node = 0
+        for char in keyword:
+            child = children[node].get(char)
+            if child is None:
+                child = len(children)
+                children[node][char] = child
+                children.append({})
+                self._outputs.append(None)
+            node = child
+        self._outputs[node] = keyword
+
+    def _node(self, keyword):
+        node = 0
+        for char in keyword:
+            node = self._children[node][char]
+        return node
+
+    def _compile(self):
+        """Build the DFA transitions and the keywords found at each state, breadth first."""
+        children = self._children
+        delta = [None] * len(children)
+        failure = [0] * len(children)
+        found = [()] * len(children)
+        delta[0] = dict(children[0])
+        queue = list(children[0].values())
+        for node in queue:
+            own = self._outputs[node]
+            found[node] = ((own,) if own is not None else ()) + found[failure[node]]
+            # A state moves like its failure state except along its own trie edges
+            delta[node] = dict(delta[failure[node]], **children[node]) if children[node] else delta[failure[node]]
+            for char, child in children[node].items():
+                failure[child] = delta[failure[node]].get(char, 0)
+                queue.append(child)
+        self._delta = delta
+        self._found = found
+
+    def scan(self, text):
+        """
+        Find the keywords occurring in a text
+
+        Args:
+            text (str): Lowercased text
+
+        Returns:
+            set: Keywords found
+        """
+        if self._delta is None:
+            self._compile()
+        delta = self._delta
+        found = self._found
+        hits = set()
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if found[state]:
+                hits.update(found[state])
+        return hits
+
+class AlertIndex:
+    """
+    Matches a set of alerts against jobs with a single scan of each job's text
+
+    The keywords of every alert are compiled into one KeywordAutomaton, so each
+    job's title and description are read once no matter how many alerts there
+    are. The scan records which jobs contain each keyword, an alert's keyword
+    set is satisfied by the jobs containing all of its keywords, and its
+    location, job type and date are then checked with the same tests as
+    AlertMatcher. Alerts are added and removed one at a time.
+    """
+
+    def __init__(self, alerts=()):
+        self._lock = threading.RLock()
+        self._automaton = KeywordAutomaton()
+        self._alerts = {}
+        self._keywords = {}
+        for alert in alerts:
+            self.add_alert(alert)
+
+    def __len__(self):
+        return len(self._alerts)
+
+    def add_alert(self, alert):
+        """
+        Add an alert, replacing an earlier version with the same ID
+
+        Args:
+            alert (dict): Alert with 'id', 'keywords', 'location', 'job_type' and 'created_date'
+        """
+        alert = _parse_alert(alert)
+        # An empty keyword is contained in every text, so it never narrows the match
+        keywords = frozenset(keyword.lower() for keyword in alert.get('keywords') or [] if keyword)
+        with self._lock:
+            self.remove_alert(alert['id'])
+            self._alerts[alert['id']] = alert
+            self._keywords[alert['id']] = keywords
+            for keyword in keywords:
+                self._automaton.add(keyword)
+
+    def remove_alert(self, alert_id):
+        """
+        Remove an alert
+
+        Args:
+            alert_id (str): ID of the alert to remove
+        """
+        with self._lock:
+            if self._alerts.pop(alert_id, None) is None:
+                return
+            for keyword in self._keywords.pop(alert_id):
+                self._automaton.remove(keyword)
+
+    def sync(self, alerts):
+        """
+        Bring the index in line with a full list of alerts, touching only the ones that changed
+
+        Args:
+            alerts (list): Current alert dictionaries
+        """
+        with self._lock:
+            current = {alert['id']: alert for alert in alerts}
+            for alert_id in [alert_id for alert_id in self._alerts if alert_id not in current]:
+                self.remove_alert(alert_id)
+            for alert_id, alert in current.items():
+                stored = self._alerts.get(alert_id)
+                if stored is None or stored != _parse_alert(alert):
+                    self.add_alert(alert)
+
+    def match(self, jobs_df, watermarks=None):
+        """
+        Evaluate every alert against a batch of jobs
+
+        Args:
+            jobs_df (pandas.DataFrame): Jobs to match
+            watermarks (dict, optional): Alert ID -> datetime; an alert only
+                matches jobs first seen after its watermark
+
+        Returns:
+            list: (alert, list of matching job dicts) for every alert
+        """
+        matcher = AlertMatcher(jobs_df)
+        return [(alert, matcher.jobs_at(positions)) for alert, positions in self.match_positions(matcher, watermarks)]
+
+    def match_positions(self, matcher, watermarks=None):
+        """
+        Evaluate every alert against the jobs of an AlertMatcher
+
+        Args:
+            matcher (AlertMatcher): Batch of jobs to match
+            watermarks (dict, optional): Alert ID -> datetime, see match
+
+        Returns:
+            list: (alert, numpy.ndarray of matching row positions) for every alert
+        """
+        with self._lock:
+            alerts = [(alert, self._keywords[alert_id]) for alert_id, alert in self._alerts.items()]
+            # Positions of the jobs containing each keyword, from one scan per job
+            keyword_positions = {}
+            if len(self._automaton) and len(matcher.jobs_df):
+                scan = self._automaton.scan
+                for position, text in enumerate(matcher.job_text()):
+                    for keyword in scan(text):
+                        positions = keyword_positions.get(keyword)
+                        if positions is None:
+                            keyword_positions[keyword] = [position]
+                        else:
+                            positions.append(position)
+
+        every_job = np.arange(len(matcher.jobs_df))
+        empty = np.array([], dtype=np.int64)
+        arrays = {keyword: np.array(positions, dtype=np.int64) for keyword, positions in keyword_positions.items()}
+        # Alerts often share a keyword set; intersect each set's positions once, rarest keyword first
+        keyword_set_positions = {}
+        results = []
+        for alert, keywords in alerts:
+            positions = keyword_set_positions.get(keywords)
+            if positions is None:
+                positions = every_job
+                for keyword in sorted(keywords, key=lambda keyword: len(arrays.get(keyword, empty))):
+                    if len(positions) == 0:
+                        break
+                    positions = np.intersect1d(positions, arrays.get(keyword, empty), assume_unique=True)
+                keyword_set_positions[keywords] = positions
+            seen_after = watermarks.get(alert['id']) if watermarks else None
+            results.append((alert, matcher.filter(alert, positions, seen_after)))
+        return results
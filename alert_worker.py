@@ -0,0 +1,291 @@
+"""
+Job alert worker.
+
+Crawls job sources for the saved alerts on a fixed interval, then checks the
+alerts and queues one email per recipient with the new matches of all their
+alerts in the outbox, which a pool of delivery threads drains in the background. Run exactly one
+of these next to the Streamlit app; a lock file makes any further instance
+exit straight away, and a heartbeat file tells the app whether the worker is
+alive and when it last ran.
+
+Usage:
+    python alert_worker.py [--interval SECONDS] [--once] [--no-crawl]
+"""
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import datetime
+import threading
+import pandas as pd
+import schedule
+
+from data_manager import (
+    load_jobs, load_alerts, get_alert_index,
+    load_alert_state, alert_watermark, advance_alert_watermarks
+)
+from notification import email_configured
+from crawler import crawl
+import outbox
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+ALERT_CHECK_INTERVAL = int(os.getenv("JOBFINDER_ALERT_INTERVAL", "3600"))
+WORKER_LOCK_PATH = os.getenv("JOBFINDER_WORKER_LOCK", "alert_worker.lock")
+HEARTBEAT_PATH = os.getenv("JOBFINDER_WORKER_HEARTBEAT", "alert_worker_heartbeat.json")
+# Scrape the alerts' searches before every check (see crawler.py)
+CRAWL_ENABLED = os.getenv("JOBFINDER_CRAWL", "1") != "0"
+# Combine the matches of all alerts with the same email address into one
+# email per check; "0" sends one email per alert
+ALERT_DIGEST = os.getenv("JOBFINDER_ALERT_DIGEST", "1") != "0"
+
+# The heartbeat is refreshed this often, also during a check; a heartbeat
+# older than HEARTBEAT_STALE_AFTER means the worker is gone
+HEARTBEAT_INTERVAL = 30
+HEARTBEAT_STALE_AFTER = 3 * HEARTBEAT_INTERVAL
+
+def check_job_alerts():
+    """
+    Queue an email for every recipient with the jobs that are new to their alerts since the last check
+    """
+    alerts = load_alerts()
+    if len(alerts) == 0:
+        return
+
+    # An email queued just before a crash counts as notified even if its
+    # watermark was not advanced yet
+    state = load_alert_state()
+    watermarks = {alert['id']: alert_watermark(alert, state) for alert in alerts}
+    repaired = outbox.enqueued_watermarks(after=min(watermarks.values()))
+    if repaired:
+        advance_alert_watermarks(repaired)
+        state = load_alert_state()
+        watermarks = {alert['id']: alert_watermark(alert, state) for alert in alerts}
+
+    # Each alert only looks at jobs first seen after its watermark, so jobs
+    # that were already notified are not loaded or matched again
+
+    # Only jobs posted after the oldest alert was created can match, and only
+    # the matched fields plus what the email shows are needed
+    current_jobs = load_jobs(
+        columns=['title', 'company', 'location', 'description', 'url', 'job_type', 'date_posted', 'first_seen'],
+        since=min(alert['created_date'] for alert in alerts),
+        first_seen_since=min(watermarks.values())
+    )
+
+    if current_jobs.empty:
+        return
+    first_seen = current_jobs['first_seen'].dropna() if 'first_seen' in current_jobs.columns else None
+    if first_seen is None or first_seen.empty:
+        # Without first_seen times the watermarks cannot move; the jobs are
+        # evaluated once a save stores their first_seen
+        print("Job alerts not checked: the loaded jobs have no first_seen times")
+        return
+
+    # Every job up to the newest one loaded has now been evaluated for every alert
+    evaluated_until = pd.to_datetime(first_seen, format='ISO8601').max().to_pydatetime()
+
+    # Each job's text is scanned once for the keywords of every alert
+    emails = {}
+    for alert, matching_jobs in get_alert_index().match(current_jobs, watermarks):
+        if alert['id'] not in watermarks:
+            # Saved after this run loaded the alerts; it is picked up next time
+            continue
+        if matching_jobs and alert['email']:
+            recipient = alert['email'].strip()
+            group = recipient.lower() if ALERT_DIGEST else alert['id']
+            emails.setdefault(group, (recipient, []))[1].append((alert, matching_jobs))
+
+    for recipient, alert_matches in emails.values():
+        # The email is durable once queued; delivery retries it from the outbox
+        outbox.enqueue(recipient, alert_matches, evaluated_until)
+    advance_alert_watermarks({alert_id: evaluated_until for alert_id in watermarks})
+
+def acquire_lock(path=WORKER_LOCK_PATH):
+    """
+    Take the single-instance lock
+
+    The lock is held by the open file, so the OS releases it when the process
+    dies, however it dies.
+
+    Args:
+        path (str): Lock file path
+
+    Returns:
+        file: Open lock file to keep for the life of the worker, or None if
+            another worker holds the lock
+    """
+    lock_file = open(path, 'a+')
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        lock_file.close()
+        return None
+
+    lock_file.seek(0)
+    lock_file.truncate()
+    lock_file.write(str(os.getpid()))
+    lock_file.flush()
+    return lock_file
+
+def write_heartbeat(status):
+    """
+    Atomically replace the heartbeat file
+
+    Args:
+        status (dict): Worker status; 'pid' and 'heartbeat' are filled in
+    """
+    status = dict(status, pid=os.getpid(), heartbeat=datetime.datetime.now().isoformat())
+    tmp_path = f"{HEARTBEAT_PATH}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(status, f)
+        os.replace(tmp_path, HEARTBEAT_PATH)
+    except Exception as e:
+        print(f"Error writing worker heartbeat: {e}")
+
+def read_heartbeat():
+    """
+    Read the worker's status for display
+
+    Returns:
+        dict: Last heartbeat written by the worker with an added 'alive' flag,
+            or None if no worker has ever run here
+    """
+    try:
+        with open(HEARTBEAT_PATH, 'r') as f:
+            status = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    age = datetime.datetime.now() - datetime.datetime.fromisoformat(status['heartbeat'])
+    status['alive'] = status.get('state') != 'stopped' and age.total_seconds() < HEARTBEAT_STALE_AFTER
+    return status
+
+class AlertWorker:
+    """
+    Runs crawl and check_job_alerts every `interval` seconds until asked to stop
+
+    Queued emails are sent by an outbox.OutboxDelivery pool running alongside
+    the checks. A stop request (SIGTERM/SIGINT) lets a running check and the
+    emails being sent finish before the worker exits.
+    """
+
+    def __init__(self, interval=ALERT_CHECK_INTERVAL, crawl_first=CRAWL_ENABLED):
+        self.interval = interval
+        self.crawl_first = crawl_first
+        self._stop = threading.Event()
+        self._scheduler = schedule.Scheduler()
+        self._status = {
+            'state': 'starting',
+            'interval': interval,
+            'started': datetime.datetime.now().isoformat(),
+            'last_run_started': None,
+            'last_run_finished': None,
+            'last_run_seconds': None,
+            'last_error': None,
+            'last_crawl': None,
+            'next_run': None,
+            'outbox': None,
+        }
+
+    def _write_heartbeat(self):
+        self._status['outbox'] = outbox.counts()
+        write_heartbeat(self._status)
+
+    def _beat(self):
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            self._write_heartbeat()
+
+    def stop(self, *args):
+        """Ask the worker to exit after the current check."""
+        self._stop.set()
+
+    def run_check(self):
+        """Run one alert check, recording its outcome in the heartbeat."""
+        started = time.monotonic()
+        self._status.update(state='checking', last_run_started=datetime.datetime.now().isoformat())
+        self._write_heartbeat()
+        try:
+            if self.crawl_first:
+                summary = crawl()
+                self._status['last_crawl'] = {key: summary[key] for key in ('alerts', 'queries', 'jobs')}
+            check_job_alerts()
+            self._status['last_error'] = None
+        except Exception as e:
+            print(f"Error checking job alerts: {e}")
+            self._status['last_error'] = str(e)
+        self._status.update(
+            state='idle',
+            last_run_finished=datetime.datetime.now().isoformat(),
+            last_run_seconds=round(time.monotonic() - started, 1),
+        )
+        self._write_heartbeat()
+
+    def run(self, once=False):
+        """
+        Check alerts now and then on every interval until stopped
+
+        Args:
+            once (bool): Exit after the first check
+        """
+        delivery = None
+        if not email_configured():
+            print(f"Set EMAIL_PASSWORD to send alert emails; until then they wait in {outbox.OUTBOX_DIR}/pending")
+        elif not once:
+            delivery = outbox.OutboxDelivery()
+            delivery.start()
+
+        threading.Thread(target=self._beat, daemon=True).start()
+        self._scheduler.every(self.interval).seconds.do(self.run_check)
+        self.run_check()
+        while not once and not self._stop.is_set():
+            self._scheduler.run_pending()
+            self._status['next_run'] = self._scheduler.next_run.isoformat()
+            self._stop.wait(max(self._scheduler.idle_seconds, 1))
+        self._stop.set()
+
+        if delivery is not None:
+            delivery.stop()
+        elif once and email_configured():
+            outbox.recover_inflight()
+            outbox.drain()
+        self._status['state'] = 'stopped'
+        self._write_heartbeat()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Job alert worker")
+    parser.add_argument('--interval', type=int, default=ALERT_CHECK_INTERVAL,
+                        help="Seconds between alert checks")
+    parser.add_argument('--once', action='store_true', help="Check alerts once and exit")
+    parser.add_argument('--no-crawl', action='store_true', help="Only match jobs already stored")
+    args = parser.parse_args(argv)
+
+    lock_file = acquire_lock()
+    if lock_file is None:
+        print(f"Another alert worker holds {WORKER_LOCK_PATH}; exiting")
+        return 1
+
+    try:
+        worker = AlertWorker(args.interval, crawl_first=CRAWL_ENABLED and not args.no_crawl)
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+        if not args.once:
+            print(f"Checking job alerts every {args.interval} seconds")
+        worker.run(once=args.once)
+        return 0
+    finally:
+        lock_file.close()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,16 +1,13 @@
 import streamlit as st
-import pandas as pd
 import datetime
-from scrapers import scrape_indeed, scrape_linkedin
+from scrapers import search_jobs
 from data_manager import (
-    load_jobs, save_jobs, load_saved_jobs, save_job_to_saved,
+    load_latest_jobs, save_jobs, search_local_jobs, load_saved_jobs, save_job_to_saved,
     remove_job_from_saved, load_applied_jobs, add_job_to_applied,
     load_alerts, save_alert, delete_alert
 )
-from notification import send_job_alert_email
-import schedule
-import time
-import threading
+from dedup import dedupe_jobs
+from alert_worker import read_heartbeat
 import uuid
 
 # Page configuration
@@ -22,7 +19,7 @@ st.set_page_config(
 
 # Initialize session state variables if they don't exist
 if 'jobs_df' not in st.session_state:
-    st.session_state.jobs_df = load_jobs()
+    st.session_state.jobs_df = load_latest_jobs()
 if 'saved_jobs' not in st.session_state:
     st.session_state.saved_jobs = load_saved_jobs()
 if 'applied_jobs' not in st.session_state:
@@ -39,41 +36,8 @@ if 'search_performed' not in st.session_state:
     st.session_state.search_performed = False
 if 'email_address' not in st.session_state:
     st.session_state.email_address = ""
-
-# Function to run scheduled tasks
-def run_scheduled_tasks():
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
-
-# Define job alert checker
-def check_job_alerts():
-    alerts = load_alerts()
-    current_jobs = load_jobs()
-    
-    if current_jobs.empty or len(alerts) == 0:
-        return
-        
-    for alert in alerts:
-        matching_jobs = []
-        for index, job in current_jobs.iterrows():
-            keywords_match = all(kw.lower() in job['title'].lower() or kw.lower() in job['description'].lower() 
-                               for kw in alert['keywords'])
-            location_match = True if not alert['location'] else alert['location'].lower() in job['location'].lower()
-            job_type_match = True if not alert['job_type'] else alert['job_type'].lower() in job['job_type'].lower()
-            
-            if keywords_match and location_match and job_type_match and job['date_posted'] >= alert['created_date']:
-                matching_jobs.append(job.to_dict())
-        
-        if matching_jobs and alert['email']:
-            send_job_alert_email(alert['email'], alert['name'], matching_jobs)
-
-# Schedule alert checking to run every hour
-schedule.every(1).hours.do(check_job_alerts)
-
-# Start scheduler in a separate thread
-scheduler_thread = threading.Thread(target=run_scheduled_tasks, daemon=True)
-scheduler_thread.start()
+if 'search_report' not in st.session_state:
+    st.session_state.search_report = []
 
 # Sidebar for search filters and navigation
 with st.sidebar:
@@ -121,29 +85,19 @@ with st.sidebar:
         source_options = ['All', 'Indeed', 'LinkedIn']
         source = st.selectbox("Source", source_options)
         
+        # Stored jobs are answered instantly from the local archive; fresh results scrape the job sites
+        results_from = st.radio("Results", ['Stored jobs', 'Fresh from job sites'])
+        
         if st.button("Search", type="primary", use_container_width=True):
             # Clear previous search results
             st.session_state.search_performed = True
             
             # Convert keywords to list
             keyword_list = [k.strip() for k in keywords.split(',')] if keywords else []
+            sources = ['Indeed', 'LinkedIn'] if source == 'All' else [source]
             
-            # Execute the scraping based on selected source
-            if source == 'All' or source == 'Indeed':
-                indeed_jobs = scrape_indeed(keyword_list, location, job_type if job_type != 'Any' else None)
-            else:
-                indeed_jobs = pd.DataFrame()
-                
-            if source == 'All' or source == 'LinkedIn':
-                linkedin_jobs = scrape_linkedin(keyword_list, location, job_type if job_type != 'Any' else None)
-            else:
-                linkedin_jobs = pd.DataFrame()
-            
-            # Combine results
-            combined_jobs = pd.concat([indeed_jobs, linkedin_jobs], ignore_index=True)
-            
-            # Filter by date if selected
-            if date_posted != 'Any time' and not combined_jobs.empty:
+            cutoff_date = None
+            if date_posted != 'Any time':
                 today = datetime.datetime.now()
                 if date_posted == 'Past 24 hours':
                     cutoff_date = today - datetime.timedelta(days=1)
@@ -151,9 +105,29 @@ with st.sidebar:
                     cutoff_date = today - datetime.timedelta(days=7)
                 elif date_posted == 'Past month':
                     cutoff_date = today - datetime.timedelta(days=30)
-                
+            
+            if results_from == 'Stored jobs':
+                # Ranked full-text search over the jobs scraped so far
+                st.session_state.search_report = []
+                st.session_state.jobs_df = search_local_jobs(
+                    keyword_list, location, job_type if job_type != 'Any' else None,
+                    sources=sources, since=cutoff_date
+                )
+                st.rerun()
+            
+            # Execute the scraping on the selected sources concurrently
+            combined_jobs, search_report = search_jobs(
+                keyword_list, location, job_type if job_type != 'Any' else None, sources=sources
+            )
+            st.session_state.search_report = search_report
+            
+            # Filter by date if selected
+            if cutoff_date is not None and not combined_jobs.empty:
                 combined_jobs = combined_jobs[combined_jobs['date_posted'] >= cutoff_date]
             
+            # Collapse the same posting found on several sources or with different tracking links
+            combined_jobs = dedupe_jobs(combined_jobs)
+            
             # Update the session state with the new jobs
             st.session_state.jobs_df = combined_jobs
             
@@ -260,6 +234,28 @@ elif st.session_state.show_alerts:
                 st.success("Alert created successfully!")
                 st.rerun()
     
+    # Alerts are checked and emailed by alert_worker.py, not by this app
+    worker_status = read_heartbeat()
+    if worker_status is None:
+        st.warning("The alert worker has not run yet. Start it with `python alert_worker.py` to receive alert emails.")
+    elif not worker_status['alive']:
+        st.warning(f"The alert worker is not running (last seen {worker_status['heartbeat'][:16].replace('T', ' ')}).")
+    else:
+        last_run = worker_status.get('last_run_finished')
+        last_crawl = worker_status.get('last_crawl')
+        st.caption(f"Alert worker running; last check "
+                   f"{last_run[:16].replace('T', ' ') if last_run else 'in progress'}."
+                   + (f" It ran {last_crawl['queries']} searches for {last_crawl['alerts']} alerts"
+                      f" and found {last_crawl['jobs']} jobs." if last_crawl else ""))
+        if worker_status.get('last_error'):
+            st.warning(f"The last alert check failed: {worker_status['last_error']}")
+        queued = worker_status.get('outbox') or {}
+        if queued.get('pending'):
+            st.caption(f"{queued['pending']} alert emails waiting to be sent.")
+        if queued.get('dead'):
+            st.warning(f"{queued['dead']} alert emails could not be delivered. "
+                       "Run `python outbox.py retry-dead` to try them again.")
+    
     # Display existing alerts
     st.subheader("Your Alerts")
     
@@ -299,6 +295,13 @@ else:
         # Display job results
         st.write(f"Found {len(st.session_state.jobs_df)} jobs matching your criteria")
         
+        # Per-source timing and status of the last search
+        if st.session_state.search_report:
+            st.caption(" | ".join(
+                f"{entry['source']}: {entry['jobs']} jobs in {entry['elapsed']}s ({entry['status']})"
+                for entry in st.session_state.search_report
+            ))
+        
         for index, job in st.session_state.jobs_df.iterrows():
             with st.container():
                 col1, col2 = st.columns([4, 1])
@@ -0,0 +1,193 @@
+"""
+Alert matching benchmark.
+
+Matches a synthetic set of alerts against a synthetic job archive with the
+alert_matcher engines (per-alert masks and the keyword automaton) and compares
+the results with the per-row loop check_job_alerts used before. The per-row loop is too slow for the full sizes, so it runs on a
+sample, and its cost at the full size is extrapolated per (job, alert) pair.
+
+Usage:
+    python -m benchmarks.bench_alerts [--jobs 100000] [--alerts 1000]
+                                      [--reference-jobs 2000] [--reference-alerts 50]
+"""
+import argparse
+import datetime
+import json
+import random
+import sys
+import time
+
+import pandas as pd
+
+from alert_matcher import AlertIndex, AlertMatcher, match_alerts
+from benchmarks.bench_memory import make_records
+from models import jobs_to_frame
+
+# Skills named in descriptions and alerts; a few are common, most are rare
+SKILLS = ["python", "java", "sql", "aws", "react", "django", "kubernetes", "spark", "golang", "rust",
+          "terraform", "pandas", "tableau", "flutter", "kotlin", "swift", "scala", "hadoop", "airflow", "kafka"]
+SKILLS += [f"skill{i}" for i in range(480)]
+
+def _skill(rng):
+    # Zipf-like: the i-th skill is picked with probability ~ 1/(i+1)
+    return SKILLS[min(int(len(SKILLS) ** rng.random()) - 1, len(SKILLS) - 1)]
+
+def make_jobs(count, seed=7):
+    """
+    Generate jobs whose descriptions mention a handful of skills
+
+    Args:
+        count (int): Number of jobs
+        seed (int): Random seed
+
+    Returns:
+        pandas.DataFrame: Jobs in the compact schema
+    """
+    rng = random.Random(seed)
+    records = make_records(count, seed)
+    for record in records:
+        skills = " ".join(_skill(rng) for _ in range(rng.randint(3, 8)))
+        record['title'] = f"{_skill(rng).title()} {record['title']}"
+        record['description'] = f"{skills} {record['description']}"
+    return jobs_to_frame(records)
+
+def make_alerts(count, locations, seed=11):
+    """
+    Generate alerts shaped like the ones the app creates
+
+    Args:
+        count (int): Number of alerts
+        locations (list): Job locations to pick alert locations from
+        seed (int): Random seed
+
+    Returns:
+        list: Alert dictionaries
+    """
+    rng = random.Random(seed)
+    now = datetime.datetime.now()
+    alerts = []
+    for i in range(count):
+        location = rng.choice(locations).split(',')[0] if rng.random() < 0.5 else ''
+        alerts.append({
+            'id': str(i),
+            'name': f"Alert {i}",
+            'keywords': [_skill(rng) for _ in range(rng.randint(1, 3))],
+            'location': location,
+            'job_type': rng.choice([None, None, 'Full-time', 'Contract', 'Remote']),
+            'email': f"user{i}@example.com",
+            'created_date': now - datetime.timedelta(days=rng.randint(0, 30)),
+        })
+    return alerts
+
+def reference_matches(alerts, jobs_df):
+    """The per-row matching loop check_job_alerts used before alert_matcher."""
+    results = []
+    for alert in alerts:
+        matching_jobs = []
+        for index, job in jobs_df.iterrows():
+            keywords_match = all(kw.lower() in job['title'].lower() or kw.lower() in job['description'].lower()
+                                 for kw in alert['keywords'])
+            location_match = True if not alert['location'] else alert['location'].lower() in job['location'].lower()
+            job_type_match = True if not alert['job_type'] else alert['job_type'].lower() in job['job_type'].lower()
+
+            if keywords_match and location_match and job_type_match and job['date_posted'] >= alert['created_date']:
+                matching_jobs.append(job.to_dict())
+        results.append((alert, matching_jobs))
+    return results
+
+def _match_urls(results):
+    return [[job['url'] for job in jobs] for alert, jobs in results]
+
+def bench_alerts(job_count, alert_count, reference_jobs, reference_alerts):
+    """
+    Time alert matching and check it against the per-row loop
+
+    Args:
+        job_count (int): Jobs in the archive
+        alert_count (int): Alerts to evaluate
+        reference_jobs (int): Jobs in the sample given to the per-row loop
+        reference_alerts (int): Alerts in that sample
+
+    Returns:
+        list: One result dict per engine
+    """
+    jobs_df = make_jobs(job_count)
+    alerts = make_alerts(alert_count, list(jobs_df['location'].astype(object).unique()))
+
+    # Both engines on the sample, to check they agree
+    sample_df = jobs_df.head(reference_jobs)
+    sample_alerts = alerts[:reference_alerts]
+    started = time.perf_counter()
+    expected = reference_matches(sample_alerts, sample_df)
+    reference_elapsed = time.perf_counter() - started
+    expected_urls = _match_urls(expected)
+    masks_match_reference = _match_urls(match_alerts(sample_alerts, sample_df)) == expected_urls
+    automaton_match_reference = _match_urls(AlertIndex(sample_alerts).match(sample_df)) == expected_urls
+
+    # Time finding the matches; building job dicts for emails is the same work for any engine
+    started = time.perf_counter()
+    matcher = AlertMatcher(jobs_df)
+    matches = sum(len(matcher.match(alert)) for alert in alerts)
+    elapsed = time.perf_counter() - started
+
+    # The automaton finds every alert's keyword matches in one scan of the jobs
+    index = AlertIndex(alerts)
+    started = time.perf_counter()
+    automaton_matches = sum(len(positions) for alert, positions in index.match_positions(AlertMatcher(jobs_df)))
+    automaton_elapsed = time.perf_counter() - started
+
+    pairs = job_count * alert_count
+    sample_pairs = len(sample_df) * len(sample_alerts)
+    return [
+        {
+            'engine': 'per-row loop (before)',
+            'jobs': len(sample_df),
+            'alerts': len(sample_alerts),
+            'seconds': round(reference_elapsed, 3),
+            'estimated_seconds_at_full_size': round(reference_elapsed / sample_pairs * pairs, 1),
+        },
+        {
+            'engine': 'masks',
+            'jobs': job_count,
+            'alerts': alert_count,
+            'seconds': round(elapsed, 3),
+            'matches': matches,
+            'matches_reference': masks_match_reference,
+        },
+        {
+            'engine': 'automaton',
+            'jobs': job_count,
+            'alerts': alert_count,
+            'seconds': round(automaton_elapsed, 3),
+            'matches': automaton_matches,
+            'matches_reference': automaton_match_reference,
+        },
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alert matching benchmark")
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--alerts', type=int, default=1000)
+    parser.add_argument('--reference-jobs', type=int, default=2000)
+    parser.add_argument('--reference-alerts', type=int, default=50)
+    parser.add_argument('--output', help="Write results to this JSON file instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = {
+        'python': sys.version.split()[0],
+        'pandas': pd.__version__,
+        'alerts': bench_alerts(args.jobs, args.alerts, args.reference_jobs, args.reference_alerts),
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    # Fail loudly when the engine drifts from the per-row loop
+    return 0 if all(r.get('matches_reference', True) for r in results['alerts']) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Memory footprint of the job representations.
+
+Builds a synthetic set of scraped jobs and measures the bytes per job held by
+each representation: plain dicts, models.Job objects, the DataFrames load_jobs
+used to build (object columns on pandas 2.x, str columns on pandas 3) and the
+compact typed DataFrame.
+
+Usage:
+    python -m benchmarks.bench_memory [--jobs 100000] [--output results.json]
+"""
+import argparse
+import datetime
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from models import Job, jobs_to_frame, frame_to_jobs
+
+WORDS = ("python java senior junior engineer developer data backend frontend cloud platform "
+         "team build design scalable services customers product experience years required").split()
+
+def make_records(count, seed=7):
+    """
+    Generate job dictionaries shaped like the scrapers' output
+
+    Args:
+        count (int): Number of jobs
+        seed (int): Random seed
+
+    Returns:
+        list: Job dictionaries with dates as datetime objects
+    """
+    rng = random.Random(seed)
+    companies = [f"Company {i} Pvt Ltd" for i in range(max(1, count // 200))]
+    locations = [f"City {i}, State {i % 30}" for i in range(60)]
+    now = datetime.datetime.now()
+    records = []
+    for i in range(count):
+        records.append({
+            'title': " ".join(rng.choices(WORDS, k=4)).title(),
+            'company': rng.choice(companies),
+            'location': rng.choice(locations),
+            'description': " ".join(rng.choices(WORDS, k=70))[:500] + "...",
+            'url': f"https://www.linkedin.com/jobs/view/{1000000 + i}",
+            'job_type': rng.choice(['Full-time', 'Part-time', 'Contract', 'Remote']),
+            'date_posted': now - datetime.timedelta(days=rng.randint(0, 30), seconds=rng.randint(0, 86400)),
+            'source': rng.choice(['Indeed', 'LinkedIn']),
+        })
+    return records
+
+def _traced_bytes(build):
+    """Bytes allocated by the Python objects `build` returns, and its run time."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - started
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size, elapsed
+
+def bench_memory(count):
+    """
+    Measure bytes per job for each representation
+
+    Args:
+        count (int): Number of jobs
+
+    Returns:
+        list: One result dict per representation
+    """
+    # Round-trip through JSON so every string is its own object, as after json.load
+    records = json.loads(json.dumps(make_records(count), default=lambda value: value.isoformat()))
+    for record in records:
+        record['date_posted'] = datetime.datetime.fromisoformat(record['date_posted'])
+
+    results = []
+    def add(name, size, elapsed):
+        results.append({
+            'representation': name,
+            'jobs': count,
+            'bytes': size,
+            'bytes_per_job': round(size / count, 1),
+            'build_sec': round(elapsed, 4) if elapsed is not None else None,
+        })
+
+    # Both record types point at the same strings and datetimes; count those once
+    payload = sum(sys.getsizeof(value) for record in records for value in record.values())
+
+    dicts, size, elapsed = _traced_bytes(lambda: [dict(record) for record in records])
+    add('dicts', size + payload, elapsed)
+    del dicts
+
+    jobs, size, elapsed = _traced_bytes(lambda: [Job.from_dict(record) for record in records])
+    add('Job objects', size + payload, elapsed)
+
+    # What load_jobs built before: pandas 2.x keeps text in object columns,
+    # pandas 3 in Arrow-backed str columns
+    text_columns = [column for column in records[0] if column != 'date_posted']
+    started = time.perf_counter()
+    object_df = pd.DataFrame(records).astype({column: object for column in text_columns})
+    object_df['date_posted'] = pd.to_datetime(object_df['date_posted'])
+    add('DataFrame (object columns)', int(object_df.memory_usage(deep=True).sum()), time.perf_counter() - started)
+    del object_df
+
+    started = time.perf_counter()
+    plain_df = pd.DataFrame(records)
+    plain_df['date_posted'] = pd.to_datetime(plain_df['date_posted'])
+    add('DataFrame (default dtypes)', int(plain_df.memory_usage(deep=True).sum()), time.perf_counter() - started)
+    del plain_df
+
+    started = time.perf_counter()
+    typed_df = jobs_to_frame(records)
+    add('DataFrame (compact schema)', int(typed_df.memory_usage(deep=True).sum()), time.perf_counter() - started)
+
+    started = time.perf_counter()
+    typed_from_jobs = jobs_to_frame(jobs)
+    frame_to_jobs(typed_from_jobs)
+    results.append({
+        'representation': 'Job objects -> DataFrame -> Job objects',
+        'jobs': count,
+        'round_trip_sec': round(time.perf_counter() - started, 4),
+    })
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Job representation memory benchmark")
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--output', help="Write results to this JSON file instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = {
+        'python': sys.version.split()[0],
+        'pandas': pd.__version__,
+        'memory': bench_memory(args.jobs),
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""
+Offline scraper benchmarks.
+
+Replays the recorded pages in benchmarks/fixtures through a local HTTP
+stand-in for Indeed and LinkedIn, so scrape_indeed, scrape_linkedin and
+get_detailed_job_description can be measured without touching the real sites.
+
+Usage:
+    python -m benchmarks.bench_scrapers [--backends fast reference] [--workers 1 8]
+                                        [--latency-ms 50] [--output results.json]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+import data_manager
+import http_cache
+import rate_limiter
+import scrapers
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Host names in the recorded pages that are rewritten to point at the stand-in
+RECORDED_HOSTS = ("https://in.linkedin.com", "https://www.linkedin.com", "https://www.indeed.com")
+
+def load_fixture(name):
+    """
+    Read a recorded page from the fixtures directory
+
+    Args:
+        name (str): File name inside benchmarks/fixtures
+
+    Returns:
+        str: Page HTML
+    """
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+class FixtureServer:
+    """
+    Local HTTP stand-in serving the recorded search and detail pages
+
+    Search pages are served for the first `result_pages` pages (by the 'start'
+    parameter) and empty pages after that. Every response can be delayed by a
+    fixed latency to model network round trips.
+    """
+
+    def __init__(self, latency_ms=0, result_pages=1):
+        self.latency = latency_ms / 1000.0
+        self.result_pages = result_pages
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_port}"
+
+        # Point links in the recorded pages at this server
+        self.pages = {}
+        for key, name in (('indeed', 'indeed_search.html'), ('linkedin', 'linkedin_search.html'),
+                          ('detail', 'job_detail.html')):
+            html = load_fixture(name)
+            for host in RECORDED_HOSTS:
+                html = html.replace(host, self.base_url)
+            self.pages[key] = html.encode('utf-8')
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                parts = urlsplit(self.path)
+                start = int(dict(parse_qsl(parts.query)).get('start', 0))
+                if parts.path == '/jobs':
+                    page_size = scrapers.INDEED_PAGE_SIZE
+                    body = server.pages['indeed'] if start < server.result_pages * page_size else b'<html></html>'
+                elif parts.path == '/jobs/search':
+                    page_size = scrapers.LINKEDIN_PAGE_SIZE
+                    body = server.pages['linkedin'] if start < server.result_pages * page_size else b'<html></html>'
+                else:
+                    body = server.pages['detail']
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+def _strip_dates(jobs):
+    # date_posted is randomly generated per card, so it is left out of comparisons
+    return [{k: v for k, v in job.items() if k != 'date_posted'} for job in jobs]
+
+def bench_parsers(backends, repeat):
+    """
+    Measure in-process parse throughput of each backend on the recorded pages
+
+    Args:
+        backends (list): Keys of scrapers.PARSER_BACKENDS to measure
+        repeat (int): Number of times each page is parsed
+
+    Returns:
+        list: One result dict per (backend, source)
+    """
+    pages = {
+        'Indeed': (load_fixture('indeed_search.html'), 0),
+        'LinkedIn': (load_fixture('linkedin_search.html'), 1),
+    }
+    results = []
+    for source, (html, parser_index) in pages.items():
+        reference = _strip_dates(scrapers.PARSER_BACKENDS['reference'][parser_index](html))
+        for backend in backends:
+            parse_page = scrapers.PARSER_BACKENDS[backend][parser_index]
+            jobs = parse_page(html)
+            started = time.perf_counter()
+            for _ in range(repeat):
+                parse_page(html)
+            elapsed = time.perf_counter() - started
+            cards = len(jobs) * repeat
+            results.append({
+                'benchmark': 'parse',
+                'source': source,
+                'backend': backend,
+                'pages': repeat,
+                'cards': cards,
+                'seconds': round(elapsed, 4),
+                'pages_per_sec': round(repeat / elapsed, 1),
+                'cards_per_sec': round(cards / elapsed, 1),
+                'ms_per_card': round(elapsed * 1000 / cards, 4) if cards else None,
+                'matches_reference': _strip_dates(jobs) == reference,
+            })
+    return results
+
+def bench_searches(backends, worker_counts, latency_ms, pages, repeat):
+    """
+    Measure end-to-end search latency through the local HTTP stand-in
+
+    Args:
+        backends (list): Keys of scrapers.PARSER_BACKENDS to measure
+        worker_counts (list): LinkedIn detail-fetch concurrency settings to measure
+        latency_ms (float): Artificial latency added to every response
+        pages (int): Result pages fetched per search
+        repeat (int): Number of searches per configuration
+
+    Returns:
+        list: One result dict per configuration
+    """
+    results = []
+    with FixtureServer(latency_ms=latency_ms, result_pages=pages) as server:
+        scrapers.INDEED_SEARCH_URL = f"{server.base_url}/jobs"
+        scrapers.LINKEDIN_SEARCH_URL = f"{server.base_url}/jobs/search"
+
+        configs = [('Indeed', backend, None) for backend in backends]
+        configs += [('LinkedIn', backend, workers) for backend in backends for workers in worker_counts]
+        for source, backend, workers in configs:
+            scrapers.PARSER_BACKEND = backend
+            requests_before = server.requests
+            latencies = []
+            cards = 0
+            for _ in range(repeat):
+                started = time.perf_counter()
+                if source == 'Indeed':
+                    jobs_df = scrapers.scrape_indeed(['python'], 'Indore', max_pages=pages)
+                else:
+                    jobs_df = scrapers.scrape_linkedin(['python'], 'Indore', max_workers=workers, max_pages=pages)
+                latencies.append(time.perf_counter() - started)
+                cards += len(jobs_df)
+            total = sum(latencies)
+            results.append({
+                'benchmark': 'search',
+                'source': source,
+                'backend': backend,
+                'workers': workers,
+                'latency_ms': latency_ms,
+                'searches': repeat,
+                'http_requests': server.requests - requests_before,
+                'cards': cards,
+                'mean_latency_sec': round(total / repeat, 4),
+                'max_latency_sec': round(max(latencies), 4),
+                'pages_per_sec': round(repeat * pages / total, 2),
+                'cards_per_sec': round(cards / total, 1),
+            })
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            scrapers.get_detailed_job_description(f"{server.base_url}/viewjob?jk=0123456789abcdef")
+        elapsed = time.perf_counter() - started
+        results.append({
+            'benchmark': 'detail',
+            'source': 'get_detailed_job_description',
+            'latency_ms': latency_ms,
+            'requests': repeat,
+            'mean_latency_sec': round(elapsed / repeat, 4),
+        })
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline scraper benchmarks")
+    parser.add_argument('--backends', nargs='+', default=list(scrapers.PARSER_BACKENDS),
+                        choices=list(scrapers.PARSER_BACKENDS))
+    parser.add_argument('--workers', nargs='+', type=int, default=[1, scrapers.DETAIL_FETCH_WORKERS],
+                        help="LinkedIn detail-fetch concurrency settings to compare")
+    parser.add_argument('--latency-ms', type=float, default=50.0,
+                        help="Artificial latency added to every stand-in response")
+    parser.add_argument('--pages', type=int, default=1, help="Result pages fetched per search")
+    parser.add_argument('--parse-repeat', type=int, default=50)
+    parser.add_argument('--search-repeat', type=int, default=3)
+    parser.add_argument('--rate-limit', action='store_true',
+                        help="Keep the per-host rate limiter on (it is off by default so it does not dominate timings)")
+    parser.add_argument('--output', help="Write results to this JSON file instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Every request must reach the stand-in
+    http_cache.HTTP_CACHE_ENABLED = False
+    data_manager.DESCRIPTION_REUSE_ENABLED = False
+    rate_limiter.RATE_LIMIT_ENABLED = args.rate_limit
+
+    results = {
+        'python': sys.version.split()[0],
+        'rate_limit': args.rate_limit,
+        'parse': bench_parsers(args.backends, args.parse_repeat),
+        'search': bench_searches(args.backends, args.workers, args.latency_ms, args.pages, args.search_repeat),
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    # Fail loudly when a backend drifts from the reference parser
+    return 0 if all(r['matches_reference'] for r in results['parse']) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Alert email delivery benchmark.
+
+Sends alert emails to a local SMTP stand-in, once with a new session per
+message (how alert emails were sent before SMTPTransport) and once over a
+pooled SMTPTransport session, and reports messages/sec for each.
+
+Usage:
+    python -m benchmarks.bench_smtp [--messages 200] [--latency-ms 20]
+                                    [--max-per-connection 100] [--output results.json]
+"""
+import argparse
+import json
+import socketserver
+import sys
+import threading
+import time
+
+from benchmarks.bench_memory import make_records
+from notification import SMTPTransport, build_digest_message, limit_digest
+
+class LocalSMTPServer:
+    """
+    Minimal SMTP stand-in that accepts and counts every message
+
+    Speaks just enough SMTP for smtplib (EHLO/HELO, AUTH PLAIN/LOGIN accepting
+    any credentials, MAIL, RCPT, DATA, RSET, NOOP, QUIT); there is no STARTTLS.
+    Every reply can be delayed by a fixed latency to model network round trips.
+    """
+
+    def __init__(self, latency_ms=0):
+        self.latency = latency_ms / 1000.0
+        self.messages = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                if server.latency:
+                    time.sleep(server.latency)
+                self.wfile.write(line.encode('ascii') + b"\r\n")
+
+            def handle(self):
+                with server._lock:
+                    server.connections += 1
+                self.reply("220 localhost ESMTP stand-in")
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command = line.decode('ascii', 'replace').strip()
+                    verb = command.split(' ', 1)[0].upper()
+                    if verb == 'EHLO':
+                        self.reply("250-localhost")
+                        self.reply("250 AUTH PLAIN LOGIN")
+                    elif verb == 'AUTH':
+                        if command.upper().startswith('AUTH LOGIN'):
+                            self.reply("334 VXNlcm5hbWU6")
+                            self.rfile.readline()
+                            self.reply("334 UGFzc3dvcmQ6")
+                            self.rfile.readline()
+                        self.reply("235 Authentication successful")
+                    elif verb == 'DATA':
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                            pass
+                        with server._lock:
+                            server.messages += 1
+                        self.reply("250 OK queued")
+                    elif verb == 'QUIT':
+                        self.reply("221 Bye")
+                        return
+                    elif verb in ('HELO', 'MAIL', 'RCPT', 'RSET', 'NOOP'):
+                        self.reply("250 OK")
+                    else:
+                        self.reply("502 Command not implemented")
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+def _send_all(messages, transport_factory, pooled):
+    """Send every (recipient, alert name, jobs) message, returning the elapsed seconds."""
+    started = time.perf_counter()
+    _send_messages(messages, transport_factory, pooled)
+    return time.perf_counter() - started
+
+def _send_messages(messages, transport_factory, pooled):
+    def send(transport, recipient, alert_name, jobs):
+        # Built per send, like the outbox delivery workers do
+        transport.send(build_digest_message("bench@example.com", recipient, limit_digest([(alert_name, jobs)])))
+
+    if pooled:
+        with transport_factory() as transport:
+            for recipient, alert_name, jobs in messages:
+                send(transport, recipient, alert_name, jobs)
+    else:
+        for recipient, alert_name, jobs in messages:
+            # A fresh session per message, like the code before SMTPTransport
+            with transport_factory() as transport:
+                send(transport, recipient, alert_name, jobs)
+
+def bench_smtp(message_count, latency_ms, max_per_connection, jobs_per_message=10):
+    """
+    Time alert email delivery with and without a pooled session
+
+    Args:
+        message_count (int): Alert emails to send per mode
+        latency_ms (float): Delay before every server reply
+        max_per_connection (int): Messages per pooled session
+        jobs_per_message (int): Jobs listed in each email
+
+    Returns:
+        list: One result dict per mode
+    """
+    jobs = make_records(jobs_per_message)
+    messages = [(f"user{i}@example.com", f"Alert {i}", jobs) for i in range(message_count)]
+
+    results = []
+    for mode, pooled in (('session per message (before)', False), ('pooled SMTPTransport', True)):
+        with LocalSMTPServer(latency_ms=latency_ms) as server:
+            def transport_factory():
+                return SMTPTransport('127.0.0.1', server.port, username='bench', password='secret',
+                                     starttls=False, max_messages_per_connection=max_per_connection)
+            elapsed = _send_all(messages, transport_factory, pooled)
+            results.append({
+                'mode': mode,
+                'messages': server.messages,
+                'connections': server.connections,
+                'seconds': round(elapsed, 3),
+                'messages_per_sec': round(message_count / elapsed, 1),
+            })
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alert email delivery benchmark")
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=20,
+                        help="Delay before every SMTP reply, to model a remote server")
+    parser.add_argument('--max-per-connection', type=int, default=100)
+    parser.add_argument('--output', help="Write results to this JSON file instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = {
+        'python': sys.version.split()[0],
+        'latency_ms': args.latency_ms,
+        'smtp': bench_smtp(args.messages, args.latency_ms, args.max_per_connection),
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    # Every message must have reached the stand-in
+    return 0 if all(r['messages'] == args.messages for r in results['smtp']) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Alert-driven job crawler.
+
+Derives search queries from the saved job alerts, scrapes them and merges the
+results into the job archive, so alert matching sees jobs nobody searched for
+by hand. Alerts with the same search share one query.
+
+Usage:
+    python crawler.py [--dry-run]
+"""
+import os
+import sys
+import argparse
+import pandas as pd
+
+from scrapers import search_jobs, SCRAPERS
+from data_manager import load_alerts, save_jobs
+from dedup import dedupe_jobs
+
+# Sources crawled for alerts, comma separated (default: every source)
+CRAWL_SOURCES = [source for source in os.getenv("JOBFINDER_CRAWL_SOURCES", ",".join(SCRAPERS)).split(',') if source]
+
+# Let an alert whose keywords include all of another alert's keywords (same
+# location and job type) reuse that alert's broader query. Off by default: the
+# broader search matches a superset of postings, but only its first result page
+# is fetched, so most of the narrower alert's matches would not be crawled.
+CRAWL_COALESCE_SUBSETS = os.getenv("JOBFINDER_CRAWL_COALESCE_SUBSETS", "0") == "1"
+
+def _normalize_keywords(keywords):
+    """Lowercased, de-duplicated keywords in their original order, without blanks."""
+    return list(dict.fromkeys(keyword.strip().lower() for keyword in keywords or [] if keyword.strip()))
+
+def plan_queries(alerts):
+    """
+    Turn alerts into the smallest set of searches that covers them
+
+    Alerts with the same location and job type share a search when their
+    keywords are equal or, with CRAWL_COALESCE_SUBSETS, when one alert's
+    keywords contain all of another's; the alert with fewer keywords then
+    defines the search.
+
+    Args:
+        alerts (list): Job alert dictionaries
+
+    Returns:
+        list: Query dicts with 'keywords', 'location', 'job_type' and 'alert_ids'
+    """
+    groups = {}
+    for alert in alerts:
+        keywords = _normalize_keywords(alert.get('keywords'))
+        if not keywords:
+            # A search without keywords would only return the newest postings anywhere
+            continue
+        location = (alert.get('location') or '').strip()
+        job_type = alert.get('job_type') or None
+        key = (location.lower(), job_type.lower() if job_type else None)
+        groups.setdefault(key, []).append((keywords, location, job_type, alert['id']))
+
+    queries = []
+    for members in groups.values():
+        group_queries = []
+        # Broadest first, so narrower alerts find a query that covers them
+        for keywords, location, job_type, alert_id in sorted(members, key=lambda member: len(member[0])):
+            keyword_set = set(keywords)
+            for query in group_queries:
+                if query['keyword_set'] == keyword_set or (CRAWL_COALESCE_SUBSETS and query['keyword_set'] <= keyword_set):
+                    query['alert_ids'].append(alert_id)
+                    break
+            else:
+                group_queries.append({
+                    'keywords': keywords,
+                    'keyword_set': keyword_set,
+                    'location': location,
+                    'job_type': job_type,
+                    'alert_ids': [alert_id],
+                })
+        for query in group_queries:
+            del query['keyword_set']
+            queries.append(query)
+    return queries
+
+def crawl(alerts=None, sources=None):
+    """
+    Scrape the searches derived from the alerts and store the results
+
+    Args:
+        alerts (list, optional): Alerts to crawl for; all saved alerts if omitted
+        sources (list, optional): Sources to search; defaults to CRAWL_SOURCES
+
+    Returns:
+        dict: 'alerts', 'queries' and 'jobs' counts plus the per-query search
+            reports under 'reports'
+    """
+    if alerts is None:
+        alerts = load_alerts()
+    queries = plan_queries(alerts)
+
+    results = []
+    reports = []
+    for query in queries:
+        jobs_df, report = search_jobs(query['keywords'], query['location'], query['job_type'],
+                                      sources=sources or CRAWL_SOURCES)
+        reports.append({'query': query, 'report': report})
+        if not jobs_df.empty:
+            results.append(jobs_df)
+
+    jobs = 0
+    if results:
+        combined_jobs = dedupe_jobs(pd.concat(results, ignore_index=True))
+        # One archive merge for the whole crawl instead of one per query; the
+        # app's latest search results stay as they are
+        save_jobs(combined_jobs, from_search=False)
+        jobs = len(combined_jobs)
+
+    return {'alerts': len(alerts), 'queries': len(queries), 'jobs': jobs, 'reports': reports}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl job sources for the saved alerts")
+    parser.add_argument('--dry-run', action='store_true', help="Print the planned searches without scraping")
+    args = parser.parse_args(argv)
+
+    if args.dry_run:
+        alerts = load_alerts()
+        for query in plan_queries(alerts):
+            print(f"{' '.join(query['keywords'])!r} in {query['location'] or 'any location'}"
+                  f" ({query['job_type'] or 'any type'}): {len(query['alert_ids'])} alert(s)")
+        return 0
+
+    summary = crawl()
+    print(f"Crawled {summary['queries']} searches for {summary['alerts']} alerts, stored {summary['jobs']} jobs")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,12 +2,86 @@ import pandas as pd
 import os
 import datetime
 import json
+import copy
+import threading
+import contextlib
+from utils import extract_job_id, canonicalize_url, archive_key
+import sqlite_store
+import parquet_store
+from search_index import SearchIndex
+from alert_matcher import AlertIndex
+from models import apply_job_dtypes
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Storage backend: "json" (one file per list) or "sqlite" (see sqlite_store.py)
+STORAGE_BACKEND = os.getenv("JOBFINDER_STORAGE", "json")
+
+# Format of the scraped jobs table: "default" (the storage backend) or
+# "parquet" (columnar, partitioned by first-seen date; see parquet_store.py)
+JOBS_FORMAT = os.getenv("JOBFINDER_JOBS_FORMAT", "default")
 
 # Paths for persisting data
 JOBS_DATA_PATH = "jobs_data.json"
 SAVED_JOBS_PATH = "saved_jobs.json"
 APPLIED_JOBS_PATH = "applied_jobs.json"
 ALERTS_PATH = "job_alerts.json"
+# Per-alert watermark: the first_seen time up to which jobs were already notified
+ALERT_STATE_PATH = "alert_state.json"
+# Scrapers reuse stored descriptions instead of re-fetching job pages
+DESCRIPTION_REUSE_ENABLED = True
+# Scraped descriptions are stored cut to this many characters plus "..."
+DESCRIPTION_PREVIEW_CHARS = 500
+
+# Saved/applied jobs and alerts are changed by appending to a journal next to
+# the JSON snapshot; the journal is folded into the snapshot once it grows
+# past JOURNAL_COMPACT_BYTES
+JOURNAL_ENABLED = os.getenv("JOBFINDER_JOURNAL", "1") != "0"
+JOURNAL_COMPACT_BYTES = int(os.getenv("JOBFINDER_JOURNAL_COMPACT_BYTES", str(256 * 1024)))
+
+# The jobs table is an archive: every save merges into it by canonical URL.
+# Jobs not seen for JOB_RETENTION_DAYS are dropped, and beyond MAX_ARCHIVED_JOBS
+# the jobs seen least recently are evicted
+JOB_RETENTION_DAYS = int(os.getenv("JOBFINDER_RETENTION_DAYS", "60"))
+MAX_ARCHIVED_JOBS = int(os.getenv("JOBFINDER_MAX_JOBS", "100000"))
+JOB_DATE_COLUMNS = ['date_posted', 'first_seen', 'last_seen']
+
+# Descriptions the scrapers use when the real text is not known
+PLACEHOLDER_DESCRIPTIONS = (
+    "Click the link to view the full job description",
+    "No description available",
+)
+
+# Job ID -> stored description of the archived, saved and applied jobs, for
+# the json and parquet archives; rebuilt when one of them changes
+_description_index = None
+_description_index_signature = None
+_description_index_lock = threading.Lock()
+_archive_lock = threading.Lock()
+
+# Full-text index over the job archive, built on the first local search and
+# rebuilt if another process changes the archive
+_search_index = None
+_search_index_signature = None
+_search_index_lock = threading.Lock()
+# Keyword automaton over every saved alert, kept in step with save_alert/delete_alert
+_alert_index = None
+_alert_index_signature = None
+_alert_index_lock = threading.Lock()
+_alert_state_lock = threading.Lock()
+_journal_locks = {}
+_journal_locks_lock = threading.Lock()
+_compacting = set()
+
+# Parsed contents of each store, keyed by path and validated against the
+# file's mtime/size plus a per-path generation bumped on every write
+_load_cache = {}
+_load_cache_lock = threading.Lock()
+_generations = {}
 
 def custom_json_encoder(obj):
     """Custom JSON encoder to handle non-serializable objects."""
@@ -15,55 +89,561 @@ def custom_json_encoder(obj):
         return obj.isoformat()  # Convert datetime to ISO 8601 string
     raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
 
-def load_jobs():
+def _journal_path(path):
+    """Journal file of a JSON snapshot, e.g. saved_jobs.journal.jsonl for saved_jobs.json"""
+    return f"{os.path.splitext(path)[0]}.journal.jsonl"
+
+@contextlib.contextmanager
+def _file_lock(path):
     """
-    Load the current job listings from storage
+    Hold an exclusive lock shared with other processes, e.g. the app and the alert worker
+    
+    The lock is taken on `path`.lock rather than on the data file itself, which
+    gets replaced by atomic writes.
     
+    Args:
+        path (str): Data file to lock
+    """
+    lock_file = open(f"{path}.lock", 'a+')
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        # Closing the file releases the lock
+        lock_file.close()
+
+@contextlib.contextmanager
+def _journal_lock(path):
+    """Serialize appends and compaction of a journal across threads and processes."""
+    with _journal_locks_lock:
+        lock = _journal_locks.setdefault(path, threading.Lock())
+    with lock, _file_lock(path):
+        yield
+
+def _record_key(path, record):
+    """Identity of a record in a journaled file: the alert ID or the canonical job URL."""
+    if path == ALERTS_PATH:
+        return record.get('id')
+    return canonicalize_url(record.get('url'))
+
+def _replay_journal(path, records):
+    """
+    Apply the journal of a JSON snapshot to its records
+    
+    Adds of a record that is already present and removes of a missing one are
+    no-ops, so replaying entries that were already folded into the snapshot
+    (e.g. after a crash during compaction) gives the same result.
+    
+    Args:
+        path (str): JSON snapshot path
+        records (list): Records read from the snapshot
+        
     Returns:
-        pandas.DataFrame: DataFrame containing job listings
+        list: Current records
+    """
+    journal_path = _journal_path(path)
+    if not os.path.exists(journal_path):
+        return records
+    
+    entries = []
+    with open(journal_path, 'r') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                # A torn final line from an interrupted write
+                continue
+    
+    return _apply_journal_entries(path, records, entries)
+
+def _apply_journal_entries(path, records, entries):
+    """Apply add/remove journal entries to a list of records, returning a new list."""
+    current = {}
+    for record in records:
+        current.setdefault(_record_key(path, record), record)
+    
+    for entry in entries:
+        if entry.get('op') == 'add':
+            current.setdefault(entry['key'], entry['record'])
+        elif entry.get('op') == 'remove':
+            current.pop(entry['key'], None)
+    
+    return list(current.values())
+
+def _read_json_records(path):
     """
-    if os.path.exists(JOBS_DATA_PATH):
+    Read the current records of a journaled JSON file
+    
+    Args:
+        path (str): JSON snapshot path
+        
+    Returns:
+        list: Snapshot records with the journal applied
+    """
+    records = []
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            records = json.load(f)
+    return _replay_journal(path, records)
+
+def _append_journal(path, op, record=None, key=None):
+    """
+    Record an add or remove for a JSON file without rewriting it
+    
+    Args:
+        path (str): JSON snapshot path
+        op (str): 'add' or 'remove'
+        record (dict, optional): Record to add
+        key (str, optional): Key of the record; derived from `record` if omitted
+    """
+    if key is None:
+        key = _record_key(path, record)
+    entry = {'op': op, 'key': key}
+    if record is not None:
+        entry['record'] = record
+    
+    # Round-trip through JSON so the cached copy matches what a reload would give
+    line = json.dumps(entry, default=custom_json_encoder)
+    entry = json.loads(line)
+    
+    if not JOURNAL_ENABLED:
+        # Fall back to rewriting the whole file
+        with _journal_lock(path):
+            signature = _storage_signature(path)
+            records = _apply_journal_entries(path, _read_json_records(path), [entry])
+            _write_json_atomic(path, records)
+            _cache_after_write(path, signature, lambda cached: records)
+        return
+    
+    journal_path = _journal_path(path)
+    with _journal_lock(path):
+        signature = _storage_signature(path)
+        with open(journal_path, 'a') as f:
+            f.write(line + "\n")
+        size = os.path.getsize(journal_path)
+        _cache_after_write(path, signature, lambda cached: _apply_journal_entries(path, cached, [entry]))
+    
+    if size > JOURNAL_COMPACT_BYTES:
+        with _journal_locks_lock:
+            if path in _compacting:
+                return
+            _compacting.add(path)
+        threading.Thread(target=_compact_in_background, args=(path,), daemon=True).start()
+
+def _compact_in_background(path):
+    try:
+        compact_journal(path)
+    except Exception as e:
+        print(f"Error compacting journal for {path}: {e}")
+    finally:
+        with _journal_locks_lock:
+            _compacting.discard(path)
+
+def compact_journal(path):
+    """
+    Fold the journal of a JSON file into its snapshot and empty the journal
+    
+    Args:
+        path (str): JSON snapshot path
+    """
+    journal_path = _journal_path(path)
+    with _journal_lock(path):
+        if not os.path.exists(journal_path):
+            return
+        signature = _storage_signature(path)
+        records = _read_json_records(path)
+        _write_json_atomic(path, records)
+        os.remove(journal_path)
+        _cache_after_write(path, signature, lambda cached: cached)
+
+def _read_records(table, path):
+    """
+    Read the raw records of a store from the configured backend
+    
+    Args:
+        table (str): SQLite table name ('jobs', 'saved', 'applied' or 'alerts')
+        path (str): JSON file used by the json backend
+        
+    Returns:
+        list: Job or alert dictionaries with dates as ISO strings
+    """
+    if STORAGE_BACKEND == 'sqlite':
+        if table == 'alerts':
+            return sqlite_store.read_alerts()
+        return sqlite_store.read_records(table)
+    return _read_json_records(path)
+
+def _storage_signature(path):
+    """
+    Fingerprint of a store's files, used to tell whether a cached copy is still current
+    
+    Args:
+        path (str): JSON file of the store
+        
+    Returns:
+        tuple: Backend, write generation and (mtime, size) of each backing file
+    """
+    if STORAGE_BACKEND == 'sqlite':
+        files = (sqlite_store.SQLITE_DB_PATH, f"{sqlite_store.SQLITE_DB_PATH}-wal")
+    else:
+        files = (path, _journal_path(path))
+    
+    signature = [STORAGE_BACKEND, _generations.get(path, 0)]
+    for file_path in files:
         try:
-            # Read the JSON file
-            with open(JOBS_DATA_PATH, 'r') as f:
-                jobs_data = json.load(f)
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(jobs_data)
-            
-            # Convert date strings back to datetime
-            if not df.empty and 'date_posted' in df.columns:
-                df['date_posted'] = pd.to_datetime(df['date_posted'])
-            
-            return df
-        except Exception as e:
-            print(f"Error loading jobs data: {e}")
-            return pd.DataFrame()
+            stat = os.stat(file_path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+def _cache_entry(table, path):
+    """Cache entry of a store, re-reading the store if its files changed."""
+    signature = _storage_signature(path)
+    with _load_cache_lock:
+        entry = _load_cache.get(path)
+        if entry is not None and entry['signature'] == signature:
+            return entry
+    
+    # Read outside the lock; the signature was taken first, so a write that
+    # lands during the read only causes another reload next time
+    entry = {'signature': signature, 'records': _read_records(table, path), 'value': None}
+    with _load_cache_lock:
+        _load_cache[path] = entry
+    return entry
+
+def _cached_records(table, path):
+    """
+    Current records of a store, parsed at most once per change
+    
+    The returned list is shared with the cache and must not be modified.
+    """
+    return _cache_entry(table, path)['records']
+
+def _cached_value(table, path, build):
+    """
+    Value derived from a store's records (e.g. a DataFrame), built at most once per change
+    
+    Args:
+        table (str): Store name
+        path (str): JSON file of the store
+        build (callable): Function turning the records into the value
+        
+    Returns:
+        Shared value; callers hand out copies
+    """
+    entry = _cache_entry(table, path)
+    value = entry['value']
+    if value is None:
+        value = build(entry['records'])
+        entry['value'] = value
+    return value
+
+def _cache_after_write(path, signature_before, update):
+    """
+    Bring the cached copy of a store up to date after this process wrote to it
+    
+    If the cache held the state from just before the write, `update` derives the
+    new records from it in memory and the entry is stamped with the files' new
+    signature; otherwise the entry is dropped and the next load re-reads the store.
+    
+    Args:
+        path (str): JSON file of the store
+        signature_before (tuple): Store signature taken before the write, or None
+            when the write replaced the whole store
+        update (callable): Function mapping the cached records (None if there
+            were none) to the new ones
+    """
+    with _load_cache_lock:
+        _generations[path] = _generations.get(path, 0) + 1
+        entry = _load_cache.pop(path, None)
+        if signature_before is None or (entry is not None and entry['signature'] == signature_before):
+            _load_cache[path] = {
+                'signature': _storage_signature(path),
+                'records': update(entry['records'] if entry is not None else None),
+                'value': None,
+            }
+
+def _invalidate_cache(path):
+    """Drop the cached copy of a store after a write that cannot be applied in memory."""
+    with _load_cache_lock:
+        _generations[path] = _generations.get(path, 0) + 1
+        _load_cache.pop(path, None)
+
+def _frame_from_records(records, date_columns):
+    """
+    Convert job records to a DataFrame in the compact job schema
+    
+    Args:
+        records (list): Job dictionaries
+        date_columns (list): Columns holding ISO date strings
+        
+    Returns:
+        pandas.DataFrame: DataFrame of the records
+    """
+    return apply_job_dtypes(pd.DataFrame(records), date_columns)
+
+def _backfill_first_seen(jobs_df):
+    """
+    Give jobs archived before first_seen was recorded their posting date as first_seen
+    
+    Such jobs stay without first_seen until the next save_jobs merge stores
+    one, and alert checks select and advance watermarks by it.
+    
+    Args:
+        jobs_df (pandas.DataFrame): Jobs in the compact schema
+        
+    Returns:
+        pandas.DataFrame: The same DataFrame, filled in place
+    """
+    if jobs_df.empty or 'date_posted' not in jobs_df.columns:
+        return jobs_df
+    if 'first_seen' not in jobs_df.columns:
+        jobs_df['first_seen'] = jobs_df['date_posted']
     else:
+        jobs_df['first_seen'] = jobs_df['first_seen'].fillna(jobs_df['date_posted'])
+    return jobs_df
+
+def load_jobs(columns=None, since=None, first_seen_since=None):
+    """
+    Load archived job listings from storage
+    
+    Args:
+        columns (list, optional): Only load these columns
+        since (datetime.datetime, optional): Only load jobs posted at or after this time
+        first_seen_since (datetime.datetime, optional): Only load jobs first scraped
+            at or after this time
+        
+    Returns:
+        pandas.DataFrame: DataFrame containing job listings
+    """
+    try:
+        if JOBS_FORMAT == 'parquet':
+            # Reads only the requested columns and the row groups that can match
+            df = _backfill_first_seen(apply_job_dtypes(
+                parquet_store.read_jobs(columns=columns, since=since, first_seen_since=first_seen_since),
+                JOB_DATE_COLUMNS
+            ))
+        else:
+            df = _cached_value('jobs', JOBS_DATA_PATH,
+                               lambda records: _backfill_first_seen(_frame_from_records(records, JOB_DATE_COLUMNS)))
+        if since is not None and 'date_posted' in df.columns:
+            df = df[df['date_posted'] >= since]
+        if first_seen_since is not None and 'first_seen' in df.columns:
+            df = df[df['first_seen'] >= first_seen_since]
+        if columns is not None:
+            df = df[[column for column in columns if column in df.columns]]
+        return df.copy()
+    except Exception as e:
+        print(f"Error loading jobs data: {e}")
         return pd.DataFrame()
 
-def save_jobs(jobs_df):
+def load_latest_jobs():
+    """
+    Load the jobs found by the most recent search in the app
+    
+    Returns:
+        pandas.DataFrame: Archived jobs returned by the latest search; jobs
+            saved by the crawler only are left out
+    """
+    jobs_df = load_jobs()
+    # Archives written before searches were marked fall back to last_seen
+    column = 'last_searched' if 'last_searched' in jobs_df.columns else 'last_seen'
+    if jobs_df.empty or column not in jobs_df.columns:
+        return jobs_df
+    return jobs_df[jobs_df[column] == jobs_df[column].max()].reset_index(drop=True)
+
+def _records_from_frame(jobs_df):
+    """Convert a jobs DataFrame to records with dates as ISO strings."""
+    jobs_data = jobs_df.to_dict('records')
+    for job in jobs_data:
+        for column in JOB_DATE_COLUMNS:
+            value = job.get(column)
+            if isinstance(value, datetime.datetime):
+                job[column] = None if pd.isna(value) else value.isoformat()
+    return jobs_data
+
+def merge_into_archive(archived, scraped, now=None):
     """
-    Save job listings to storage
+    Merge freshly scraped jobs into the archived ones
+    
+    Jobs already in the archive keep their first_seen time and get the new
+    listing's fields, except that a real description is never replaced by a
+    placeholder. All scraped jobs get last_seen = now. Retention and the size
+    cap are applied to the result.
+    
+    Args:
+        archived (list): Archived job records with ISO date strings
+        scraped (list): Scraped job records with ISO date strings
+        now (datetime.datetime, optional): Time of the scrape
+        
+    Returns:
+        list: Archived job records, oldest first
+    """
+    now = now or datetime.datetime.now()
+    seen_at = now.isoformat()
+    
+    jobs = {}
+    for job in archived:
+        if not job.get('last_seen'):
+            # Jobs saved before the archive kept timestamps count as seen now,
+            # and as first seen when posted, as load_jobs shows them
+            job = dict(job, first_seen=job.get('first_seen') or job.get('date_posted') or seen_at, last_seen=seen_at)
+        jobs.setdefault(archive_key(job), job)
+    
+    for job in scraped:
+        key = archive_key(job)
+        existing = jobs.get(key)
+        if existing is None:
+            job = dict(job, first_seen=seen_at, last_seen=seen_at)
+        else:
+            job = dict(existing, **job)
+            job['first_seen'] = existing.get('first_seen') or seen_at
+            job['last_seen'] = seen_at
+            if job.get('description') in PLACEHOLDER_DESCRIPTIONS and existing.get('description'):
+                job['description'] = existing['description']
+            # Re-insert so the dict order follows last_seen
+            del jobs[key]
+        jobs[key] = job
+    
+    # Drop jobs that have not been seen within the retention period
+    cutoff = (now - datetime.timedelta(days=JOB_RETENTION_DAYS)).isoformat()
+    merged = [job for job in jobs.values() if job['last_seen'] >= cutoff]
+    
+    # Evict the jobs seen least recently beyond the size cap
+    if len(merged) > MAX_ARCHIVED_JOBS:
+        merged.sort(key=lambda job: job['last_seen'])
+        merged = merged[-MAX_ARCHIVED_JOBS:]
+    return merged
+
+def save_jobs(jobs_df, from_search=True):
+    """
+    Merge scraped job listings into the job archive
     
     Args:
         jobs_df (pandas.DataFrame): DataFrame containing job listings
+        from_search (bool): Whether the jobs are the results of a search in the
+            app, which load_latest_jobs shows; the crawler passes False
     """
     try:
-        # Convert DataFrame to list of dictionaries
-        jobs_data = jobs_df.to_dict('records')
-        
-        # Convert datetime objects to strings
-        for job in jobs_data:
-            if 'date_posted' in job and isinstance(job['date_posted'], datetime.datetime):
-                job['date_posted'] = job['date_posted'].isoformat()
+        scraped = _records_from_frame(jobs_df)
+        if from_search:
+            searched_at = datetime.datetime.now().isoformat()
+            for job in scraped:
+                job['last_searched'] = searched_at
         
-        # Write to JSON file
-        with open(JOBS_DATA_PATH, 'w') as f:
-            json.dump(jobs_data, f)
+        # The app and the alert worker both merge into the archive
+        with _archive_lock, _file_lock(JOBS_DATA_PATH):
+            signature = _archive_signature()
+            if STORAGE_BACKEND == 'sqlite' and JOBS_FORMAT != 'parquet':
+                # Upsert the scraped rows instead of rewriting the whole table
+                now = datetime.datetime.now()
+                removed, changed = sqlite_store.merge_jobs(
+                    scraped, [archive_key(job) for job in scraped], now.isoformat(),
+                    (now - datetime.timedelta(days=JOB_RETENTION_DAYS)).isoformat(),
+                    MAX_ARCHIVED_JOBS, PLACEHOLDER_DESCRIPTIONS
+                )
+                _invalidate_cache(JOBS_DATA_PATH)
+                _update_search_index(signature, [archive_key(job) for job in removed], changed)
+                return
+            
+            archived = _load_archive_records()
+            jobs_data = merge_into_archive(archived, scraped)
+            
+            if JOBS_FORMAT == 'parquet':
+                # Partition by the day each job was first scraped
+                for job in jobs_data:
+                    job[parquet_store.PARTITION_COLUMN] = job['first_seen'][:10]
+                parquet_store.write_jobs(pd.DataFrame(jobs_data))
+            else:
+                _write_json_atomic(JOBS_DATA_PATH, jobs_data)
+                _cache_after_write(JOBS_DATA_PATH, None, lambda cached: jobs_data)
+            
+            kept = {archive_key(job): job for job in jobs_data}
+            removed = [key for key in map(archive_key, archived) if key not in kept]
+            changed = [kept[key] for key in dict.fromkeys(map(archive_key, scraped)) if key in kept]
+            _update_search_index(signature, removed, changed)
     except Exception as e:
         print(f"Error saving jobs data: {e}")
 
+def _load_archive_records():
+    """Read every archived job as records with ISO date strings."""
+    if JOBS_FORMAT == 'parquet':
+        return _records_from_frame(parquet_store.read_jobs())
+    return _cached_records('jobs', JOBS_DATA_PATH)
+
+def _archive_signature():
+    """Fingerprint of the stored job archive, see _storage_signature."""
+    if JOBS_FORMAT == 'parquet':
+        try:
+            stat = os.stat(parquet_store.PARQUET_JOBS_DIR)
+            return ('parquet', stat.st_ino, stat.st_mtime_ns)
+        except OSError:
+            return ('parquet', None)
+    return _storage_signature(JOBS_DATA_PATH)
+
+def _update_search_index(signature_before, removed, changed):
+    """
+    Apply one save_jobs merge to the search index, if it has been built
+    
+    Args:
+        signature_before (tuple): Archive signature taken before the merge was written
+        removed (list): Archive keys of the jobs the merge dropped
+        changed (list): Archive records of the scraped jobs after the merge
+    """
+    global _search_index, _search_index_signature
+    with _search_index_lock:
+        if _search_index is None:
+            return
+        if _search_index_signature != signature_before:
+            # The archive was changed by another process; rebuild on the next search
+            _search_index = None
+            return
+        _search_index.remove_jobs(removed)
+        _search_index.add_jobs(changed, archive_key)
+        _search_index_signature = _archive_signature()
+
+def _get_search_index():
+    """Build the search index from the job archive the first time it is needed."""
+    global _search_index, _search_index_signature
+    with _search_index_lock:
+        signature = _archive_signature()
+        if _search_index is None or _search_index_signature != signature:
+            index = SearchIndex()
+            index.add_jobs(_load_archive_records(), archive_key)
+            _search_index = index
+            _search_index_signature = signature
+        return _search_index
+
+def search_local_jobs(keywords=None, location=None, job_type=None, sources=None, since=None, limit=200):
+    """
+    Search the job archive without scraping
+    
+    Args:
+        keywords (list, optional): Keywords that must all appear in the job
+        location (str, optional): Words that must all appear in the location
+        job_type (str, optional): Words that must all appear in the job type
+        sources (list, optional): Only return jobs from these sources
+        since (datetime.datetime, optional): Only return jobs posted at or after this time
+        limit (int, optional): Maximum number of results
+        
+    Returns:
+        pandas.DataFrame: Matching jobs, best match first
+    """
+    try:
+        results = _get_search_index().search(
+            keywords=keywords, location=location, job_type=job_type,
+            sources=sources, since=since, limit=limit
+        )
+        return _frame_from_records([job for job, score in results], JOB_DATE_COLUMNS)
+    except Exception as e:
+        print(f"Error searching stored jobs: {e}")
+        return pd.DataFrame()
+
 def load_saved_jobs():
     """
     Load saved jobs from storage
@@ -71,27 +651,11 @@ def load_saved_jobs():
     Returns:
         pandas.DataFrame: DataFrame containing saved jobs
     """
-    if os.path.exists(SAVED_JOBS_PATH):
-        try:
-            # Read the JSON file
-            with open(SAVED_JOBS_PATH, 'r') as f:
-                saved_jobs_data = json.load(f)
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(saved_jobs_data)
-            
-            # Convert date strings back to datetime
-            if not df.empty:
-                if 'date_posted' in df.columns:
-                    df['date_posted'] = pd.to_datetime(df['date_posted'])
-                if 'saved_date' in df.columns:
-                    df['saved_date'] = pd.to_datetime(df['saved_date'])
-            
-            return df
-        except Exception as e:
-            print(f"Error loading saved jobs: {e}")
-            return pd.DataFrame()
-    else:
+    try:
+        return _cached_value('saved', SAVED_JOBS_PATH,
+                             lambda records: _frame_from_records(records, ['date_posted', 'saved_date'])).copy()
+    except Exception as e:
+        print(f"Error loading saved jobs: {e}")
         return pd.DataFrame()
 
 def save_job_to_saved(job):
@@ -112,24 +676,24 @@ def save_job_to_saved(job):
     if 'date_posted' in job and isinstance(job['date_posted'], datetime.datetime):
         job['date_posted'] = job['date_posted'].isoformat()
     
-    # Load existing saved jobs
-    saved_jobs = []
-    if os.path.exists(SAVED_JOBS_PATH):
+    if STORAGE_BACKEND == 'sqlite':
+        # The unique canonical URL index skips jobs that are already saved
+        added = sqlite_store.insert_record('saved', job)
+        _invalidate_cache(SAVED_JOBS_PATH)
+    else:
+        # Load existing saved jobs
         try:
-            with open(SAVED_JOBS_PATH, 'r') as f:
-                saved_jobs = json.load(f)
+            saved_jobs = _cached_records('saved', SAVED_JOBS_PATH)
         except:
             saved_jobs = []
-    
-    # Check if job is already saved (by URL)
-    job_urls = [j.get('url') for j in saved_jobs]
-    if job.get('url') not in job_urls:
-        saved_jobs.append(job)
-        
-        # Save to file
-        with open(SAVED_JOBS_PATH, 'w') as f:
-            json.dump(saved_jobs, f)
         
+        # Check if job is already saved (by canonical URL)
+        job_urls = {canonicalize_url(j.get('url')) for j in saved_jobs}
+        added = canonicalize_url(job.get('url')) not in job_urls
+        if added:
+            _append_journal(SAVED_JOBS_PATH, 'add', job)
+    
+    if added:
         # Update session state if it exists
         import streamlit as st
         if 'saved_jobs' in st.session_state:
@@ -146,21 +710,12 @@ def remove_job_from_saved(job):
     if isinstance(job, pd.Series):
         job = job.to_dict()
     
-    # Load existing saved jobs
-    saved_jobs = []
-    if os.path.exists(SAVED_JOBS_PATH):
-        try:
-            with open(SAVED_JOBS_PATH, 'r') as f:
-                saved_jobs = json.load(f)
-        except:
-            saved_jobs = []
-    
-    # Remove job by URL
-    saved_jobs = [j for j in saved_jobs if j.get('url') != job.get('url')]
-    
-    # Save to file
-    with open(SAVED_JOBS_PATH, 'w') as f:
-        json.dump(saved_jobs, f)
+    if STORAGE_BACKEND == 'sqlite':
+        sqlite_store.delete_record('saved', job.get('url'))
+        _invalidate_cache(SAVED_JOBS_PATH)
+    else:
+        # Remove job by canonical URL
+        _append_journal(SAVED_JOBS_PATH, 'remove', key=canonicalize_url(job.get('url')))
     
     # Update session state if it exists
     import streamlit as st
@@ -174,27 +729,11 @@ def load_applied_jobs():
     Returns:
         pandas.DataFrame: DataFrame containing applied jobs
     """
-    if os.path.exists(APPLIED_JOBS_PATH):
-        try:
-            # Read the JSON file
-            with open(APPLIED_JOBS_PATH, 'r') as f:
-                applied_jobs_data = json.load(f)
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(applied_jobs_data)
-            
-            # Convert date strings back to datetime
-            if not df.empty:
-                if 'date_posted' in df.columns:
-                    df['date_posted'] = pd.to_datetime(df['date_posted'])
-                if 'applied_date' in df.columns:
-                    df['applied_date'] = pd.to_datetime(df['applied_date'])
-            
-            return df
-        except Exception as e:
-            print(f"Error loading applied jobs: {e}")
-            return pd.DataFrame()
-    else:
+    try:
+        return _cached_value('applied', APPLIED_JOBS_PATH,
+                             lambda records: _frame_from_records(records, ['date_posted', 'applied_date'])).copy()
+    except Exception as e:
+        print(f"Error loading applied jobs: {e}")
         return pd.DataFrame()
 
 def add_job_to_applied(job):
@@ -215,29 +754,41 @@ def add_job_to_applied(job):
     if 'date_posted' in job and isinstance(job['date_posted'], datetime.datetime):
         job['date_posted'] = job['date_posted'].isoformat()
     
-    # Load existing applied jobs
-    applied_jobs = []
-    if os.path.exists(APPLIED_JOBS_PATH):
+    if STORAGE_BACKEND == 'sqlite':
+        # The unique canonical URL index skips jobs that are already in the list
+        added = sqlite_store.insert_record('applied', job)
+        _invalidate_cache(APPLIED_JOBS_PATH)
+    else:
+        # Load existing applied jobs
         try:
-            with open(APPLIED_JOBS_PATH, 'r') as f:
-                applied_jobs = json.load(f)
+            applied_jobs = _cached_records('applied', APPLIED_JOBS_PATH)
         except:
             applied_jobs = []
-    
-    # Check if job is already in applied list (by URL)
-    job_urls = [j.get('url') for j in applied_jobs]
-    if job.get('url') not in job_urls:
-        applied_jobs.append(job)
-        
-        # Save to file
-        with open(APPLIED_JOBS_PATH, 'w') as f:
-            json.dump(applied_jobs, f, default=custom_json_encoder)
         
+        # Check if job is already in applied list (by canonical URL)
+        job_urls = {canonicalize_url(j.get('url')) for j in applied_jobs}
+        added = canonicalize_url(job.get('url')) not in job_urls
+        if added:
+            _append_journal(APPLIED_JOBS_PATH, 'add', job)
+    
+    if added:
         # Update session state if it exists
         import streamlit as st
         if 'applied_jobs' in st.session_state:
             st.session_state.applied_jobs = load_applied_jobs()
 
+def _parse_alerts(records):
+    """Convert stored alert records to alert dictionaries with datetime created dates."""
+    alerts_data = []
+    for record in records:
+        alert = dict(record)
+        
+        # Convert date strings back to datetime
+        if alert.get('created_date'):
+            alert['created_date'] = datetime.datetime.fromisoformat(alert['created_date'])
+        alerts_data.append(alert)
+    return alerts_data
+
 def load_alerts():
     """
     Load job alerts from storage
@@ -245,22 +796,13 @@ def load_alerts():
     Returns:
         list: List of job alert dictionaries
     """
-    if os.path.exists(ALERTS_PATH):
-        try:
-            # Read the JSON file
-            with open(ALERTS_PATH, 'r') as f:
-                alerts_data = json.load(f)
-            
-            # Convert date strings back to datetime
-            for alert in alerts_data:
-                if 'created_date' in alert:
-                    alert['created_date'] = datetime.datetime.fromisoformat(alert['created_date'])
-            
-            return alerts_data
-        except Exception as e:
-            print(f"Error loading job alerts: {e}")
-            return []
-    else:
+    try:
+        alerts_data = _cached_value('alerts', ALERTS_PATH, _parse_alerts)
+        
+        # Callers may modify the alerts, so hand out a copy of the cached list
+        return copy.deepcopy(alerts_data)
+    except Exception as e:
+        print(f"Error loading job alerts: {e}")
         return []
 
 def save_alert(alert):
@@ -270,20 +812,18 @@ def save_alert(alert):
     Args:
         alert (dict): Job alert to save
     """
-    # Load existing alerts
-    alerts = load_alerts()
-    
     # Convert datetime to string for JSON serialization
     alert_to_save = alert.copy()
     if 'created_date' in alert_to_save and isinstance(alert_to_save['created_date'], datetime.datetime):
         alert_to_save['created_date'] = alert_to_save['created_date'].isoformat()
     
-    # Add alert
-    alerts.append(alert_to_save)
-    
-    # Save to file
-    with open(ALERTS_PATH, 'w') as f:
-        json.dump(alerts, f)
+    signature = _storage_signature(ALERTS_PATH)
+    if STORAGE_BACKEND == 'sqlite':
+        sqlite_store.insert_alert(alert_to_save)
+        _invalidate_cache(ALERTS_PATH)
+    else:
+        _append_journal(ALERTS_PATH, 'add', alert_to_save)
+    _update_alert_index(signature, alert_to_save['id'])
     
     # Update session state if it exists
     import streamlit as st
@@ -297,22 +837,213 @@ def delete_alert(alert_id):
     Args:
         alert_id (str): ID of the alert to delete
     """
-    # Load existing alerts
-    alerts = load_alerts()
-    
-    # Remove alert by ID
-    alerts = [a for a in alerts if a.get('id') != alert_id]
-    
-    # Convert datetime to string for JSON serialization
-    for alert in alerts:
-        if 'created_date' in alert and isinstance(alert['created_date'], datetime.datetime):
-            alert['created_date'] = alert['created_date'].isoformat()
-    
-    # Save to file
-    with open(ALERTS_PATH, 'w') as f:
-        json.dump(alerts, f)
+    signature = _storage_signature(ALERTS_PATH)
+    if STORAGE_BACKEND == 'sqlite':
+        sqlite_store.delete_alert(alert_id)
+        _invalidate_cache(ALERTS_PATH)
+    else:
+        _append_journal(ALERTS_PATH, 'remove', key=alert_id)
+    _update_alert_index(signature, alert_id)
+    _forget_alert_state(alert_id)
     
     # Update session state if it exists
     import streamlit as st
     if 'alerts' in st.session_state:
         st.session_state.alerts = load_alerts()
+
+def load_alert_state():
+    """
+    Load the notification state of every alert
+    
+    Returns:
+        dict: Alert ID -> {'watermark': ISO time}; jobs first seen at or before
+            the watermark have already been evaluated for that alert
+    """
+    try:
+        if os.path.exists(ALERT_STATE_PATH):
+            with open(ALERT_STATE_PATH, 'r') as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"Error loading alert state: {e}")
+    return {}
+
+def alert_watermark(alert, state):
+    """
+    Time after which jobs are new to an alert
+    
+    Args:
+        alert (dict): Job alert
+        state (dict): Alert state from load_alert_state
+        
+    Returns:
+        datetime.datetime: The alert's watermark, or its creation time if it has never run
+    """
+    watermark = state.get(alert['id'], {}).get('watermark')
+    if watermark:
+        return datetime.datetime.fromisoformat(watermark)
+    return alert['created_date']
+
+def advance_alert_watermarks(watermarks):
+    """
+    Record that alerts have been evaluated against every job first seen up to a time
+    
+    The state file is replaced atomically, so a crash leaves either the old or
+    the new watermarks, and the read-modify-write holds a file lock shared with
+    the other processes. Watermarks never move backwards.
+    
+    Args:
+        watermarks (dict): Alert ID -> datetime.datetime
+    """
+    with _alert_state_lock, _file_lock(ALERT_STATE_PATH):
+        state = load_alert_state()
+        changed = False
+        for alert_id, watermark in watermarks.items():
+            current = state.get(alert_id, {}).get('watermark')
+            if current is None or datetime.datetime.fromisoformat(current) < watermark:
+                state[alert_id] = dict(state.get(alert_id, {}), watermark=watermark.isoformat())
+                changed = True
+        if changed:
+            _write_alert_state(state)
+
+def _forget_alert_state(alert_id):
+    """Drop the state of a deleted alert."""
+    with _alert_state_lock, _file_lock(ALERT_STATE_PATH):
+        state = load_alert_state()
+        if state.pop(alert_id, None) is not None:
+            _write_alert_state(state)
+
+def _write_alert_state(state):
+    try:
+        _write_json_atomic(ALERT_STATE_PATH, state)
+    except Exception as e:
+        print(f"Error saving alert state: {e}")
+
+def _update_alert_index(signature_before, alert_id):
+    """
+    Apply a save_alert/delete_alert to the alert index, if it has been built
+    
+    Args:
+        signature_before (tuple): Alerts store signature taken before the write
+        alert_id (str): ID of the alert that was saved or deleted
+    """
+    global _alert_index_signature
+    with _alert_index_lock:
+        if _alert_index is None or _alert_index_signature != signature_before:
+            # Not built yet, or the alerts were changed elsewhere; get_alert_index resyncs
+            return
+        # Index the stored version, which may differ from what was passed in
+        stored = [alert for alert in _cached_value('alerts', ALERTS_PATH, _parse_alerts) if alert['id'] == alert_id]
+        if stored:
+            _alert_index.add_alert(stored[0])
+        else:
+            _alert_index.remove_alert(alert_id)
+        _alert_index_signature = _storage_signature(ALERTS_PATH)
+
+def get_alert_index():
+    """
+    Get the keyword automaton over all saved alerts
+    
+    Built on first use; alerts changed by another process since the last call
+    are added or removed individually.
+    
+    Returns:
+        alert_matcher.AlertIndex: Index matching every saved alert in one pass per job
+    """
+    global _alert_index, _alert_index_signature
+    with _alert_index_lock:
+        signature = _storage_signature(ALERTS_PATH)
+        if _alert_index is None:
+            _alert_index = AlertIndex()
+        if _alert_index_signature != signature:
+            _alert_index.sync(_cached_value('alerts', ALERTS_PATH, _parse_alerts))
+            _alert_index_signature = signature
+        return _alert_index
+
+def _write_json_atomic(path, data):
+    """Write JSON to a temporary file and move it into place so readers never see a partial file."""
+    # Per-process name, so writers in the app and the alert worker never share it
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, default=custom_json_encoder)
+    os.replace(tmp_path, path)
+
+def _is_shortened(description):
+    """Whether a stored description is a preview cut to DESCRIPTION_PREVIEW_CHARS."""
+    return len(description) > DESCRIPTION_PREVIEW_CHARS and description.endswith("...")
+
+def _best_description(descriptions):
+    """The most complete of a job's stored descriptions, or None if all are placeholders."""
+    usable = [
+        description for description in descriptions
+        if isinstance(description, str) and description and description not in PLACEHOLDER_DESCRIPTIONS
+    ]
+    if not usable:
+        return None
+    return max(usable, key=lambda description: (not _is_shortened(description), len(description)))
+
+def _description_signature():
+    """Fingerprint of the stores the description index is built from."""
+    return (_archive_signature(), _storage_signature(SAVED_JOBS_PATH), _storage_signature(APPLIED_JOBS_PATH))
+
+def _get_description_index():
+    """
+    Map the job ID of every archived, saved and applied job to its best description
+
+    Rebuilt when any of the three stores changed.
+    """
+    global _description_index, _description_index_signature
+    signature = _description_signature()
+    if _description_index is None or _description_index_signature != signature:
+        if JOBS_FORMAT == 'parquet':
+            archived = load_jobs(columns=['url', 'description']).to_dict('records')
+        else:
+            archived = _cached_records('jobs', JOBS_DATA_PATH)
+        descriptions = {}
+        for records in (archived, _cached_records('saved', SAVED_JOBS_PATH),
+                        _cached_records('applied', APPLIED_JOBS_PATH)):
+            for job in records:
+                job_id = extract_job_id(job.get('url'))
+                if job_id:
+                    descriptions.setdefault(job_id, []).append(job.get('description'))
+        _description_index = {
+            job_id: description for job_id, description in
+            ((job_id, _best_description(found)) for job_id, found in descriptions.items())
+            if description is not None
+        }
+        _description_index_signature = signature
+    return _description_index
+
+def get_known_description(url, full=False):
+    """
+    Look up the stored description of a job we have seen before
+    
+    The job archive, saved jobs and applied jobs are searched by the job's
+    LinkedIn/Indeed ID, so any URL of the same job matches.
+    
+    Args:
+        url (str): Job URL
+        full (bool): Only return a description stored whole, not a preview
+            shortened to DESCRIPTION_PREVIEW_CHARS
+        
+    Returns:
+        str: Stored description, or None if the job is unknown or only has a placeholder
+    """
+    job_id = extract_job_id(url)
+    if not DESCRIPTION_REUSE_ENABLED or not job_id:
+        return None
+    
+    try:
+        if STORAGE_BACKEND == 'sqlite' and JOBS_FORMAT != 'parquet':
+            # Indexed lookups; the canonical URL of a LinkedIn/Indeed job is
+            # derived from its ID alone
+            description = _best_description(sqlite_store.read_descriptions(canonicalize_url(url)))
+        else:
+            with _description_index_lock:
+                description = _get_description_index().get(job_id)
+    except Exception as e:
+        print(f"Error looking up job description: {e}")
+        return None
+    
+    if description is None or (full and _is_shortened(description)):
+        return None
+    return description
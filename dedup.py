@@ -0,0 +1,158 @@
+import re
+import zlib
+import numpy as np
+import pandas as pd
+from utils import canonicalize_url, clean_job_title
+
+# Minimum estimated overlap between two descriptions for them to count as the same job
+DESCRIPTION_SIMILARITY = 0.7
+# Minimum word overlap between two normalized titles
+TITLE_SIMILARITY = 0.8
+
+MINHASH_PERMUTATIONS = 64
+SHINGLE_SIZE = 3
+
+# Descriptions that carry no information about the posting
+UNINFORMATIVE_DESCRIPTIONS = (
+    "Click the link to view the full job description",
+    "No description available",
+)
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240331)
+_PERM_A = _rng.integers(1, _MERSENNE_PRIME, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _MERSENNE_PRIME, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+_COMPANY_SUFFIXES = re.compile(
+    r'\b(pvt|private|ltd|limited|inc|incorporated|llc|llp|corp|corporation|co|company|plc|gmbh)\b'
+)
+
+def _normalize_text(text):
+    return _NON_WORD.sub(' ', str(text).lower()).strip()
+
+def _normalize_title(title):
+    return _normalize_text(clean_job_title(str(title)))
+
+def _normalize_company(company):
+    return ' '.join(_COMPANY_SUFFIXES.sub(' ', _normalize_text(company)).split())
+
+def _normalize_city(location):
+    # "Indore, Madhya Pradesh" and "Indore, Madhya Pradesh, India" are the same place
+    return _normalize_text(str(location).split(',')[0])
+
+def _minhash(text):
+    """
+    MinHash signature of a description's word shingles
+
+    Args:
+        text (str): Description text
+
+    Returns:
+        tuple: (numpy array signature, number of shingles), or (None, 0) for empty text
+    """
+    words = _normalize_text(text).split()
+    if not words:
+        return None, 0
+    size = min(SHINGLE_SIZE, len(words))
+    shingles = {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+    signature = ((_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME).min(axis=1)
+    return signature, len(shingles)
+
+def _description_overlap(a, b):
+    """
+    Estimate how much of the shorter description is contained in the longer one
+
+    An Indeed snippet and the LinkedIn page for the same job have a low Jaccard
+    similarity because one is a short excerpt of the other, so the MinHash
+    Jaccard estimate is converted into a containment estimate.
+    """
+    (sig_a, size_a), (sig_b, size_b) = a, b
+    jaccard = float(np.mean(sig_a == sig_b))
+    intersection = jaccard * (size_a + size_b) / (1 + jaccard)
+    return intersection / min(size_a, size_b)
+
+def _title_similarity(a, b):
+    words_a, words_b = set(a.split()), set(b.split())
+    if not words_a or not words_b:
+        return 0.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+def dedupe_jobs(jobs_df):
+    """
+    Collapse duplicate and near-duplicate job postings
+
+    Postings are first deduplicated by canonical URL. The remaining postings
+    are grouped by normalized company and city. Within a group, two postings
+    are the same job if their titles match and their descriptions overlap
+    (by MinHash over word shingles). A posting whose description is a
+    placeholder is also the same job as one with a matching title, unless both
+    have links, which then point to different jobs. The first posting of each
+    duplicate set is kept; if its description is a placeholder, it takes a
+    real one from a duplicate.
+
+    Args:
+        jobs_df (pandas.DataFrame): Combined job listings
+
+    Returns:
+        pandas.DataFrame: Job listings without duplicates, in their original order
+    """
+    if jobs_df.empty or 'url' not in jobs_df.columns:
+        return jobs_df
+
+    jobs_df = jobs_df.copy()
+    canonical_urls = jobs_df['url'].map(canonicalize_url)
+    # "#" means the card had no link, which says nothing about duplicates
+    has_url = canonical_urls.notna() & (canonical_urls != "#")
+    keep = ~(has_url & canonical_urls.duplicated())
+    jobs_df = jobs_df[keep].reset_index(drop=True)
+    linked = has_url[keep].reset_index(drop=True)
+
+    def column(name):
+        # Plain objects, so categorical columns don't group by every category combination
+        return jobs_df[name].astype(object) if name in jobs_df.columns else pd.Series('', index=jobs_df.index)
+
+    titles = column('title').map(_normalize_title)
+    companies = column('company').map(_normalize_company)
+    cities = column('location').map(_normalize_city)
+    descriptions = column('description')
+
+    signatures = {}
+    def signature(i):
+        if i not in signatures:
+            text = descriptions.iat[i]
+            signatures[i] = (None, 0) if text in UNINFORMATIVE_DESCRIPTIONS else _minhash(text)
+        return signatures[i]
+
+    drop = set()
+    blocks = pd.Series(range(len(jobs_df))).groupby([companies, cities]).groups
+    for rows in blocks.values():
+        rows = list(rows)
+        if len(rows) < 2:
+            continue
+        kept = []
+        for i in rows:
+            for k in kept:
+                if titles.iat[i] != titles.iat[k] and _title_similarity(titles.iat[i], titles.iat[k]) < TITLE_SIMILARITY:
+                    continue
+                sig_i, sig_k = signature(i), signature(k)
+                if sig_i[0] is None or sig_k[0] is None:
+                    # Distinct links are distinct postings (e.g. two openings with
+                    # the same title); without both texts there is no evidence otherwise
+                    same = not (linked.iat[i] and linked.iat[k])
+                else:
+                    same = _description_overlap(sig_i, sig_k) >= DESCRIPTION_SIMILARITY
+                if same:
+                    # Keep the first posting, but don't keep a placeholder when a duplicate has text
+                    if sig_k[0] is None and sig_i[0] is not None:
+                        jobs_df.at[k, 'description'] = descriptions.iat[i]
+                        signatures[k] = sig_i
+                    drop.add(i)
+                    break
+            else:
+                kept.append(i)
+
+    if drop:
+        jobs_df = jobs_df.drop(index=list(drop)).reset_index(drop=True)
+    return jobs_df
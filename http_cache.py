@@ -0,0 +1,231 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Location and size budget of the on-disk response cache
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", ".http_cache")
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "1") != "0"
+
+# Freshness lifetime in seconds per kind of page
+CACHE_TTLS = {
+    'search': 15 * 60,  # Search result pages go stale quickly
+    'detail': 7 * 24 * 60 * 60,  # Job pages rarely change once posted
+}
+DEFAULT_CACHE_TTL = 60 * 60
+
+_cache_lock = threading.Lock()
+_cache_bytes = None  # Running total of cache size, computed on first use
+_cache_stats = {
+    'hits': 0,
+    'misses': 0,
+    'revalidated': 0,
+    'stores': 0,
+    'evictions': 0,
+}
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response built from a cache entry."""
+
+    def __init__(self, entry):
+        self.status_code = entry['status_code']
+        self.text = entry['text']
+        self.headers = entry.get('headers', {})
+        self.url = entry['url']
+        self.from_cache = True
+
+def normalize_url(url, params=None):
+    """
+    Normalize a URL and its query parameters into a stable cache key string
+
+    Args:
+        url (str): URL to normalize
+        params (dict, optional): Extra query parameters to merge into the URL
+
+    Returns:
+        str: URL with a lowercase scheme and host, no default port or fragment,
+            and query parameters sorted
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+    query.sort()
+
+    return urlunsplit((scheme, netloc, parts.path or '/', urlencode(query), ''))
+
+def _entry_path(key):
+    return os.path.join(HTTP_CACHE_DIR, f"{key}.json")
+
+def _current_cache_bytes():
+    """Size of the cache directory, scanned once and then tracked incrementally."""
+    global _cache_bytes
+    if _cache_bytes is None:
+        total = 0
+        if os.path.isdir(HTTP_CACHE_DIR):
+            for entry in os.scandir(HTTP_CACHE_DIR):
+                if entry.name.endswith('.json'):
+                    total += entry.stat().st_size
+        _cache_bytes = total
+    return _cache_bytes
+
+def _load_entry(key):
+    try:
+        with open(_entry_path(key), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_entry(key, entry):
+    global _cache_bytes
+    os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+    path = _entry_path(key)
+    old_size = os.path.getsize(path) if os.path.exists(path) else 0
+
+    # Write to a temporary file first so readers never see a partial entry
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+
+    with _cache_lock:
+        _cache_bytes = _current_cache_bytes() + os.path.getsize(path) - old_size
+    _evict_if_needed()
+
+def _evict_if_needed():
+    """Remove least recently used entries until the cache fits its size budget."""
+    global _cache_bytes
+    with _cache_lock:
+        if _current_cache_bytes() <= HTTP_CACHE_MAX_BYTES:
+            return
+
+        # Entry mtimes are bumped on every hit, so oldest mtime = least recently used
+        entries = []
+        for entry in os.scandir(HTTP_CACHE_DIR):
+            if entry.name.endswith('.json'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= HTTP_CACHE_MAX_BYTES:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                _cache_stats['evictions'] += 1
+            except OSError:
+                pass
+        _cache_bytes = total
+
+def _count(stat):
+    with _cache_lock:
+        _cache_stats[stat] += 1
+
+def cached_fetch(url, params, kind, fetch):
+    """
+    Fetch a URL through the response cache
+
+    Fresh entries are returned without touching the network. Stale entries are
+    revalidated with If-None-Match/If-Modified-Since, and a 304 answer refreshes
+    the entry instead of downloading the page again.
+
+    Args:
+        url (str): URL to fetch
+        params (dict): Query parameters sent with the request
+        kind (str): Kind of page, used to pick the TTL from CACHE_TTLS
+        fetch (callable): Function taking a dict of extra request headers and
+            returning a requests.Response
+
+    Returns:
+        requests.Response or CachedResponse: Response for the URL
+    """
+    normalized_url = normalize_url(url, params)
+    key = hashlib.sha256(normalized_url.encode('utf-8')).hexdigest()
+    ttl = CACHE_TTLS.get(kind, DEFAULT_CACHE_TTL)
+    now = time.time()
+
+    entry = _load_entry(key)
+    if entry and now - entry['stored_at'] < ttl:
+        _count('hits')
+        try:
+            os.utime(_entry_path(key))
+        except OSError:
+            pass
+        return CachedResponse(entry)
+
+    # Stale or missing: ask the server, revalidating if we have validators
+    conditional_headers = {}
+    if entry:
+        if entry['headers'].get('ETag'):
+            conditional_headers['If-None-Match'] = entry['headers']['ETag']
+        if entry['headers'].get('Last-Modified'):
+            conditional_headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+
+    response = fetch(conditional_headers)
+
+    if entry and response.status_code == 304:
+        _count('revalidated')
+        entry['stored_at'] = now
+        try:
+            _write_entry(key, entry)
+        except OSError as e:
+            print(f"Error writing HTTP cache entry: {e}")
+        return CachedResponse(entry)
+
+    _count('misses')
+    if response.status_code == 200:
+        entry = {
+            'url': normalized_url,
+            'kind': kind,
+            'status_code': response.status_code,
+            'text': response.text,
+            'headers': {
+                name: response.headers[name]
+                for name in ('ETag', 'Last-Modified', 'Content-Type')
+                if name in response.headers
+            },
+            'stored_at': now,
+        }
+        try:
+            _write_entry(key, entry)
+            _count('stores')
+        except OSError as e:
+            print(f"Error writing HTTP cache entry: {e}")
+
+    return response
+
+def get_cache_stats():
+    """
+    Get hit/miss counters and the current size of the response cache
+
+    Returns:
+        dict: Counters plus 'bytes' and 'hit_rate'
+    """
+    with _cache_lock:
+        stats = dict(_cache_stats)
+        stats['bytes'] = _current_cache_bytes()
+    lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+    stats['hit_rate'] = (stats['hits'] + stats['revalidated']) / lookups if lookups else 0.0
+    return stats
+
+def clear_cache():
+    """Delete every cached response and reset the counters."""
+    global _cache_bytes
+    with _cache_lock:
+        if os.path.isdir(HTTP_CACHE_DIR):
+            for entry in os.scandir(HTTP_CACHE_DIR):
+                if entry.name.endswith('.json'):
+                    os.remove(entry.path)
+        _cache_bytes = 0
+        for stat in _cache_stats:
+            _cache_stats[stat] = 0
@@ -0,0 +1,94 @@
+import datetime
+from dataclasses import dataclass, fields
+import pandas as pd
+
+@dataclass(slots=True)
+class Job:
+    """One job posting with the fixed set of fields every source provides."""
+    title: str
+    company: str
+    location: str
+    description: str
+    url: str
+    job_type: str
+    date_posted: datetime.datetime
+    source: str
+    first_seen: datetime.datetime = None
+    last_seen: datetime.datetime = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Job from a job dictionary, ignoring fields outside the schema."""
+        return cls(**{name: data.get(name) for name in JOB_FIELDS})
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in JOB_FIELDS}
+
+JOB_FIELDS = [field.name for field in fields(Job)]
+
+# Low-cardinality text columns are stored once per distinct value
+CATEGORY_COLUMNS = ['source', 'job_type', 'company', 'location']
+DATE_COLUMNS = ['date_posted', 'first_seen', 'last_seen']
+
+def apply_job_dtypes(jobs_df, date_columns=DATE_COLUMNS):
+    """
+    Convert a jobs DataFrame to the compact schema
+
+    source, job_type, company and location become categoricals and the date
+    columns datetime64. Other columns are left as they are.
+
+    Args:
+        jobs_df (pandas.DataFrame): Job listings
+        date_columns (list, optional): Columns holding dates, as datetimes or ISO strings
+
+    Returns:
+        pandas.DataFrame: The same DataFrame, converted in place
+    """
+    if jobs_df.empty:
+        return jobs_df
+    for column in CATEGORY_COLUMNS:
+        if column in jobs_df.columns and not isinstance(jobs_df[column].dtype, pd.CategoricalDtype):
+            jobs_df[column] = jobs_df[column].astype('category')
+    for column in date_columns:
+        if column in jobs_df.columns and not pd.api.types.is_datetime64_any_dtype(jobs_df[column]):
+            # Dates with zero microseconds are stored without a fraction
+            jobs_df[column] = pd.to_datetime(jobs_df[column], format='ISO8601')
+    return jobs_df
+
+def jobs_to_frame(jobs):
+    """
+    Build a jobs DataFrame from Job objects or job dictionaries
+
+    Args:
+        jobs (list): Job objects or dictionaries
+
+    Returns:
+        pandas.DataFrame: Job listings in the compact schema
+    """
+    if jobs and isinstance(jobs[0], Job):
+        # Column-wise construction; no per-row dict is built
+        jobs_df = pd.DataFrame({name: [getattr(job, name) for job in jobs] for name in JOB_FIELDS})
+        if jobs_df['first_seen'].isna().all() and jobs_df['last_seen'].isna().all():
+            jobs_df = jobs_df.drop(columns=['first_seen', 'last_seen'])
+    else:
+        jobs_df = pd.DataFrame(jobs)
+    return apply_job_dtypes(jobs_df)
+
+def frame_to_jobs(jobs_df):
+    """
+    Convert a jobs DataFrame to Job objects
+
+    Args:
+        jobs_df (pandas.DataFrame): Job listings
+
+    Returns:
+        list: Job objects in row order; missing values become None
+    """
+    columns = []
+    for name in JOB_FIELDS:
+        if name in jobs_df.columns:
+            column = jobs_df[name].astype(object)
+            columns.append(column.where(column.notna(), None).tolist())
+        else:
+            columns.append([None] * len(jobs_df))
+    return [Job(*values) for values in zip(*columns)]
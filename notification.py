@@ -2,119 +2,323 @@ import smtplib
 import os
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from html import escape
+from string import Formatter
+from urllib.parse import urlsplit
 import datetime
+import pandas as pd
 
-def send_job_alert_email(recipient_email, alert_name, matching_jobs):
+# A session is closed and reopened after this many messages, since many
+# providers cap the messages accepted per connection
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+SMTP_TIMEOUT = 30
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") != "0"
+
+# Jobs listed in one email; the rest are summarized as "...and N more"
+MAX_JOBS_PER_DIGEST = int(os.getenv("JOBFINDER_MAX_JOBS_PER_DIGEST", "50"))
+
+# Errors after which the session is dropped and the message retried on a new one
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+class SMTPSessionError(smtplib.SMTPException):
+    """The SMTP session could not be opened (connect, STARTTLS or login failed); no message was refused."""
+
+def email_configured():
+    """Whether EMAIL_PASSWORD is set, so alert emails are actually sent."""
+    return bool(os.getenv("EMAIL_PASSWORD", ""))
+
+class SMTPTransport:
+    """
+    Sends messages over one authenticated SMTP session instead of one per message
+
+    The session is opened on the first send, reused for up to
+    `max_messages_per_connection` messages and then replaced. If the server has
+    dropped the session (timeouts, 421 replies), the message is retried once on
+    a new session. Use as a context manager so the session is closed with QUIT.
     """
-    Send an email notification for job alerts
     
-    Args:
-        recipient_email (str): Email address to send the notification to
-        alert_name (str): Name of the job alert
-        matching_jobs (list): List of job dictionaries that match the alert criteria
+    def __init__(self, host=None, port=None, username=None, password=None, starttls=None,
+                 max_messages_per_connection=None, timeout=SMTP_TIMEOUT):
+        """
+        Args:
+            host (str, optional): SMTP server; defaults to SMTP_SERVER
+            port (int, optional): SMTP port; defaults to SMTP_PORT
+            username (str, optional): Login name; defaults to EMAIL_SENDER
+            password (str, optional): Login password; defaults to EMAIL_PASSWORD. No
+                login is attempted without one.
+            starttls (bool, optional): Upgrade the session with STARTTLS; defaults to SMTP_STARTTLS
+            max_messages_per_connection (int, optional): Messages sent before the
+                session is replaced; defaults to SMTP_MAX_MESSAGES_PER_CONNECTION
+            timeout (float, optional): Socket timeout in seconds
+        """
+        self.host = host or os.getenv("SMTP_SERVER", "smtp.gmail.com")
+        self.port = port or int(os.getenv("SMTP_PORT", "587"))
+        self.username = username or os.getenv("EMAIL_SENDER", "jobfinder@example.com")
+        self.password = os.getenv("EMAIL_PASSWORD", "") if password is None else password
+        self.starttls = SMTP_STARTTLS if starttls is None else starttls
+        self.max_messages_per_connection = max_messages_per_connection or SMTP_MAX_MESSAGES_PER_CONNECTION
+        self.timeout = timeout
+        self.connections = 0
+        self._server = None
+        self._sent_on_connection = 0
     
-    Returns:
-        bool: True if the email was sent successfully, False otherwise
-    """
-    # Get email credentials from environment variables
-    sender_email = os.getenv("EMAIL_SENDER", "jobfinder@example.com")
-    sender_password = os.getenv("EMAIL_PASSWORD", "")
-    smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-    smtp_port = int(os.getenv("SMTP_PORT", "587"))
-    
-    # If no sender password is set, log a message instead of sending email
-    if not sender_password:
-        print(f"Email would be sent to {recipient_email} for alert '{alert_name}' with {len(matching_jobs)} matching jobs")
-        print("Set EMAIL_PASSWORD environment variable to enable actual email sending")
-        return False
-    
-    try:
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = recipient_email
-        msg['Subject'] = f"Job Alert: {alert_name} - {len(matching_jobs)} new matching jobs"
-        
-        # Build email body
-        email_body = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; }}
-                .job-card {{ 
-                    border: 1px solid #ddd; 
-                    padding: 15px; 
-                    margin-bottom: 15px; 
-                    border-radius: 5px;
-                }}
-                .job-title {{ 
-                    color: #0066CC; 
-                    font-size: 18px; 
-                    margin-top: 0;
-                    margin-bottom: 5px;
-                }}
-                .company {{ 
-                    font-weight: bold; 
-                    margin-bottom: 5px;
-                }}
-                .apply-button {{
-                    display: inline-block;
-                    background-color: #28A745;
-                    color: white;
-                    padding: 8px 15px;
-                    text-decoration: none;
-                    border-radius: 4px;
-                    margin-top: 10px;
-                }}
-            </style>
-        </head>
-        <body>
-            <h2>Job Alert: {alert_name}</h2>
-            <p>We found {len(matching_jobs)} new jobs matching your alert criteria:</p>
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _connect(self):
+        try:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        except Exception as e:
+            raise SMTPSessionError(f"Cannot connect to {self.host}:{self.port}: {type(e).__name__}: {e}") from e
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.password:
+                server.login(self.username, self.password)
+        except Exception as e:
+            server.close()
+            raise SMTPSessionError(f"Cannot log in to {self.host}:{self.port}: {type(e).__name__}: {e}") from e
+        self._server = server
+        self._sent_on_connection = 0
+        self.connections += 1
+    
+    def close(self):
+        """End the current session, if any."""
+        server, self._server = self._server, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+    
+    def send(self, msg):
         """
+        Send one message, opening or replacing the session as needed
         
-        # Add each job to the email
-        for job in matching_jobs:
-            posted_date = job.get('date_posted')
-            if isinstance(posted_date, str):
-                try:
-                    posted_date = datetime.datetime.fromisoformat(posted_date)
-                    date_str = posted_date.strftime('%Y-%m-%d')
-                except:
-                    date_str = posted_date
-            elif isinstance(posted_date, datetime.datetime):
-                date_str = posted_date.strftime('%Y-%m-%d')
-            else:
-                date_str = "Unknown"
-                
-            email_body += f"""
-            <div class="job-card">
-                <h3 class="job-title">{job.get('title', 'Unknown Title')}</h3>
-                <p class="company">{job.get('company', 'Unknown Company')} - {job.get('location', 'Unknown Location')}</p>
-                <p>{job.get('job_type', 'Unknown Type')} | Posted: {date_str}</p>
-                <p>{job.get('description', 'No description available')[:200]}...</p>
-                <a href="{job.get('url', '#')}" class="apply-button">View Job</a>
-            </div>
-            """
+        Args:
+            msg (email.message.Message): Message with From and To headers
         
-        email_body += """
-            <p>Thank you for using Job Finder!</p>
-        </body>
-        </html>
+        Raises:
+            SMTPSessionError: If no session could be opened
+            smtplib.SMTPException: If the server rejects the message
         """
-        
-        # Attach HTML content
-        msg.attach(MIMEText(email_body, 'html'))
-        
-        # Connect to SMTP server and send email
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(sender_email, sender_password)
-            server.send_message(msg)
-        
-        print(f"Email alert sent successfully to {recipient_email}")
-        return True
+        if self._server is not None and self._sent_on_connection >= self.max_messages_per_connection:
+            self.close()
+        for attempt in range(2):
+            if self._server is None:
+                self._connect()
+            try:
+                self._server.send_message(msg)
+                self._sent_on_connection += 1
+                return
+            except smtplib.SMTPResponseException as e:
+                # 421: the server is closing the session, so try a new one
+                if e.smtp_code != 421 or attempt:
+                    raise
+            except _CONNECTION_ERRORS:
+                if attempt:
+                    raise
+            # The session is unusable; drop it without waiting for QUIT
+            server, self._server = self._server, None
+            server.close()
+
+def _compile_template(template):
+    """
+    Split a str.format-style template into (literal, field) pairs once
+    
+    Args:
+        template (str): Template with {field} placeholders
+    
+    Returns:
+        tuple: (literal text, field name or None) pairs for _render
+    """
+    return tuple((literal, field) for literal, field, spec, conversion in Formatter().parse(template))
+
+def _render(compiled, values):
+    """Fill a compiled template in one pass; values must already be escaped."""
+    return "".join([literal + (values[field] if field is not None else "") for literal, field in compiled])
+
+# The stylesheet and page frame are emitted once per message; only the job
+# cards repeat
+_HTML_PAGE = _compile_template("""<html>
+<head>
+<style>
+body {{ font-family: Arial, sans-serif; }}
+.job-card {{ border: 1px solid #ddd; padding: 15px; margin-bottom: 15px; border-radius: 5px; }}
+.job-title {{ color: #0066CC; font-size: 18px; margin-top: 0; margin-bottom: 5px; }}
+.company {{ font-weight: bold; margin-bottom: 5px; }}
+.apply-button {{ display: inline-block; background-color: #28A745; color: white; padding: 8px 15px; text-decoration: none; border-radius: 4px; margin-top: 10px; }}
+</style>
+</head>
+<body>
+{sections}
+<p>Thank you for using Job Finder!</p>
+</body>
+</html>
+""")
+_HTML_SECTION = _compile_template("""<h2>Job Alert: {alert_name}</h2>
+<p>We found {total} new jobs matching your alert criteria:</p>
+{cards}{more}""")
+_HTML_CARD = _compile_template("""<div class="job-card">
+<h3 class="job-title">{title}</h3>
+<p class="company">{company} - {location}</p>
+<p>{job_type} | Posted: {date}</p>
+<p>{snippet}...</p>
+<a href="{url}" class="apply-button">View Job</a>
+</div>
+""")
+_HTML_MORE = _compile_template("""<p>...and {count} more. Search for "{alert_name}" in Job Finder to see them all.</p>
+""")
+_TEXT_SECTION = _compile_template("""Job Alert: {alert_name}
+We found {total} new jobs matching your alert criteria:
+
+{cards}{more}
+""")
+_TEXT_CARD = _compile_template("""{title}
+{company} - {location}
+{job_type} | Posted: {date}
+{url}
+
+""")
+_TEXT_MORE = _compile_template("""...and {count} more.
+""")
+
+def _format_date(posted_date):
+    if isinstance(posted_date, str):
+        try:
+            return datetime.datetime.fromisoformat(posted_date).strftime('%Y-%m-%d')
+        except ValueError:
+            return posted_date
+    if isinstance(posted_date, datetime.datetime) and not pd.isna(posted_date):
+        return posted_date.strftime('%Y-%m-%d')
+    return "Unknown"
+
+def _text(value, default):
+    """A field's text, or `default` when it is missing (None, NaN) or blank."""
+    return value if isinstance(value, str) and value.strip() else default
+
+def _safe_url(url):
+    """The job link if it is a plain web link; "#" otherwise, so e.g. javascript: never reaches an href."""
+    url = _text(url, '#').strip()
+    return url if urlsplit(url).scheme.lower() in ('http', 'https') else '#'
+
+def _job_fields(job):
+    """Display text of a job's fields, unescaped."""
+    description = job.get('description')
+    return {
+        'title': _text(job.get('title'), 'Unknown Title'),
+        'company': _text(job.get('company'), 'Unknown Company'),
+        'location': _text(job.get('location'), 'Unknown Location'),
+        'job_type': _text(job.get('job_type'), 'Unknown Type'),
+        'date': _format_date(job.get('date_posted')),
+        'snippet': description[:200] if isinstance(description, str) else 'No description available',
+        'url': _safe_url(job.get('url')),
+    }
+
+def limit_digest(sections, max_jobs=None):
+    """
+    Cap the number of jobs in a digest, sharing the cap fairly between alerts
+    
+    Every alert gets an equal share of MAX_JOBS_PER_DIGEST; shares an alert
+    does not need go to the others.
+    
+    Args:
+        sections (list): (alert name, matching job dicts) pairs
+        max_jobs (int, optional): Cap; defaults to MAX_JOBS_PER_DIGEST
+    
+    Returns:
+        list: Dicts with 'alert_name', the kept 'jobs' and the 'total' number matched
+    """
+    max_jobs = MAX_JOBS_PER_DIGEST if max_jobs is None else max_jobs
+    totals = [len(jobs) for alert_name, jobs in sections]
+    limits = [0] * len(sections)
+    remaining = max_jobs
+    open_sections = [i for i, total in enumerate(totals) if total]
+    while remaining > 0 and open_sections:
+        share = max(remaining // len(open_sections), 1)
+        for i in list(open_sections):
+            take = min(share, totals[i] - limits[i], remaining)
+            limits[i] += take
+            remaining -= take
+            if limits[i] == totals[i]:
+                open_sections.remove(i)
+            if remaining == 0:
+                break
+    return [{'alert_name': alert_name, 'jobs': list(jobs[:limit]), 'total': total}
+            for (alert_name, jobs), limit, total in zip(sections, limits, totals)]
+
+def render_digest(sections):
+    """
+    Render the HTML and plain-text bodies of an alert email
+    
+    Args:
+        sections (list): Dicts with 'alert_name', 'jobs' and optionally 'total'
+            (the number of matches, when 'jobs' was capped)
+    
+    Returns:
+        tuple: (HTML body, plain-text body)
+    """
+    html_sections = []
+    text_sections = []
+    for section in sections:
+        jobs = section['jobs']
+        total = section.get('total', len(jobs))
+        alert_name = str(section['alert_name'])
+        html_cards = []
+        text_cards = []
+        for job in jobs:
+            fields = _job_fields(job)
+            text_cards.append(_render(_TEXT_CARD, fields))
+            html_cards.append(_render(_HTML_CARD, {name: escape(value) for name, value in fields.items()}))
+        more = {'count': str(total - len(jobs)), 'alert_name': escape(alert_name)}
+        html_sections.append(_render(_HTML_SECTION, {
+            'alert_name': escape(alert_name),
+            'total': str(total),
+            'cards': "".join(html_cards),
+            'more': _render(_HTML_MORE, more) if total > len(jobs) else "",
+        }))
+        text_sections.append(_render(_TEXT_SECTION, {
+            'alert_name': alert_name,
+            'total': str(total),
+            'cards': "".join(text_cards),
+            'more': _render(_TEXT_MORE, more) if total > len(jobs) else "",
+        }))
+    html_body = _render(_HTML_PAGE, {'sections': "".join(html_sections)})
+    text_body = "".join(text_sections) + "Thank you for using Job Finder!\n"
+    return html_body, text_body
+
+def build_digest_message(sender_email, recipient_email, sections, message_id=None):
+    """
+    Build one email listing the new matches of several alerts
+    
+    Args:
+        sender_email (str): From address
+        recipient_email (str): Email address to send the notification to
+        sections (list): Dicts with 'alert_name', 'jobs' and optionally 'total',
+            e.g. from limit_digest
+        message_id (str, optional): Message-ID header, so a resent copy can be recognized
+    
+    Returns:
+        email.mime.multipart.MIMEMultipart: multipart/alternative message with
+            plain-text and HTML parts
+    """
+    total = sum(section.get('total', len(section['jobs'])) for section in sections)
+    msg = MIMEMultipart('alternative')
+    msg['From'] = sender_email
+    msg['To'] = recipient_email
+    if len(sections) == 1:
+        msg['Subject'] = f"Job Alert: {sections[0]['alert_name']} - {total} new matching jobs"
+    else:
+        msg['Subject'] = f"Job Alerts: {total} new matching jobs for {len(sections)} alerts"
+    if message_id:
+        msg['Message-ID'] = message_id
     
-    except Exception as e:
-        print(f"Error sending email alert: {e}")
-        return False
+    html_body, text_body = render_digest(sections)
+    # Clients show the last part they can display, so HTML goes last
+    msg.attach(MIMEText(text_body, 'plain'))
+    msg.attach(MIMEText(html_body, 'html'))
+    return msg
@@ -0,0 +1,473 @@
+"""
+Durable outbox for alert emails.
+
+Alert checks enqueue emails here and return; delivery workers send them in the
+background with retries, so a slow or failing SMTP server never holds up
+matching. Every email is one JSON file in a spool directory and moves between
+subdirectories as it is processed:
+
+    pending/   waiting to be sent; the file's mtime is the earliest next attempt
+    inflight/  claimed by a delivery worker
+    sent/      delivered; pruned after OUTBOX_SENT_RETENTION_DAYS
+    dead/      failed permanently or OUTBOX_MAX_ATTEMPTS times
+
+Moves are os.rename calls, so a file is in exactly one state and only one
+worker can claim it. An email is a digest of every alert of one recipient
+that matched in a check. Files are named by an idempotency key built from the
+alerts it covers and the watermark it runs up to, so enqueueing the same email
+twice (e.g. after a crash before the watermarks advanced) is a no-op.
+
+If the SMTP session itself cannot be opened (server unreachable, login
+refused), no email is at fault: the claimed email goes back to pending
+without using up an attempt and delivery pauses, backing off like a retry.
+
+Usage:
+    python outbox.py status
+    python outbox.py deliver      # send everything that is due, then exit; not while the worker runs
+    python outbox.py retry-dead   # move dead emails back to pending
+"""
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import smtplib
+import datetime
+import threading
+
+from data_manager import custom_json_encoder
+from notification import SMTPTransport, SMTPSessionError, build_digest_message, limit_digest
+
+OUTBOX_DIR = os.getenv("JOBFINDER_OUTBOX_DIR", "outbox")
+OUTBOX_WORKERS = int(os.getenv("JOBFINDER_OUTBOX_WORKERS", "4"))
+OUTBOX_POLL_INTERVAL = 5
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("JOBFINDER_OUTBOX_MAX_ATTEMPTS", "6"))
+# Retry n waits OUTBOX_BACKOFF_SECONDS * 2**(n-1), up to OUTBOX_MAX_BACKOFF_SECONDS, +-10% jitter
+OUTBOX_BACKOFF_SECONDS = 60
+OUTBOX_MAX_BACKOFF_SECONDS = 3600
+OUTBOX_SENT_RETENTION_DAYS = 7
+
+STATES = ('pending', 'inflight', 'sent', 'dead')
+
+# Key prefix of emails covering several alerts; their alert IDs are in the file
+DIGEST_KEY_PREFIX = 'digest-'
+
+def _state_dir(state):
+    return os.path.join(OUTBOX_DIR, state)
+
+def _path(state, key):
+    return os.path.join(_state_dir(state), f"{key}.json")
+
+def _ensure_dirs():
+    for state in STATES:
+        os.makedirs(_state_dir(state), exist_ok=True)
+
+def _read(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _write_atomic(path, message):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(message, f, default=custom_json_encoder)
+    os.replace(tmp_path, path)
+
+def idempotency_key(alert_ids, watermark):
+    """
+    Key of the email that notifies alerts of the jobs up to a watermark
+
+    Args:
+        alert_ids (list): IDs of the alerts in the email
+        watermark (datetime.datetime): Newest first_seen time the email covers
+
+    Returns:
+        str: File-name-safe key; the alert ID itself for a single alert
+    """
+    if len(alert_ids) == 1:
+        group = alert_ids[0]
+    else:
+        digest = hashlib.sha1("\0".join(sorted(alert_ids)).encode('utf-8')).hexdigest()[:16]
+        group = f"{DIGEST_KEY_PREFIX}{digest}"
+    return f"{group}_{watermark.strftime('%Y%m%dT%H%M%S%f')}"
+
+def _parse_key(key):
+    alert_id, _, watermark = key.rpartition('_')
+    return alert_id, datetime.datetime.strptime(watermark, '%Y%m%dT%H%M%S%f')
+
+def enqueue(recipient, alert_matches, watermark):
+    """
+    Queue one email with the new matches of one or more alerts
+
+    Args:
+        recipient (str): Email address to send to
+        alert_matches (list): (alert dict, matching job dicts) pairs, in the
+            order they appear in the email
+        watermark (datetime.datetime): Newest first_seen time covered by this email
+
+    Returns:
+        bool: True if queued, False if an email with the same key already exists
+    """
+    _ensure_dirs()
+    alert_ids = [alert['id'] for alert, jobs in alert_matches]
+    key = idempotency_key(alert_ids, watermark)
+    if any(os.path.exists(_path(state, key)) for state in STATES):
+        return False
+
+    # Only the jobs the email will list are stored
+    sections = limit_digest([(alert['name'], jobs) for alert, jobs in alert_matches])
+    message = {
+        'key': key,
+        'alert_ids': alert_ids,
+        'recipient': recipient,
+        'sections': sections,
+        'attempts': 0,
+        'last_error': None,
+        'created': datetime.datetime.now().isoformat(),
+    }
+    tmp_path = os.path.join(_state_dir('pending'), f".{key}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(message, f, default=custom_json_encoder)
+    try:
+        # link() fails if the key exists, so a concurrent enqueue cannot overwrite it
+        os.link(tmp_path, _path('pending', key))
+    except FileExistsError:
+        return False
+    finally:
+        os.remove(tmp_path)
+    return True
+
+def _alert_ids(listed_state, key, group):
+    """IDs of the alerts an email covers, or None if it moved on meanwhile."""
+    if not group.startswith(DIGEST_KEY_PREFIX):
+        return [group]
+    for state in STATES[STATES.index(listed_state):]:
+        # Follow the file if a delivery worker moved it since listdir()
+        try:
+            return _read(_path(state, key))['alert_ids']
+        except FileNotFoundError:
+            continue
+    return None
+
+def enqueued_watermarks(after=None):
+    """
+    Newest watermark with a queued or delivered email, per alert
+
+    Used to repair alert watermarks after a crash between enqueue and
+    advancing the watermark.
+
+    Args:
+        after (datetime.datetime, optional): Skip emails at or before this
+            watermark, which cannot move any alert forward; saves reading them
+
+    Returns:
+        dict: Alert ID -> datetime.datetime
+    """
+    watermarks = {}
+    for state in STATES:
+        try:
+            names = os.listdir(_state_dir(state))
+        except FileNotFoundError:
+            continue
+        for name in names:
+            if not name.endswith('.json') or name.startswith('.'):
+                continue
+            key = name[:-len('.json')]
+            try:
+                group, watermark = _parse_key(key)
+            except ValueError:
+                continue
+            if after is not None and watermark <= after:
+                continue
+            for alert_id in _alert_ids(state, key, group) or []:
+                if alert_id not in watermarks or watermarks[alert_id] < watermark:
+                    watermarks[alert_id] = watermark
+    return watermarks
+
+def counts():
+    """
+    Number of emails in each state
+
+    Returns:
+        dict: State -> count
+    """
+    result = {}
+    for state in STATES:
+        try:
+            result[state] = sum(1 for name in os.listdir(_state_dir(state)) if name.endswith('.json'))
+        except FileNotFoundError:
+            result[state] = 0
+    return result
+
+def recover_inflight():
+    """
+    Put emails left in inflight/ by a stopped or crashed worker back in pending/
+
+    An email whose send went through just before the crash is sent again; it
+    keeps its Message-ID, so mail clients can recognize the copy.
+
+    Returns:
+        int: Number of emails recovered
+    """
+    _ensure_dirs()
+    recovered = 0
+    for name in os.listdir(_state_dir('inflight')):
+        if name.endswith('.json'):
+            os.replace(os.path.join(_state_dir('inflight'), name), os.path.join(_state_dir('pending'), name))
+            recovered += 1
+    return recovered
+
+def due_keys():
+    """
+    Keys of the pending emails that are due, oldest first
+
+    Returns:
+        list: Email keys
+    """
+    now = time.time()
+    try:
+        entries = [entry for entry in os.scandir(_state_dir('pending'))
+                   if entry.name.endswith('.json') and not entry.name.startswith('.')]
+    except FileNotFoundError:
+        return []
+    due = sorted((entry.stat().st_mtime, entry.name) for entry in entries)
+    return [name[:-len('.json')] for mtime, name in due if mtime <= now]
+
+def claim(key):
+    """
+    Claim a pending email by moving it to inflight/
+
+    Args:
+        key (str): Email key
+
+    Returns:
+        bool: True if this caller claimed it, False if another worker got there first
+    """
+    try:
+        os.rename(_path('pending', key), _path('inflight', key))
+    except FileNotFoundError:
+        return False
+    return True
+
+def _deliver_due(transport, stop=None):
+    """
+    Claim and send due emails until none are left; returns how many were claimed
+
+    Raises SMTPSessionError, with the email being sent back in pending/, when
+    no SMTP session can be opened.
+    """
+    claimed = 0
+    # Every thread walks the same list; losing a claim to another thread costs one rename
+    for key in due_keys():
+        if stop is not None and stop.is_set():
+            break
+        if claim(key):
+            claimed += 1
+            _deliver_claimed(key, transport)
+    return claimed
+
+def _is_permanent(error):
+    """Whether retrying cannot help: this message's sender, recipient or content was refused for good."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(500 <= code < 600 for code, reply in error.recipients.values())
+    return isinstance(error, (smtplib.SMTPSenderRefused, smtplib.SMTPDataError)) and 500 <= error.smtp_code < 600
+
+def deliver_one(key, transport):
+    """
+    Send a claimed email and move it to sent/, pending/ (retry) or dead/
+
+    Args:
+        key (str): Key of an email in inflight/
+        transport (SMTPTransport): Session to send on
+
+    Returns:
+        str: The email's new state
+    """
+    path = _path('inflight', key)
+    message = _read(path)
+    sender_email = os.getenv("EMAIL_SENDER", "jobfinder@example.com")
+    # Emails queued before digests hold a single alert's full job list
+    sections = message.get('sections') or limit_digest([(message['alert_name'], message['jobs'])])
+    msg = build_digest_message(sender_email, message['recipient'], sections, message_id=f"<{key}@jobfinder>")
+    try:
+        transport.send(msg)
+    except SMTPSessionError as e:
+        # Not this email's fault; it stays due and the caller pauses delivery
+        message['last_error'] = str(e)
+        _write_atomic(path, message)
+        os.rename(path, _path('pending', key))
+        raise
+    except Exception as e:
+        message['attempts'] += 1
+        message['last_error'] = f"{type(e).__name__}: {e}"
+        if _is_permanent(e) or message['attempts'] >= OUTBOX_MAX_ATTEMPTS:
+            state = 'dead'
+            print(f"Giving up on alert email {key}: {message['last_error']}")
+        else:
+            state = 'pending'
+        _write_atomic(path, message)
+        if state == 'pending':
+            delay = min(OUTBOX_BACKOFF_SECONDS * 2 ** (message['attempts'] - 1), OUTBOX_MAX_BACKOFF_SECONDS)
+            next_attempt = time.time() + delay * random.uniform(0.9, 1.1)
+            os.utime(path, (next_attempt, next_attempt))
+        os.rename(path, _path(state, key))
+        return state
+
+    # The sent time doubles as the retention clock
+    os.utime(path)
+    os.rename(path, _path('sent', key))
+    return 'sent'
+
+def prune_sent(retention_days=OUTBOX_SENT_RETENTION_DAYS):
+    """Delete sent emails older than the retention period."""
+    cutoff = time.time() - retention_days * 86400
+    try:
+        entries = list(os.scandir(_state_dir('sent')))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.stat().st_mtime < cutoff:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+def retry_dead():
+    """
+    Move every dead email back to pending/ with a fresh attempt count
+
+    Returns:
+        int: Number of emails moved
+    """
+    _ensure_dirs()
+    moved = 0
+    for name in os.listdir(_state_dir('dead')):
+        if not name.endswith('.json'):
+            continue
+        key = name[:-len('.json')]
+        path = _path('dead', key)
+        message = _read(path)
+        message['attempts'] = 0
+        _write_atomic(path, message)
+        os.rename(path, _path('pending', key))
+        moved += 1
+    return moved
+
+def _deliver_claimed(key, transport):
+    try:
+        deliver_one(key, transport)
+    except SMTPSessionError:
+        raise
+    except Exception as e:
+        # Not a send failure (those are retried): the email file itself is unusable
+        print(f"Error delivering alert email {key}: {e}")
+        os.replace(_path('inflight', key), _path('dead', key))
+
+class OutboxDelivery:
+    """
+    Pool of delivery threads draining the outbox
+
+    Each thread keeps its own SMTPTransport session, claims due emails one at a
+    time and polls every OUTBOX_POLL_INTERVAL seconds when nothing is due. A
+    thread that cannot open a session pauses, doubling the pause from
+    OUTBOX_BACKOFF_SECONDS up to OUTBOX_MAX_BACKOFF_SECONDS until a session opens.
+    """
+
+    def __init__(self, workers=OUTBOX_WORKERS, transport_factory=SMTPTransport, poll_interval=OUTBOX_POLL_INTERVAL):
+        self.workers = workers
+        self.transport_factory = transport_factory
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Recover emails left in flight and start the delivery threads."""
+        recovered = recover_inflight()
+        if recovered:
+            print(f"Requeued {recovered} alert emails left in flight")
+        prune_sent()
+        self._stop.clear()
+        self._threads = [threading.Thread(target=self._run, daemon=True) for _ in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop the threads once their current email is done
+
+        Args:
+            timeout (float, optional): Seconds to wait for each thread
+        """
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self):
+        failures = 0
+        with self.transport_factory() as transport:
+            while not self._stop.is_set():
+                try:
+                    claimed = _deliver_due(transport, self._stop)
+                    failures = 0
+                except SMTPSessionError as e:
+                    failures += 1
+                    pause = min(OUTBOX_BACKOFF_SECONDS * 2 ** (failures - 1), OUTBOX_MAX_BACKOFF_SECONDS)
+                    print(f"Pausing alert email delivery for {pause} seconds: {e}")
+                    self._stop.wait(pause)
+                    continue
+                if not claimed:
+                    # Do not hold an idle SMTP session open between polls
+                    transport.close()
+                    self._stop.wait(self.poll_interval)
+
+def drain(workers=OUTBOX_WORKERS, transport_factory=SMTPTransport):
+    """
+    Send every email that is due now, then return
+
+    Emails in inflight/ are left alone, since a running worker may own them.
+    If no SMTP session can be opened, the remaining emails stay pending.
+
+    Args:
+        workers (int): Delivery threads
+        transport_factory (callable): Returns the SMTPTransport for a thread
+
+    Returns:
+        dict: Email counts per state afterwards
+    """
+    def run():
+        with transport_factory() as transport:
+            try:
+                while _deliver_due(transport):
+                    pass
+            except SMTPSessionError as e:
+                print(f"Stopped delivering alert emails: {e}")
+
+    threads = [threading.Thread(target=run) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts()
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    if command == 'deliver':
+        # Take the worker's lock: a worker starting meanwhile would requeue the
+        # emails this process has in flight and send them a second time
+        from alert_worker import acquire_lock, WORKER_LOCK_PATH
+        lock_file = acquire_lock()
+        if lock_file is None:
+            print(f"The alert worker holds {WORKER_LOCK_PATH} and is delivering; exiting")
+            sys.exit(1)
+        try:
+            # Anything in flight was left by a stopped worker
+            recover_inflight()
+            print(drain())
+        finally:
+            lock_file.close()
+    elif command == 'retry-dead':
+        print(f"Moved {retry_dead()} emails back to pending")
+    elif command == 'status':
+        print(counts())
+    else:
+        print("Usage: python outbox.py [status|deliver|retry-dead]")
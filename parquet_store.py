@@ -0,0 +1,151 @@
+import os
+import sys
+import shutil
+import datetime
+import threading
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow comes with streamlit, but the JSON store works without it
+    pa = None
+
+PARQUET_JOBS_DIR = os.getenv("JOBFINDER_PARQUET_DIR", "jobs_parquet")
+PARQUET_COMPRESSION = "zstd"
+PARQUET_ROW_GROUP_SIZE = 10000
+
+# Hive-style partition directory by the day jobs were first seen, e.g.
+# jobs_parquet/scrape_date=2025-04-01/
+PARTITION_COLUMN = "scrape_date"
+DATE_COLUMNS = ('date_posted', 'first_seen', 'last_seen')
+
+_write_lock = threading.Lock()
+
+def parquet_available():
+    """Whether pyarrow is installed, so the Parquet jobs format can be used."""
+    return pa is not None
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("The Parquet jobs format needs pyarrow (pip install pyarrow)")
+
+def _partitioning():
+    return ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive")
+
+def _dataset():
+    # Memory-map the files so projected reads only page in the columns they touch
+    return ds.dataset(PARQUET_JOBS_DIR, format="parquet", partitioning=_partitioning(),
+                      filesystem=pafs.LocalFileSystem(use_mmap=True))
+
+def write_jobs(jobs_df, scrape_date=None):
+    """
+    Replace the stored jobs with a DataFrame, partitioned by first-seen date
+
+    Rows keep their 'scrape_date' value if the DataFrame has one (save_jobs
+    sets it to the day the job was first seen); others are filed under
+    `scrape_date` (default: today). A row's partition is never before its
+    first_seen day. Each partition is sorted by
+    date_posted so row group statistics let date-filtered reads skip most of it.
+
+    Args:
+        jobs_df (pandas.DataFrame): Jobs to store
+        scrape_date (datetime.date, optional): Scrape date for rows without one
+    """
+    _require_pyarrow()
+    scrape_date = (scrape_date or datetime.date.today()).isoformat()
+
+    df = jobs_df.copy()
+    if PARTITION_COLUMN in df.columns:
+        df[PARTITION_COLUMN] = df[PARTITION_COLUMN].fillna(scrape_date).astype(str)
+    else:
+        df[PARTITION_COLUMN] = scrape_date
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], format='ISO8601')
+
+    with _write_lock:
+        # Build the new dataset next to the old one, then swap the directories
+        tmp_dir = f"{PARQUET_JOBS_DIR}.tmp-{os.getpid()}"
+        old_dir = f"{PARQUET_JOBS_DIR}.old-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        for partition, group in df.groupby(PARTITION_COLUMN, sort=True):
+            if 'date_posted' in group.columns:
+                group = group.sort_values('date_posted', kind='stable')
+            table = pa.Table.from_pandas(group.drop(columns=[PARTITION_COLUMN]), preserve_index=False)
+            partition_dir = os.path.join(tmp_dir, f"{PARTITION_COLUMN}={partition}")
+            os.makedirs(partition_dir)
+            pq.write_table(table, os.path.join(partition_dir, "part-0.parquet"),
+                           compression=PARQUET_COMPRESSION, row_group_size=PARQUET_ROW_GROUP_SIZE)
+
+        if os.path.isdir(PARQUET_JOBS_DIR):
+            os.replace(PARQUET_JOBS_DIR, old_dir)
+        os.replace(tmp_dir, PARQUET_JOBS_DIR)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+def read_jobs(columns=None, since=None, first_seen_since=None):
+    """
+    Read stored jobs, loading only the requested columns and row groups
+
+    Args:
+        columns (list, optional): Columns to load; all job columns if omitted.
+            'scrape_date' is only returned when asked for.
+        since (datetime.datetime, optional): Only return jobs posted at or after
+            this time, using the row group statistics of date_posted
+        first_seen_since (datetime.datetime, optional): Only return jobs first
+            scraped at or after this time; partitions of earlier days are
+            skipped without being opened
+
+    Returns:
+        pandas.DataFrame: Stored jobs
+    """
+    _require_pyarrow()
+    if not os.path.isdir(PARQUET_JOBS_DIR):
+        return pd.DataFrame(columns=columns) if columns else pd.DataFrame()
+
+    dataset = _dataset()
+    available = dataset.schema.names
+    if columns is None:
+        selected = [name for name in available if name != PARTITION_COLUMN]
+    else:
+        selected = [name for name in columns if name in available]
+
+    expression = None
+    for column, value in (('date_posted', since), ('first_seen', first_seen_since)):
+        if value is None or column not in available:
+            continue
+        value = pd.Timestamp(value)
+        timestamp_type = dataset.schema.field(column).type
+        condition = ds.field(column) >= pa.scalar(value.to_pydatetime(), type=timestamp_type)
+        if column == 'first_seen':
+            # Partitions are keyed on first_seen; a re-merged job's date_posted
+            # can be later than its first_seen, so `since` cannot prune them
+            condition = (ds.field(PARTITION_COLUMN) >= value.date().isoformat()) & condition
+        expression = condition if expression is None else expression & condition
+
+    return dataset.to_table(columns=selected, filter=expression).to_pandas()
+
+def import_json(path="jobs_data.json"):
+    """
+    Store the jobs of a JSON jobs file in the Parquet dataset
+
+    Args:
+        path (str): JSON file written by the json backend
+
+    Returns:
+        int: Number of jobs stored
+    """
+    jobs_df = pd.read_json(path, orient='records', convert_dates=False) if os.path.exists(path) else pd.DataFrame()
+    write_jobs(jobs_df)
+    return len(jobs_df)
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'import':
+        count = import_json(*sys.argv[2:3])
+        print(f"Stored {count} jobs in {PARQUET_JOBS_DIR}")
+    else:
+        print("Usage: python parquet_store.py import [jobs_data.json]")
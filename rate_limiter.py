@@ -0,0 +1,200 @@
+import time
+import threading
+
+RATE_LIMIT_ENABLED = True
+
+# Pacing per site, matched against the request host by domain suffix.
+# rate/max_rate are requests per second, burst is the token bucket size and
+# concurrency/max_concurrency bound the number of requests in flight.
+HOST_LIMITS = {
+    'indeed.com': {'rate': 2.0, 'max_rate': 4.0, 'burst': 4, 'concurrency': 2, 'max_concurrency': 6},
+    'linkedin.com': {'rate': 4.0, 'max_rate': 8.0, 'burst': 8, 'concurrency': 4, 'max_concurrency': 12},
+}
+DEFAULT_HOST_LIMITS = {'rate': 5.0, 'max_rate': 10.0, 'burst': 10, 'concurrency': 4, 'max_concurrency': 16}
+
+# AIMD tuning: back off multiplicatively when throttled, ramp up additively
+# after a window of healthy responses
+MIN_RATE = 0.2
+RATE_INCREASE = 0.5
+DECREASE_FACTOR = 0.5
+DECREASE_INTERVAL = 1.0  # Throttles within this many seconds count as one event
+DEFAULT_COOLDOWN = 5.0
+MAX_COOLDOWN = 120.0
+
+class TokenBucket:
+    """Token bucket that paces requests to `rate` per second with bursts of up to `burst`."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """
+        Take one token, waiting for it if necessary
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait
+
+        Returns:
+            bool: True if a token was taken, False if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            if deadline is not None:
+                if now + wait > deadline:
+                    return False
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hand out no tokens for the next `seconds` seconds and drain the bucket."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+class HostThrottle:
+    """
+    Paces requests to one site with a token bucket and an AIMD concurrency limit
+
+    A throttling response (429/503, or a Retry-After) halves both the request
+    rate and the concurrency limit and pauses the bucket. Every `limit` healthy
+    responses in a row raise the concurrency limit by one and the rate by
+    RATE_INCREASE, up to the configured maximums.
+    """
+
+    def __init__(self, host, rate, max_rate, burst, concurrency, max_concurrency):
+        self.host = host
+        self.bucket = TokenBucket(rate, burst)
+        self.max_rate = max_rate
+        self.limit = concurrency
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.successes = 0
+        self.throttled = 0
+        self.requests = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout=None):
+        """
+        Wait for a concurrency slot and a rate token
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait
+
+        Returns:
+            bool: True if the request may be sent, False if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self.in_flight >= self.limit:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            self.in_flight += 1
+
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if not self.bucket.acquire(remaining):
+            with self._condition:
+                self.in_flight -= 1
+                self._condition.notify()
+            return False
+        return True
+
+    def release(self, throttled=False, retry_after=None):
+        """
+        Give back a concurrency slot and adjust the limits from the outcome
+
+        Args:
+            throttled (bool): Whether the site signalled it is overloaded
+            retry_after (float, optional): Seconds the site asked us to wait
+        """
+        with self._condition:
+            self.in_flight -= 1
+            self.requests += 1
+            if throttled:
+                self.throttled += 1
+                self.successes = 0
+                # Requests in flight together see the same overload; back off once for it
+                now = time.monotonic()
+                if now - self._last_decrease >= DECREASE_INTERVAL:
+                    self._last_decrease = now
+                    self.limit = max(1, int(self.limit * DECREASE_FACTOR))
+                    self.bucket.rate = max(MIN_RATE, self.bucket.rate * DECREASE_FACTOR)
+                cooldown = retry_after if retry_after is not None else DEFAULT_COOLDOWN
+                self.bucket.pause(min(cooldown, MAX_COOLDOWN))
+            else:
+                self.successes += 1
+                if self.successes >= self.limit:
+                    self.successes = 0
+                    self.limit = min(self.max_concurrency, self.limit + 1)
+                    self.bucket.rate = min(self.max_rate, self.bucket.rate + RATE_INCREASE)
+            self._condition.notify_all()
+
+    def stats(self):
+        with self._condition:
+            return {
+                'host': self.host,
+                'rate': round(self.bucket.rate, 2),
+                'concurrency': self.limit,
+                'in_flight': self.in_flight,
+                'requests': self.requests,
+                'throttled': self.throttled,
+            }
+
+_throttles = {}
+_throttles_lock = threading.Lock()
+
+def _limit_key(host):
+    host = (host or '').lower()
+    for domain in HOST_LIMITS:
+        if host == domain or host.endswith('.' + domain):
+            return domain
+    return host
+
+def get_host_throttle(host):
+    """
+    Get the shared throttle for a host
+
+    Hosts under the same configured domain (e.g. www.linkedin.com and
+    in.linkedin.com) share one throttle.
+
+    Args:
+        host (str): Request host name
+
+    Returns:
+        HostThrottle: Throttle for the host's site
+    """
+    key = _limit_key(host)
+    with _throttles_lock:
+        throttle = _throttles.get(key)
+        if throttle is None:
+            throttle = HostThrottle(key, **HOST_LIMITS.get(key, DEFAULT_HOST_LIMITS))
+            _throttles[key] = throttle
+        return throttle
+
+def get_throttle_stats():
+    """
+    Get the current pacing state of every site contacted so far
+
+    Returns:
+        list: One dict per site with its rate, concurrency limit and counters
+    """
+    with _throttles_lock:
+        throttles = list(_throttles.values())
+    return [throttle.stats() for throttle in throttles]
@@ -3,31 +3,69 @@ import datetime
 import random
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
 import trafilatura
 import re
+import threading
+import email.utils
+from urllib.parse import urlsplit
+import http_cache
+import rate_limiter
+from data_manager import get_known_description, DESCRIPTION_PREVIEW_CHARS
+from utils import canonicalize_url
+from models import jobs_to_frame, apply_job_dtypes
+from concurrent.futures import ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 
-def scrape_indeed(keywords, location, job_type=None):
-    """
-    Scrape job listings from Indeed based on search criteria
-    
-    Args:
-        keywords (list): List of keywords to search for
-        location (str): Location to search in
-        job_type (str, optional): Type of job (Full-time, Part-time, etc)
-        
-    Returns:
-        pandas.DataFrame: DataFrame containing job listings
-    """
-    jobs = []
-    
+# Shared HTTP client settings
+HTTP_POOL_CONNECTIONS = 10  # Number of hosts to keep connection pools for
+HTTP_POOL_MAXSIZE = 16  # Keep-alive connections per host
+HTTP_TIMEOUT = (5, 20)  # (connect, read) timeouts in seconds
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_BACKOFF_JITTER = 0.5
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+THROTTLE_STATUSES = (429, 503)  # Statuses that make the rate limiter back off
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    # gzip/deflate, plus br when the brotli package is installed
+    **make_headers(accept_encoding=True),
+}
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+# Detail-page fetching settings for LinkedIn results
+DETAIL_FETCH_WORKERS = 8
+DETAIL_FETCH_TIMEOUT = 10
+LINKEDIN_PLACEHOLDER_DESCRIPTION = "Click the link to view the full job description"
+
+# Search result pages
+INDEED_SEARCH_URL = "https://www.indeed.com/jobs"
+LINKEDIN_SEARCH_URL = "https://www.linkedin.com/jobs/search"
+INDEED_PAGE_SIZE = 10
+LINKEDIN_PAGE_SIZE = 25
+MAX_RESULT_PAGES = 10
+
+# HTML parser backend used for search result pages: 'fast' or 'reference'
+PARSER_BACKEND = "fast"
+
+# Multi-source search settings
+SOURCE_TIMEOUT = 30
+SOURCE_TIMEOUT_GRACE = 2
+
+def _indeed_search_params(keywords, location, job_type):
+    """Build the Indeed search query string parameters."""
     # Convert keywords to search query format
     keyword_query = '+'.join(keywords) if keywords else ''
     
-    # Base search URL
-    url = "https://www.indeed.com/jobs"
     params = {}
-    
     if keyword_query:
         params['q'] = keyword_query
     if location:
@@ -35,101 +73,244 @@ def scrape_indeed(keywords, location, job_type=None):
     if job_type:
         job_type_param = job_type.lower().replace('-', '')
         params['jt'] = job_type_param
+    return params
+
+def _parse_indeed_page(html):
+    """
+    Extract job records from an Indeed search results page
+    
+    Args:
+        html (str): HTML of the results page
+        
+    Returns:
+        list: Job dictionaries in page order
+    """
+    jobs = []
+    soup = BeautifulSoup(html, 'html.parser')
+    job_cards = soup.find_all('div', class_=re.compile('job_seen_beacon'))
     
+    for card in job_cards:
+        try:
+            # Extract job details
+            title_element = card.find('h2', class_=re.compile('jobTitle'))
+            title = title_element.get_text().strip() if title_element else "Unknown Title"
+            
+            company_element = card.find('span', class_=re.compile('companyName'))
+            company = company_element.get_text().strip() if company_element else "Unknown Company"
+            
+            location_element = card.find('div', class_=re.compile('companyLocation'))
+            location_text = location_element.get_text().strip() if location_element else "Unknown Location"
+            
+            # Get relative URL and convert to absolute URL
+            relative_url_element = card.find('a', href=True)
+            relative_url = relative_url_element['href'] if relative_url_element else None
+            job_url = f"https://www.indeed.com{relative_url}" if relative_url else "#"
+            
+            # Extract job description snippet
+            description_element = card.find('div', class_=re.compile('job-snippet'))
+            description = description_element.get_text().strip() if description_element else "No description available"
+            
+            # Determine job type from the listing
+            job_type_element = card.find('div', class_=re.compile('metadata'))
+            detected_job_type = "Full-time"  # Default
+            if job_type_element:
+                job_type_text = job_type_element.get_text().lower()
+                if 'part-time' in job_type_text:
+                    detected_job_type = "Part-time"
+                elif 'contract' in job_type_text:
+                    detected_job_type = "Contract"
+                elif 'remote' in job_type_text:
+                    detected_job_type = "Remote"
+            
+            # Generate a recent date (within the last 30 days) for demonstration
+            days_ago = random.randint(0, 29)
+            date_posted = datetime.datetime.now() - datetime.timedelta(days=days_ago)
+            
+            # Create job entry
+            job = {
+                'title': title,
+                'company': company,
+                'location': location_text,
+                'description': description,
+                'url': job_url,
+                'job_type': detected_job_type,
+                'date_posted': date_posted,
+                'source': 'Indeed'
+            }
+            
+            jobs.append(job)
+        except Exception as e:
+            print(f"Error extracting job details: {e}")
+            continue
+    
+    return jobs
+
+def _class_contains(name):
+    """XPath predicate matching a class attribute that contains `name` anywhere."""
+    return f"contains(@class, '{name}')"
+
+def _class_token(name):
+    """XPath predicate matching an element that has `name` as one of its classes."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Precompiled selectors for the fast parser backend. Indeed's classes are matched
+# by substring, like the regexes in _parse_indeed_page; LinkedIn's by exact class.
+_INDEED_CARDS = etree.XPath(f"//div[{_class_contains('job_seen_beacon')}]")
+_INDEED_TITLE = etree.XPath(f".//h2[{_class_contains('jobTitle')}]")
+_INDEED_COMPANY = etree.XPath(f".//span[{_class_contains('companyName')}]")
+_INDEED_LOCATION = etree.XPath(f".//div[{_class_contains('companyLocation')}]")
+_INDEED_LINK = etree.XPath(".//a[@href]/@href")
+_INDEED_SNIPPET = etree.XPath(f".//div[{_class_contains('job-snippet')}]")
+_INDEED_METADATA = etree.XPath(f".//div[{_class_contains('metadata')}]")
+_LINKEDIN_CARDS = etree.XPath(f"//div[{_class_token('base-card')}]")
+_LINKEDIN_TITLE = etree.XPath(f".//h3[{_class_token('base-search-card__title')}]")
+_LINKEDIN_COMPANY = etree.XPath(f".//h4[{_class_token('base-search-card__subtitle')}]")
+_LINKEDIN_LOCATION = etree.XPath(f".//span[{_class_token('job-search-card__location')}]")
+_LINKEDIN_LINK = etree.XPath(f".//a[{_class_token('base-card__full-link')}][@href]/@href")
+
+def _parse_html_document(html):
+    """Parse an HTML page with lxml, returning None for empty documents."""
+    if not html or not html.strip():
+        return None
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, params=params, headers=headers)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            job_cards = soup.find_all('div', class_=re.compile('job_seen_beacon'))
-            
-            for card in job_cards:
-                try:
-                    # Extract job details
-                    title_element = card.find('h2', class_=re.compile('jobTitle'))
-                    title = title_element.get_text().strip() if title_element else "Unknown Title"
-                    
-                    company_element = card.find('span', class_=re.compile('companyName'))
-                    company = company_element.get_text().strip() if company_element else "Unknown Company"
-                    
-                    location_element = card.find('div', class_=re.compile('companyLocation'))
-                    location_text = location_element.get_text().strip() if location_element else "Unknown Location"
-                    
-                    # Get relative URL and convert to absolute URL
-                    relative_url_element = card.find('a', href=True)
-                    relative_url = relative_url_element['href'] if relative_url_element else None
-                    job_url = f"https://www.indeed.com{relative_url}" if relative_url else "#"
-                    
-                    # Extract job description snippet
-                    description_element = card.find('div', class_=re.compile('job-snippet'))
-                    description = description_element.get_text().strip() if description_element else "No description available"
-                    
-                    # Determine job type from the listing
-                    job_type_element = card.find('div', class_=re.compile('metadata'))
-                    detected_job_type = "Full-time"  # Default
-                    if job_type_element:
-                        job_type_text = job_type_element.get_text().lower()
-                        if 'part-time' in job_type_text:
-                            detected_job_type = "Part-time"
-                        elif 'contract' in job_type_text:
-                            detected_job_type = "Contract"
-                        elif 'remote' in job_type_text:
-                            detected_job_type = "Remote"
-                    
-                    # Generate a recent date (within the last 30 days) for demonstration
-                    days_ago = random.randint(0, 29)
-                    date_posted = datetime.datetime.now() - datetime.timedelta(days=days_ago)
-                    
-                    # Create job entry
-                    job = {
-                        'title': title,
-                        'company': company,
-                        'location': location_text,
-                        'description': description,
-                        'url': job_url,
-                        'job_type': detected_job_type,
-                        'date_posted': date_posted,
-                        'source': 'Indeed'
-                    }
-                    
-                    jobs.append(job)
-                except Exception as e:
-                    print(f"Error extracting job details: {e}")
-                    continue
-        else:
-            print(f"Failed to retrieve data from Indeed. Status code: {response.status_code}")
+        return lxml_html.document_fromstring(html)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        return lxml_html.document_fromstring(html.encode('utf-8'))
+
+def _first_text(selector, element, default):
+    """Stripped text of the first element matched by `selector`, or `default`."""
+    matches = selector(element)
+    return matches[0].text_content().strip() if matches else default
+
+def _parse_indeed_page_fast(html):
+    """
+    Extract job records from an Indeed search results page using lxml
     
-    except Exception as e:
-        print(f"Error scraping Indeed: {e}")
+    Produces the same records as _parse_indeed_page, but only walks the job
+    cards with precompiled XPath selectors instead of building a full
+    BeautifulSoup tree and running regex class searches per card.
     
-    # Return as DataFrame
-    return pd.DataFrame(jobs)
+    Args:
+        html (str): HTML of the results page
+        
+    Returns:
+        list: Job dictionaries in page order
+    """
+    jobs = []
+    document = _parse_html_document(html)
+    if document is None:
+        return jobs
+    
+    for card in _INDEED_CARDS(document):
+        try:
+            relative_url = _INDEED_LINK(card)
+            
+            detected_job_type = "Full-time"  # Default
+            job_type_elements = _INDEED_METADATA(card)
+            if job_type_elements:
+                job_type_text = job_type_elements[0].text_content().lower()
+                if 'part-time' in job_type_text:
+                    detected_job_type = "Part-time"
+                elif 'contract' in job_type_text:
+                    detected_job_type = "Contract"
+                elif 'remote' in job_type_text:
+                    detected_job_type = "Remote"
+            
+            days_ago = random.randint(0, 29)
+            date_posted = datetime.datetime.now() - datetime.timedelta(days=days_ago)
+            
+            jobs.append({
+                'title': _first_text(_INDEED_TITLE, card, "Unknown Title"),
+                'company': _first_text(_INDEED_COMPANY, card, "Unknown Company"),
+                'location': _first_text(_INDEED_LOCATION, card, "Unknown Location"),
+                'description': _first_text(_INDEED_SNIPPET, card, "No description available"),
+                'url': f"https://www.indeed.com{relative_url[0]}" if relative_url and relative_url[0] else "#",
+                'job_type': detected_job_type,
+                'date_posted': date_posted,
+                'source': 'Indeed'
+            })
+        except Exception as e:
+            print(f"Error extracting job details: {e}")
+            continue
+    
+    return jobs
 
-def scrape_linkedin(keywords, location, job_type=None):
+def iter_indeed_jobs(keywords, location, job_type=None, max_results=None, max_pages=MAX_RESULT_PAGES,
+                     deadline=None, parser_backend=None):
     """
-    Scrape job listings from LinkedIn based on search criteria
+    Scrape Indeed result pages one at a time, yielding each page's jobs as it is parsed
+    
+    Args:
+        keywords (list): List of keywords to search for
+        location (str): Location to search in
+        job_type (str, optional): Type of job (Full-time, Part-time, etc)
+        max_results (int, optional): Stop after this many jobs
+        max_pages (int, optional): Stop after this many result pages
+        deadline (float, optional): time.monotonic() value after which no more pages are fetched
+        parser_backend (str, optional): Key of PARSER_BACKENDS; defaults to PARSER_BACKEND
+        
+    Yields:
+        list: Job dictionaries from one results page
+    """
+    params = _indeed_search_params(keywords, location, job_type)
+    parse_page = PARSER_BACKENDS[parser_backend or PARSER_BACKEND][0]
+    found = 0
+    
+    for page in range(max_pages):
+        if deadline is not None and _time_left(deadline) <= 0:
+            break
+        if page:
+            params['start'] = page * INDEED_PAGE_SIZE
+        
+        try:
+            response = http_get(INDEED_SEARCH_URL, params=params, deadline=deadline, cache_kind='search')
+            if response.status_code != 200:
+                print(f"Failed to retrieve data from Indeed. Status code: {response.status_code}")
+                break
+            jobs = parse_page(response.text)
+        except Exception as e:
+            print(f"Error scraping Indeed: {e}")
+            break
+        
+        if not jobs:
+            break
+        if max_results is not None:
+            jobs = jobs[:max_results - found]
+        found += len(jobs)
+        yield jobs
+        
+        if max_results is not None and found >= max_results:
+            break
+
+def scrape_indeed(keywords, location, job_type=None, deadline=None, max_pages=1, max_results=None):
+    """
+    Scrape job listings from Indeed based on search criteria
     
     Args:
         keywords (list): List of keywords to search for
         location (str): Location to search in
         job_type (str, optional): Type of job (Full-time, Part-time, etc)
+        deadline (float, optional): time.monotonic() value after which to stop waiting
+        max_pages (int, optional): Number of result pages to fetch
+        max_results (int, optional): Maximum number of jobs to return
         
     Returns:
         pandas.DataFrame: DataFrame containing job listings
     """
     jobs = []
+    for batch in iter_indeed_jobs(keywords, location, job_type, max_results, max_pages, deadline):
+        jobs.extend(batch)
     
+    # Return as DataFrame
+    return jobs_to_frame(jobs)
+
+def _linkedin_search_params(keywords, location, job_type):
+    """Build the LinkedIn search query string parameters."""
     # Convert keywords to search query format
     keyword_query = '%20'.join(keywords) if keywords else ''
     
-    # Base search URL
-    url = "https://www.linkedin.com/jobs/search"
     params = {}
-    
     if keyword_query:
         params['keywords'] = keyword_query
     if location:
@@ -149,79 +330,422 @@ def scrape_linkedin(keywords, location, job_type=None):
     
     if job_type_param:
         params['f_JT'] = job_type_param
+    return params
+
+def _parse_linkedin_page(html, job_type=None):
+    """
+    Extract job records from a LinkedIn search results page
     
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, params=params, headers=headers)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            job_cards = soup.find_all('div', class_='base-card')
-            
-            for card in job_cards:
-                try:
-                    # Extract job details
-                    title_element = card.find('h3', class_='base-search-card__title')
-                    title = title_element.get_text().strip() if title_element else "Unknown Title"
-                    
-                    company_element = card.find('h4', class_='base-search-card__subtitle')
-                    company = company_element.get_text().strip() if company_element else "Unknown Company"
-                    
-                    location_element = card.find('span', class_='job-search-card__location')
-                    location_text = location_element.get_text().strip() if location_element else "Unknown Location"
-                    
-                    # Get job URL
-                    url_element = card.find('a', class_='base-card__full-link', href=True)
-                    job_url = url_element['href'] if url_element else "#"
-                    
-                    # For LinkedIn, we need to fetch the full job description from the job URL
-                    description = "Click the link to view the full job description"
-                    
-                    # Try to fetch more detailed description if possible
-                    if job_url and job_url != "#":
-                        try:
-                            downloaded = trafilatura.fetch_url(job_url)
-                            if downloaded:
-                                job_content = trafilatura.extract(downloaded)
-                                if job_content:
-                                    description = job_content[:500] + "..." if len(job_content) > 500 else job_content
-                        except Exception as desc_err:
-                            print(f"Error fetching job description: {desc_err}")
-                    
-                    # Determine job type from the listing or default to the provided job_type
-                    detected_job_type = job_type if job_type else "Full-time"  # Default
-                    
-                    # Generate a recent date (within the last 30 days) for demonstration
-                    days_ago = random.randint(0, 29)
-                    date_posted = datetime.datetime.now() - datetime.timedelta(days=days_ago)
-                    
-                    # Create job entry
-                    job = {
-                        'title': title,
-                        'company': company,
-                        'location': location_text,
-                        'description': description,
-                        'url': job_url,
-                        'job_type': detected_job_type,
-                        'date_posted': date_posted,
-                        'source': 'LinkedIn'
-                    }
-                    
-                    jobs.append(job)
-                except Exception as e:
-                    print(f"Error extracting LinkedIn job details: {e}")
-                    continue
-        else:
-            print(f"Failed to retrieve data from LinkedIn. Status code: {response.status_code}")
+    Descriptions are left as the placeholder; they come from the job pages.
     
-    except Exception as e:
-        print(f"Error scraping LinkedIn: {e}")
+    Args:
+        html (str): HTML of the results page
+        job_type (str, optional): Job type searched for, used as the job type of every record
+        
+    Returns:
+        list: Job dictionaries in page order
+    """
+    jobs = []
+    soup = BeautifulSoup(html, 'html.parser')
+    job_cards = soup.find_all('div', class_='base-card')
+    
+    for card in job_cards:
+        try:
+            # Extract job details
+            title_element = card.find('h3', class_='base-search-card__title')
+            title = title_element.get_text().strip() if title_element else "Unknown Title"
+            
+            company_element = card.find('h4', class_='base-search-card__subtitle')
+            company = company_element.get_text().strip() if company_element else "Unknown Company"
+            
+            location_element = card.find('span', class_='job-search-card__location')
+            location_text = location_element.get_text().strip() if location_element else "Unknown Location"
+            
+            # Get job URL
+            url_element = card.find('a', class_='base-card__full-link', href=True)
+            job_url = url_element['href'] if url_element else "#"
+            
+            # For LinkedIn, the full job description lives on the job page;
+            # it is fetched concurrently once the whole page has been parsed
+            description = LINKEDIN_PLACEHOLDER_DESCRIPTION
+            
+            # Determine job type from the listing or default to the provided job_type
+            detected_job_type = job_type if job_type else "Full-time"  # Default
+            
+            # Generate a recent date (within the last 30 days) for demonstration
+            days_ago = random.randint(0, 29)
+            date_posted = datetime.datetime.now() - datetime.timedelta(days=days_ago)
+            
+            # Create job entry
+            job = {
+                'title': title,
+                'company': company,
+                'location': location_text,
+                'description': description,
+                'url': job_url,
+                'job_type': detected_job_type,
+                'date_posted': date_posted,
+                'source': 'LinkedIn'
+            }
+            
+            jobs.append(job)
+        except Exception as e:
+            print(f"Error extracting LinkedIn job details: {e}")
+            continue
+    
+    return jobs
+
+def _parse_linkedin_page_fast(html, job_type=None):
+    """
+    Extract job records from a LinkedIn search results page using lxml
+    
+    Produces the same records as _parse_linkedin_page using precompiled XPath
+    selectors over the job cards only.
+    
+    Args:
+        html (str): HTML of the results page
+        job_type (str, optional): Job type searched for, used as the job type of every record
+        
+    Returns:
+        list: Job dictionaries in page order
+    """
+    jobs = []
+    document = _parse_html_document(html)
+    if document is None:
+        return jobs
+    
+    for card in _LINKEDIN_CARDS(document):
+        try:
+            job_url = _LINKEDIN_LINK(card)
+            
+            days_ago = random.randint(0, 29)
+            date_posted = datetime.datetime.now() - datetime.timedelta(days=days_ago)
+            
+            jobs.append({
+                'title': _first_text(_LINKEDIN_TITLE, card, "Unknown Title"),
+                'company': _first_text(_LINKEDIN_COMPANY, card, "Unknown Company"),
+                'location': _first_text(_LINKEDIN_LOCATION, card, "Unknown Location"),
+                'description': LINKEDIN_PLACEHOLDER_DESCRIPTION,
+                'url': job_url[0] if job_url else "#",
+                'job_type': job_type if job_type else "Full-time",
+                'date_posted': date_posted,
+                'source': 'LinkedIn'
+            })
+        except Exception as e:
+            print(f"Error extracting LinkedIn job details: {e}")
+            continue
+    
+    return jobs
+
+# Page parsers per backend: (Indeed parser, LinkedIn parser)
+PARSER_BACKENDS = {
+    'reference': (_parse_indeed_page, _parse_linkedin_page),
+    'fast': (_parse_indeed_page_fast, _parse_linkedin_page_fast),
+}
+
+def iter_linkedin_jobs(keywords, location, job_type=None, max_results=None, max_pages=MAX_RESULT_PAGES,
+                       max_workers=DETAIL_FETCH_WORKERS, detail_timeout=DETAIL_FETCH_TIMEOUT, deadline=None,
+                       parser_backend=None):
+    """
+    Scrape LinkedIn result pages one at a time, yielding each page's jobs as it is parsed
+    
+    Each page's descriptions are fetched concurrently before the page is yielded.
+    
+    Args:
+        keywords (list): List of keywords to search for
+        location (str): Location to search in
+        job_type (str, optional): Type of job (Full-time, Part-time, etc)
+        max_results (int, optional): Stop after this many jobs
+        max_pages (int, optional): Stop after this many result pages
+        max_workers (int, optional): Number of concurrent detail-page fetches
+        detail_timeout (float, optional): Timeout in seconds for each detail-page fetch
+        deadline (float, optional): time.monotonic() value after which to stop waiting;
+            jobs whose description has not arrived by then keep the placeholder
+        parser_backend (str, optional): Key of PARSER_BACKENDS; defaults to PARSER_BACKEND
+        
+    Yields:
+        list: Job dictionaries from one results page
+    """
+    params = _linkedin_search_params(keywords, location, job_type)
+    parse_page = PARSER_BACKENDS[parser_backend or PARSER_BACKEND][1]
+    found = 0
+    
+    for page in range(max_pages):
+        if deadline is not None and _time_left(deadline) <= 0:
+            break
+        if page:
+            params['start'] = page * LINKEDIN_PAGE_SIZE
+        
+        try:
+            response = http_get(LINKEDIN_SEARCH_URL, params=params, deadline=deadline, cache_kind='search')
+            if response.status_code != 200:
+                print(f"Failed to retrieve data from LinkedIn. Status code: {response.status_code}")
+                break
+            jobs = parse_page(response.text, job_type)
+        except Exception as e:
+            print(f"Error scraping LinkedIn: {e}")
+            break
+        
+        if not jobs:
+            break
+        if max_results is not None:
+            jobs = jobs[:max_results - found]
+        
+        # Reuse descriptions of jobs we have already seen; fetch only the rest
+        to_fetch = []
+        for job in jobs:
+            known = get_known_description(job['url'])
+            if known:
+                job['description'] = _preview(known)
+            else:
+                to_fetch.append(job)
+        
+        # Fill in descriptions from the job pages, keeping the card order;
+        # save_jobs archives them for the next search
+        descriptions = fetch_job_descriptions([job['url'] for job in to_fetch], max_workers, detail_timeout, deadline)
+        for job, job_content in zip(to_fetch, descriptions):
+            if job_content:
+                job['description'] = _preview(job_content)
+        
+        found += len(jobs)
+        yield jobs
+        
+        if max_results is not None and found >= max_results:
+            break
+
+def scrape_linkedin(keywords, location, job_type=None, max_workers=DETAIL_FETCH_WORKERS,
+                    detail_timeout=DETAIL_FETCH_TIMEOUT, deadline=None, max_pages=1, max_results=None):
+    """
+    Scrape job listings from LinkedIn based on search criteria
+    
+    Args:
+        keywords (list): List of keywords to search for
+        location (str): Location to search in
+        job_type (str, optional): Type of job (Full-time, Part-time, etc)
+        max_workers (int, optional): Number of concurrent detail-page fetches
+        detail_timeout (float, optional): Timeout in seconds for each detail-page fetch
+        deadline (float, optional): time.monotonic() value after which to stop waiting;
+            jobs whose description has not arrived by then keep the placeholder
+        max_pages (int, optional): Number of result pages to fetch
+        max_results (int, optional): Maximum number of jobs to return
+        
+    Returns:
+        pandas.DataFrame: DataFrame containing job listings
+    """
+    jobs = []
+    for batch in iter_linkedin_jobs(keywords, location, job_type, max_results, max_pages,
+                                    max_workers, detail_timeout, deadline):
+        jobs.extend(batch)
     
     # Return as DataFrame
-    return pd.DataFrame(jobs)
+    return jobs_to_frame(jobs)
+
+def get_http_session():
+    """
+    Get the HTTP session shared by all scrapers
+    
+    The session keeps a pool of keep-alive connections per host and retries
+    429/5xx responses and connection errors with exponential backoff and jitter,
+    honouring Retry-After. It is created on first use and safe to share between
+    threads.
+    
+    Returns:
+        requests.Session: Shared session
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                retry = Retry(
+                    total=HTTP_RETRIES,
+                    backoff_factor=HTTP_BACKOFF_FACTOR,
+                    backoff_jitter=HTTP_BACKOFF_JITTER,
+                    status_forcelist=HTTP_RETRY_STATUSES,
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=HTTP_POOL_MAXSIZE,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _http_session = session
+    return _http_session
+
+def http_get(url, params=None, timeout=HTTP_TIMEOUT, deadline=None, cache_kind=None, cache_url=None):
+    """
+    Send a GET request through the shared HTTP session
+    
+    Args:
+        url (str): URL to fetch
+        params (dict, optional): Query string parameters
+        timeout (float or tuple, optional): Timeout in seconds, or (connect, read) timeouts
+        deadline (float, optional): time.monotonic() value that caps the timeout
+        cache_kind (str, optional): Kind of page ('search' or 'detail') to serve from
+            and store in the on-disk response cache; None bypasses the cache
+        cache_url (str, optional): URL the cache entry is stored under instead of
+            `url`, e.g. the canonical URL of a job page reached through a tracking link
+        
+    Returns:
+        requests.Response: Response object (an http_cache.CachedResponse on cache hits)
+    """
+    if cache_kind is None or not http_cache.HTTP_CACHE_ENABLED:
+        return _send_get(url, params, timeout, deadline)
+    return http_cache.cached_fetch(
+        cache_url or url, params, cache_kind,
+        lambda headers: _send_get(url, params, timeout, deadline, headers)
+    )
+
+def _throttle_signal(response):
+    """
+    Check whether a response shows the site is throttling us
+    
+    Retries absorbed by the session's retry policy count too, since the site
+    asked us to slow down even if a later attempt succeeded.
+    
+    Args:
+        response (requests.Response): Final response of a request
+        
+    Returns:
+        tuple: (throttled, Retry-After in seconds or None)
+    """
+    statuses = [response.status_code]
+    retries = getattr(response.raw, 'retries', None)
+    if retries is not None:
+        statuses.extend(entry.status for entry in retries.history if entry.status)
+    throttled = any(status in THROTTLE_STATUSES for status in statuses)
+    
+    retry_after = None
+    header = response.headers.get('Retry-After')
+    if header:
+        try:
+            retry_after = float(header)
+        except ValueError:
+            try:
+                retry_at = email.utils.parsedate_to_datetime(header)
+                retry_after = max(0.0, retry_at.timestamp() - time.time())
+            except (TypeError, ValueError):
+                retry_after = None
+        throttled = True
+    return throttled, retry_after
+
+def _send_get(url, params, timeout, deadline, headers=None):
+    """
+    Send one GET request through the shared session, paced by the host's rate limiter
+    
+    Args:
+        url (str): URL to fetch
+        params (dict): Query string parameters
+        timeout (float or tuple): Timeout in seconds, or (connect, read) timeouts
+        deadline (float): time.monotonic() value that caps waiting and the timeout, or None
+        headers (dict, optional): Extra request headers
+        
+    Returns:
+        requests.Response: Response object
+    """
+    throttle = None
+    if rate_limiter.RATE_LIMIT_ENABLED:
+        throttle = rate_limiter.get_host_throttle(urlsplit(url).hostname)
+        if not throttle.acquire(timeout=_time_left(deadline)):
+            raise TimeoutError(f"Rate limit for {throttle.host} not available before the deadline")
+    
+    time_left = _time_left(deadline)
+    if time_left is not None:
+        # Never wait past the deadline, but keep a small floor so the request can be attempted
+        time_left = max(time_left, 0.1)
+        if isinstance(timeout, tuple):
+            timeout = tuple(min(t, time_left) for t in timeout)
+        else:
+            timeout = min(timeout, time_left) if timeout else time_left
+    
+    throttled, retry_after = False, None
+    try:
+        response = get_http_session().get(url, params=params, timeout=timeout, headers=headers)
+        throttled, retry_after = _throttle_signal(response)
+        return response
+    except requests.exceptions.Timeout:
+        # A site that stops answering in time is treated like one that pushes back
+        throttled = True
+        raise
+    finally:
+        if throttle is not None:
+            throttle.release(throttled, retry_after)
+
+def _time_left(deadline):
+    """
+    Seconds remaining until a time.monotonic() deadline
+    
+    Args:
+        deadline (float): Deadline, or None for no deadline
+        
+    Returns:
+        float: Remaining seconds (never negative), or None if there is no deadline
+    """
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+def _fetch_job_page_text(url, timeout):
+    """
+    Download a job page and extract its main text
+    
+    Args:
+        url (str): URL of the job listing
+        timeout (float): Download timeout in seconds
+        
+    Returns:
+        str: Extracted text, or None if nothing could be extracted
+    """
+    response = http_get(url, timeout=timeout, cache_kind='detail', cache_url=canonicalize_url(url))
+    if response.status_code == 200 and response.text:
+        return trafilatura.extract(response.text)
+    return None
+
+def _preview(description):
+    """Shorten a job description to the preview kept with scraped jobs."""
+    if len(description) > DESCRIPTION_PREVIEW_CHARS:
+        return description[:DESCRIPTION_PREVIEW_CHARS] + "..."
+    return description
+
+def fetch_job_descriptions(urls, max_workers=DETAIL_FETCH_WORKERS, timeout=DETAIL_FETCH_TIMEOUT, deadline=None):
+    """
+    Fetch the text of several job pages concurrently
+    
+    Args:
+        urls (list): Job page URLs; entries that are empty or "#" are skipped
+        max_workers (int): Maximum number of pages fetched at the same time
+        timeout (float): Timeout in seconds for each page fetch
+        deadline (float, optional): time.monotonic() value after which pages still
+            in flight are abandoned
+        
+    Returns:
+        list: Extracted text for each URL in the same order, None where the fetch failed
+    """
+    results = [None] * len(urls)
+    pending = [(i, url) for i, url in enumerate(urls) if url and url != "#"]
+    if not pending:
+        return results
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending))))
+    try:
+        futures = [(i, executor.submit(_fetch_job_page_text, url, timeout)) for i, url in pending]
+        wait([future for _, future in futures], timeout=_time_left(deadline))
+        for i, future in futures:
+            if not future.done():
+                continue
+            try:
+                results[i] = future.result()
+            except Exception as desc_err:
+                print(f"Error fetching job description: {desc_err}")
+    finally:
+        # Don't block on fetches that missed the deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    return results
 
 # Helper function to get detailed job description
 def get_detailed_job_description(url):
@@ -234,12 +758,105 @@ def get_detailed_job_description(url):
     Returns:
         str: Detailed job description
     """
+    known = get_known_description(url, full=True)
+    if known:
+        return known
+    
+    # Stored previews are shortened; the full page comes from the HTTP cache,
+    # keyed by the job's canonical URL, when any link to it was fetched recently
     try:
-        downloaded = trafilatura.fetch_url(url)
-        if downloaded:
-            job_content = trafilatura.extract(downloaded)
+        response = http_get(url, cache_kind='detail', cache_url=canonicalize_url(url))
+        if response.status_code == 200 and response.text:
+            job_content = trafilatura.extract(response.text)
             return job_content if job_content else "No detailed description available"
         return "Failed to fetch job details"
     except Exception as e:
         print(f"Error fetching detailed job description: {e}")
         return "Error fetching job details"
+
+# Scraper functions available to search_jobs, by source name
+SCRAPERS = {
+    'Indeed': scrape_indeed,
+    'LinkedIn': scrape_linkedin,
+}
+
+def _run_source(scraper, keywords, location, job_type, deadline):
+    """Run one scraper and time it; used as the worker for search_jobs."""
+    started = time.monotonic()
+    try:
+        jobs_df = scraper(keywords, location, job_type, deadline=deadline)
+        return jobs_df, time.monotonic() - started, None
+    except Exception as e:
+        return pd.DataFrame(), time.monotonic() - started, e
+
+def search_jobs(keywords, location, job_type=None, sources=None, timeout=SOURCE_TIMEOUT):
+    """
+    Search several job sources concurrently and combine the results
+    
+    Every source runs in its own thread with its own deadline. A source that is
+    still running when its deadline passes returns whatever it has (e.g. LinkedIn
+    jobs keep placeholder descriptions); a source that has not returned at all
+    shortly after its deadline is reported as timed out and contributes no jobs.
+    
+    Args:
+        keywords (list): List of keywords to search for
+        location (str): Location to search in
+        job_type (str, optional): Type of job (Full-time, Part-time, etc)
+        sources (list, optional): Source names from SCRAPERS; defaults to all sources
+        timeout (float or dict, optional): Deadline in seconds for every source, or
+            a dict of per-source deadlines keyed by source name
+        
+    Returns:
+        tuple: (pandas.DataFrame of combined job listings, list of per-source report
+            dicts with 'source', 'status', 'jobs', 'elapsed' and 'error' keys)
+    """
+    sources = list(sources) if sources else list(SCRAPERS)
+    started = time.monotonic()
+    
+    def source_timeout(source):
+        if isinstance(timeout, dict):
+            return timeout.get(source, SOURCE_TIMEOUT)
+        return timeout
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, len(sources)))
+    futures = {}
+    for source in sources:
+        deadline = started + source_timeout(source)
+        futures[source] = executor.submit(_run_source, SCRAPERS[source], keywords, location, job_type, deadline)
+    
+    results = []
+    report = []
+    try:
+        for source in sources:
+            future = futures[source]
+            deadline = started + source_timeout(source)
+            entry = {'source': source, 'status': 'ok', 'jobs': 0, 'elapsed': None, 'error': None}
+            try:
+                jobs_df, elapsed, error = future.result(timeout=_time_left(deadline + SOURCE_TIMEOUT_GRACE))
+            except FuturesTimeoutError:
+                entry['status'] = 'timeout'
+                entry['elapsed'] = round(time.monotonic() - started, 2)
+                future.cancel()
+                report.append(entry)
+                continue
+            
+            entry['elapsed'] = round(elapsed, 2)
+            if error is not None:
+                entry['status'] = 'error'
+                entry['error'] = str(error)
+                print(f"Error searching {source}: {error}")
+            else:
+                entry['jobs'] = len(jobs_df)
+                if elapsed >= source_timeout(source):
+                    entry['status'] = 'partial'
+                results.append(jobs_df)
+            report.append(entry)
+    finally:
+        # Sources that blew their deadline are left to finish in the background
+        executor.shutdown(wait=False)
+    
+    results = [df for df in results if not df.empty]
+    combined_jobs = pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+    # Categories differ per source, so concat falls back to object columns
+    combined_jobs = apply_job_dtypes(combined_jobs)
+    return combined_jobs, report
@@ -0,0 +1,260 @@
+import re
+import math
+import threading
+import datetime
+from collections import Counter
+import numpy as np
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Term frequency weight of each indexed field
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'company': 1.5,
+    'location': 1.0,
+    'description': 1.0,
+}
+
+# Fields that can be filtered on; their tokens are also indexed under a prefix
+# (e.g. "loc:indore") that never collides with a ranked term
+FILTER_FIELDS = {
+    'location': 'loc:',
+    'job_type': 'type:',
+    'source': 'src:',
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = frozenset("a an and are as at be by for from in is of on or the to with".split())
+
+def tokenize(text):
+    """
+    Split text into lowercase index terms
+
+    Keeps '+' and '#' inside words so "C++" and "C#" stay searchable.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        list: Terms in order of appearance, without stopwords
+    """
+    if not isinstance(text, str):
+        return []
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+def _timestamp(value):
+    """Seconds since the epoch for a datetime or ISO string, NaN if unknown."""
+    if isinstance(value, str):
+        try:
+            value = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            return math.nan
+    if isinstance(value, datetime.datetime):
+        try:
+            return value.timestamp()
+        except (ValueError, OverflowError):
+            return math.nan
+    return math.nan
+
+class SearchIndex:
+    """
+    In-memory inverted index over job postings with BM25 ranking
+
+    Postings are dicts (doc id -> weighted term frequency) so jobs can be added,
+    replaced and removed one at a time. Queries use sorted numpy copies of the
+    postings they touch, rebuilt only for terms that changed since the last query.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._postings = {}
+        self._arrays = {}
+        self._doc_ids = {}
+        self._keys = []
+        self._docs = []
+        self._doc_terms = []
+        self._lengths = []
+        self._dates = []
+        self._live = []
+        self._total_length = 0.0
+        self._doc_count = 0
+        self._columns = None
+
+    def __len__(self):
+        return self._doc_count
+
+    def add_jobs(self, jobs, key):
+        """
+        Index jobs, replacing earlier versions with the same key
+
+        Args:
+            jobs (iterable): Job dictionaries
+            key (callable): Function returning a job's unique key
+        """
+        with self._lock:
+            for job in jobs:
+                doc_key = key(job)
+                self._remove(doc_key)
+                self._add(doc_key, job)
+            if len(self._docs) > 2 * self._doc_count + 1000:
+                self._compact()
+            # Cheaper than tracking every touched term; query terms are re-sorted lazily
+            self._arrays.clear()
+            self._columns = None
+
+    def remove_jobs(self, keys):
+        """
+        Remove jobs from the index
+
+        Args:
+            keys (iterable): Keys of the jobs to remove
+        """
+        with self._lock:
+            for doc_key in keys:
+                self._remove(doc_key)
+            self._columns = None
+
+    def _add(self, doc_key, job):
+        terms = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token, count in Counter(tokenize(job.get(field))).items():
+                terms[token] = terms.get(token, 0.0) + count * weight
+        for field, prefix in FILTER_FIELDS.items():
+            for token in tokenize(job.get(field)):
+                terms[prefix + token] = 0.0
+
+        doc_id = len(self._docs)
+        length = sum(terms.values())
+        self._doc_ids[doc_key] = doc_id
+        self._keys.append(doc_key)
+        self._docs.append(job)
+        self._doc_terms.append(list(terms))
+        self._lengths.append(length)
+        self._dates.append(_timestamp(job.get('date_posted')))
+        self._live.append(True)
+        self._total_length += length
+        self._doc_count += 1
+
+        postings = self._postings
+        for term, frequency in terms.items():
+            term_postings = postings.get(term)
+            if term_postings is None:
+                postings[term] = {doc_id: frequency}
+            else:
+                term_postings[doc_id] = frequency
+
+    def _remove(self, doc_key):
+        doc_id = self._doc_ids.pop(doc_key, None)
+        if doc_id is None:
+            return
+        for term in self._doc_terms[doc_id]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+            self._arrays.pop(term, None)
+        # Doc ids are never reused; the slot just stops matching until _compact
+        self._keys[doc_id] = None
+        self._docs[doc_id] = None
+        self._doc_terms[doc_id] = []
+        self._total_length -= self._lengths[doc_id]
+        self._live[doc_id] = False
+        self._doc_count -= 1
+
+    def _compact(self):
+        """Re-number the live documents once replaced ones take up most of the slots."""
+        live = [(doc_key, job) for doc_key, job, alive in zip(self._keys, self._docs, self._live) if alive]
+        self._reset()
+        for doc_key, job in live:
+            self._add(doc_key, job)
+
+    def _term_arrays(self, term):
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self._postings.get(term, {})
+            doc_ids = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+            frequencies = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            order = np.argsort(doc_ids)
+            arrays = (doc_ids[order], frequencies[order])
+            self._arrays[term] = arrays
+        return arrays
+
+    def _column_arrays(self):
+        if self._columns is None:
+            self._columns = (np.asarray(self._lengths, dtype=np.float64),
+                             np.asarray(self._dates, dtype=np.float64))
+        return self._columns
+
+    def search(self, keywords=None, location=None, job_type=None, sources=None, since=None, limit=50):
+        """
+        Find the jobs matching every keyword, best BM25 score first
+
+        Args:
+            keywords (list or str, optional): Keywords that must all appear in the
+                title, company, location or description
+            location (str, optional): Words that must all appear in the location
+            job_type (str, optional): Words that must all appear in the job type
+            sources (list, optional): Only return jobs from these sources
+            since (datetime.datetime, optional): Only return jobs posted at or after this time
+            limit (int, optional): Maximum number of results; None for all
+
+        Returns:
+            list: (job dict, score) tuples
+        """
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        query_terms = list(dict.fromkeys(token for keyword in (keywords or []) for token in tokenize(keyword)))
+        filter_terms = [FILTER_FIELDS['location'] + token for token in tokenize(location)]
+        filter_terms += [FILTER_FIELDS['job_type'] + token for token in tokenize(job_type)]
+
+        with self._lock:
+            if self._doc_count == 0:
+                return []
+            lengths, dates = self._column_arrays()
+
+            # Intersect postings, rarest term first
+            required = sorted(query_terms + filter_terms, key=lambda term: len(self._postings.get(term, ())))
+            if required:
+                candidates = self._term_arrays(required[0])[0]
+                for term in required[1:]:
+                    if len(candidates) == 0:
+                        break
+                    candidates = np.intersect1d(candidates, self._term_arrays(term)[0], assume_unique=True)
+            else:
+                candidates = np.flatnonzero(np.asarray(self._live))
+
+            if sources:
+                allowed = np.zeros(len(candidates), dtype=bool)
+                for source in sources:
+                    for token in tokenize(source):
+                        source_ids = self._term_arrays(FILTER_FIELDS['source'] + token)[0]
+                        allowed |= np.isin(candidates, source_ids, assume_unique=True)
+                candidates = candidates[allowed]
+            if since is not None and len(candidates):
+                candidates = candidates[dates[candidates] >= _timestamp(since)]
+            if len(candidates) == 0:
+                return []
+
+            # BM25 over the candidates
+            scores = np.zeros(len(candidates))
+            average_length = self._total_length / self._doc_count or 1.0
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[candidates] / average_length)
+            for term in query_terms:
+                doc_ids, frequencies = self._term_arrays(term)
+                frequency = frequencies[np.searchsorted(doc_ids, candidates)]
+                idf = math.log(1 + (self._doc_count - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+                scores += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+            if limit is not None and len(candidates) > limit:
+                top = np.argpartition(-scores, limit - 1)[:limit]
+            else:
+                top = np.arange(len(candidates))
+            # Best score first; newer postings (higher doc id) break ties
+            top = top[np.lexsort((-candidates[top], -scores[top]))]
+            return [(self._docs[candidates[i]], float(scores[i])) for i in top]
@@ -0,0 +1,408 @@
+import os
+import sys
+import json
+import sqlite3
+import datetime
+import threading
+from utils import canonicalize_url, archive_key
+
+SQLITE_DB_PATH = os.getenv("JOBFINDER_DB_PATH", "jobfinder.db")
+
+# Job fields stored as columns; any other field of a record goes into `extra`
+JOB_FIELDS = ['title', 'company', 'location', 'description', 'url', 'job_type', 'date_posted', 'source']
+TABLE_FIELDS = {
+    'jobs': JOB_FIELDS + ['first_seen', 'last_seen'],
+    'saved': JOB_FIELDS + ['saved_date'],
+    'applied': JOB_FIELDS + ['applied_date'],
+}
+ALERT_FIELDS = ['id', 'name', 'keywords', 'location', 'job_type', 'email', 'created_date']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    rowid INTEGER PRIMARY KEY,
+    canonical_url TEXT,
+    {columns},
+    extra TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_canonical_url ON {table} (canonical_url);
+CREATE INDEX IF NOT EXISTS idx_{table}_date_posted ON {table} (date_posted);
+CREATE INDEX IF NOT EXISTS idx_{table}_source ON {table} (source);
+"""
+
+# Indexes on columns added after the first release, created once the columns exist
+_EXTRA_INDEXES = {
+    'jobs': ['first_seen', 'last_seen'],
+}
+
+_ALERTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    name TEXT,
+    keywords TEXT,
+    location TEXT,
+    job_type TEXT,
+    email TEXT,
+    created_date TEXT,
+    extra TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_alerts_id ON alerts (id);
+"""
+
+_local = threading.local()
+
+def get_connection():
+    """
+    Get this thread's connection to the job database, creating the schema if needed
+
+    Connections use WAL mode so the Streamlit sessions and the alert checker can
+    read while another thread writes.
+
+    Returns:
+        sqlite3.Connection: Connection for the current thread
+    """
+    connection = getattr(_local, 'connection', None)
+    if connection is None or getattr(_local, 'path', None) != SQLITE_DB_PATH:
+        connection = sqlite3.connect(SQLITE_DB_PATH, timeout=30)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            for table, fields in TABLE_FIELDS.items():
+                columns = ',\n    '.join(f"{field} TEXT" for field in fields)
+                connection.executescript(_SCHEMA.format(table=table, columns=columns))
+                _add_missing_columns(connection, table, fields)
+                for field in _EXTRA_INDEXES.get(table, []):
+                    connection.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{field} ON {table} ({field})")
+            connection.executescript(_ALERTS_SCHEMA)
+        _local.connection = connection
+        _local.path = SQLITE_DB_PATH
+    return connection
+
+def _add_missing_columns(connection, table, fields):
+    """Add columns introduced since the database was created."""
+    existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+    for field in fields:
+        if field not in existing:
+            connection.execute(f"ALTER TABLE {table} ADD COLUMN {field} TEXT")
+
+def _to_text(value):
+    """Convert a record value to what is stored in a TEXT column."""
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, float) and value != value:  # NaN from a DataFrame row
+        return None
+    return value
+
+def _json_default(obj):
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+def _canonical_key(url):
+    """Canonical URL used for uniqueness; None for jobs without a link, which never collide."""
+    canonical = canonicalize_url(url)
+    return canonical if canonical and canonical != "#" else None
+
+def _row_key(table, record):
+    """Value stored as canonical_url; archived jobs without a link use their archive key, as merge_jobs does."""
+    if table == 'jobs':
+        return archive_key(record)
+    return _canonical_key(record.get('url'))
+
+def _record_row(record, fields):
+    """Split a record into column values and an `extra` JSON blob."""
+    values = [_to_text(record.get(field)) for field in fields]
+    extra = {k: v for k, v in record.items() if k not in fields}
+    return values, json.dumps(extra, default=_json_default) if extra else None
+
+def _row_record(row, fields):
+    """Rebuild a record dict from a database row."""
+    record = {field: row[field] for field in fields}
+    if row['extra']:
+        record.update(json.loads(row['extra']))
+    return record
+
+def read_records(table):
+    """
+    Read all job records from a table, in insertion order
+
+    Args:
+        table (str): 'jobs', 'saved' or 'applied'
+
+    Returns:
+        list: Job dictionaries with dates as ISO strings, like the JSON files
+    """
+    fields = TABLE_FIELDS[table]
+    rows = get_connection().execute(
+        f"SELECT {', '.join(fields)}, extra FROM {table} ORDER BY rowid"
+    ).fetchall()
+    return [_row_record(row, fields) for row in rows]
+
+def insert_record(table, record, replace=False):
+    """
+    Insert a job record unless a record with the same canonical URL exists
+
+    Args:
+        table (str): 'jobs', 'saved' or 'applied'
+        record (dict): Job dictionary
+        replace (bool): Overwrite an existing record with the same canonical URL
+
+    Returns:
+        bool: True if the record was written
+    """
+    return insert_records(table, [record], replace) > 0
+
+def insert_records(table, records, replace=False):
+    """
+    Insert several job records in one transaction
+
+    Args:
+        table (str): 'jobs', 'saved' or 'applied'
+        records (list): Job dictionaries
+        replace (bool): Overwrite existing records with the same canonical URL
+
+    Returns:
+        int: Number of records written
+    """
+    connection = get_connection()
+    with connection:
+        return _insert_rows(connection, table, records, replace)
+
+def _insert_rows(connection, table, records, replace):
+    """Insert records using an open transaction; returns the number written."""
+    fields = TABLE_FIELDS[table]
+    verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+    sql = (f"{verb} INTO {table} (canonical_url, {', '.join(fields)}, extra) "
+           f"VALUES ({', '.join(['?'] * (len(fields) + 2))})")
+
+    written = 0
+    for record in records:
+        values, extra = _record_row(record, fields)
+        cursor = connection.execute(sql, [_row_key(table, record)] + values + [extra])
+        written += cursor.rowcount
+    return written
+
+def replace_records(table, records):
+    """
+    Replace the whole contents of a table in one transaction
+
+    Args:
+        table (str): 'jobs', 'saved' or 'applied'
+        records (list): Job dictionaries
+    """
+    connection = get_connection()
+    with connection:
+        connection.execute(f"DELETE FROM {table}")
+        _insert_rows(connection, table, records, replace=True)
+
+def merge_jobs(records, keys, seen_at, cutoff, max_rows, keep_descriptions=()):
+    """
+    Upsert scraped jobs into the jobs table and apply retention, in one transaction
+
+    Only the scraped rows are written. A job already stored keeps its
+    first_seen time, and its description when the new one is in
+    `keep_descriptions`; its other fields are replaced. Afterwards jobs last
+    seen before `cutoff` are deleted, then the jobs seen least recently
+    beyond `max_rows`.
+
+    Args:
+        records (list): Scraped job dictionaries
+        keys (list): Archive key of each record, stored as canonical_url
+        seen_at (str): ISO time of the scrape, stored as last_seen
+        cutoff (str): ISO time; jobs last seen before it are deleted
+        max_rows (int): Maximum number of jobs kept
+        keep_descriptions (tuple): Placeholder descriptions that never replace a stored one
+
+    Returns:
+        tuple: (deleted job records, stored records of the scraped jobs)
+    """
+    fields = TABLE_FIELDS['jobs']
+    placeholders = ', '.join(['?'] * len(keep_descriptions))
+    updates = [f"{field} = excluded.{field}" for field in JOB_FIELDS if field != 'description']
+    updates += [
+        f"description = CASE WHEN excluded.description IN ({placeholders}) AND jobs.description IS NOT NULL"
+        " THEN jobs.description ELSE excluded.description END",
+        "first_seen = COALESCE(jobs.first_seen, excluded.first_seen)",
+        "last_seen = excluded.last_seen",
+        "extra = COALESCE(excluded.extra, jobs.extra)",
+    ]
+    upsert = (f"INSERT INTO jobs (canonical_url, {', '.join(fields)}, extra) "
+              f"VALUES ({', '.join(['?'] * (len(fields) + 2))}) "
+              f"ON CONFLICT(canonical_url) DO UPDATE SET {', '.join(updates)}")
+    select = f"SELECT {', '.join(fields)}, extra FROM jobs"
+    # Rows beyond the cap, newest first so the oldest are the ones skipped past
+    overflow = "SELECT rowid FROM jobs ORDER BY last_seen DESC, rowid DESC LIMIT -1 OFFSET ?"
+
+    connection = get_connection()
+    with connection:
+        _key_linkless_jobs(connection)
+        # Jobs stored before the archive kept timestamps count as seen now, and
+        # as first seen when posted
+        connection.execute("UPDATE jobs SET first_seen = COALESCE(first_seen, date_posted, ?), last_seen = ? "
+                           "WHERE last_seen IS NULL",
+                           (seen_at, seen_at))
+        for record, key in zip(records, keys):
+            values, extra = _record_row(dict(record, first_seen=seen_at, last_seen=seen_at), fields)
+            connection.execute(upsert, [key] + values + [extra] + list(keep_descriptions))
+
+        deleted = connection.execute(f"{select} WHERE last_seen < ?", (cutoff,)).fetchall()
+        connection.execute("DELETE FROM jobs WHERE last_seen < ?", (cutoff,))
+        deleted += connection.execute(f"{select} WHERE rowid IN ({overflow})", (max_rows,)).fetchall()
+        connection.execute(f"DELETE FROM jobs WHERE rowid IN ({overflow})", (max_rows,))
+
+        merged = []
+        unique_keys = list(dict.fromkeys(keys))
+        for start in range(0, len(unique_keys), 500):
+            chunk = unique_keys[start:start + 500]
+            merged += connection.execute(
+                f"{select} WHERE canonical_url IN ({', '.join(['?'] * len(chunk))})", chunk
+            ).fetchall()
+    return [_row_record(row, fields) for row in deleted], [_row_record(row, fields) for row in merged]
+
+def _key_linkless_jobs(connection):
+    """
+    Give jobs migrated without a canonical URL (no link) their archive key
+
+    Earlier migrations stored NULL for them, so merge_jobs never matched them
+    and inserted the same jobs again. A job whose key is already taken is such
+    a duplicate and is deleted.
+    """
+    rows = connection.execute(
+        "SELECT rowid, title, company, location, url FROM jobs WHERE canonical_url IS NULL"
+    ).fetchall()
+    for row in rows:
+        key = archive_key(dict(row))
+        if connection.execute("SELECT 1 FROM jobs WHERE canonical_url = ?", (key,)).fetchone():
+            connection.execute("DELETE FROM jobs WHERE rowid = ?", (row['rowid'],))
+        else:
+            connection.execute("UPDATE jobs SET canonical_url = ? WHERE rowid = ?", (key, row['rowid']))
+
+def read_descriptions(canonical_url, tables=('jobs', 'saved', 'applied')):
+    """
+    Read the stored descriptions of a job
+
+    Args:
+        canonical_url (str): Canonical URL of the job
+        tables (tuple): Tables to look in
+
+    Returns:
+        list: The job's description in each table that has it
+    """
+    connection = get_connection()
+    descriptions = []
+    for table in tables:
+        row = connection.execute(
+            f"SELECT description FROM {table} WHERE canonical_url = ?", (canonical_url,)
+        ).fetchone()
+        if row:
+            descriptions.append(row['description'])
+    return descriptions
+
+def delete_record(table, url):
+    """
+    Delete the job record with the same canonical URL as `url`
+
+    Args:
+        table (str): 'jobs', 'saved' or 'applied'
+        url (str): Job URL
+
+    Returns:
+        bool: True if a record was deleted
+    """
+    canonical_url = _canonical_key(url)
+    if canonical_url is None:
+        return False
+    connection = get_connection()
+    with connection:
+        cursor = connection.execute(f"DELETE FROM {table} WHERE canonical_url = ?", (canonical_url,))
+    return cursor.rowcount > 0
+
+def read_alerts():
+    """
+    Read all job alerts, in creation order
+
+    Returns:
+        list: Alert dictionaries with created_date as an ISO string, like job_alerts.json
+    """
+    rows = get_connection().execute(
+        f"SELECT {', '.join(ALERT_FIELDS)}, extra FROM alerts ORDER BY rowid"
+    ).fetchall()
+    alerts = []
+    for row in rows:
+        alert = _row_record(row, ALERT_FIELDS)
+        alert['keywords'] = json.loads(alert['keywords']) if alert['keywords'] else []
+        alerts.append(alert)
+    return alerts
+
+def insert_alert(alert):
+    """
+    Insert or update a job alert
+
+    Args:
+        alert (dict): Alert dictionary with a unique 'id'
+    """
+    alert = dict(alert, keywords=json.dumps(alert.get('keywords') or []))
+    values, extra = _record_row(alert, ALERT_FIELDS)
+    connection = get_connection()
+    with connection:
+        connection.execute(
+            f"INSERT OR REPLACE INTO alerts ({', '.join(ALERT_FIELDS)}, extra) "
+            f"VALUES ({', '.join(['?'] * (len(ALERT_FIELDS) + 1))})",
+            values + [extra]
+        )
+
+def delete_alert(alert_id):
+    """
+    Delete a job alert by ID
+
+    Args:
+        alert_id (str): ID of the alert to delete
+    """
+    connection = get_connection()
+    with connection:
+        connection.execute("DELETE FROM alerts WHERE id = ?", (alert_id,))
+
+def migrate_from_json(jobs_path="jobs_data.json", saved_path="saved_jobs.json",
+                      applied_path="applied_jobs.json", alerts_path="job_alerts.json"):
+    """
+    Import the JSON data files into the SQLite database
+
+    Existing rows are kept; records whose canonical URL (or alert ID) is already
+    in the database are skipped, so running the migration twice is harmless.
+
+    Returns:
+        dict: Number of records imported per table
+    """
+    def read_json(path):
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    imported = {
+        'jobs': insert_records('jobs', read_json(jobs_path)),
+        'saved': insert_records('saved', read_json(saved_path)),
+        'applied': insert_records('applied', read_json(applied_path)),
+        'alerts': 0,
+    }
+
+    existing_ids = {alert['id'] for alert in read_alerts()}
+    for alert in read_json(alerts_path):
+        if alert.get('id') not in existing_ids:
+            insert_alert(alert)
+            imported['alerts'] += 1
+    return imported
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'migrate':
+        # Fold pending journal entries into the JSON files before importing them
+        import data_manager
+        for path in (data_manager.SAVED_JOBS_PATH, data_manager.APPLIED_JOBS_PATH, data_manager.ALERTS_PATH):
+            data_manager.compact_journal(path)
+        counts = migrate_from_json()
+        print(f"Imported into {SQLITE_DB_PATH}: " + ", ".join(f"{n} {table}" for table, n in counts.items()))
+    else:
+        print("Usage: python sqlite_store.py migrate")
@@ -1,5 +1,6 @@
 import datetime
 import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
 def format_date(date_obj):
     """
@@ -110,3 +111,86 @@ def truncate_text(text, max_length=200):
         truncated = truncated[:last_space]
     
     return truncated + "..."
+
+# Job IDs embedded in job board URLs
+_LINKEDIN_JOB_ID = re.compile(r'/jobs/view/(?:[^/?#]*-)?(\d+)/?(?:[?#]|$)')
+_LINKEDIN_CURRENT_JOB_ID = re.compile(r'[?&]currentJobId=(\d+)')
+_INDEED_JOB_KEY = re.compile(r'[?&](?:jk|vjk)=([0-9a-zA-Z]+)')
+
+def extract_job_id(url):
+    """
+    Extract a canonical job ID from a LinkedIn or Indeed job URL
+    
+    Args:
+        url (str): Job URL, e.g. .../jobs/view/python-developer-at-acme-4189885309?refId=...
+            or https://www.indeed.com/rc/clk?jk=0123456789abcdef&...
+        
+    Returns:
+        str: ID such as 'linkedin:4189885309' or 'indeed:0123456789abcdef', or None
+    """
+    if not url or not isinstance(url, str):
+        return None
+    
+    lowered = url.lower()
+    if 'linkedin.' in lowered:
+        match = _LINKEDIN_JOB_ID.search(url) or _LINKEDIN_CURRENT_JOB_ID.search(url)
+        if match:
+            return f"linkedin:{match.group(1)}"
+    elif 'indeed.' in lowered:
+        match = _INDEED_JOB_KEY.search(url)
+        if match:
+            return f"indeed:{match.group(1).lower()}"
+    return None
+
+# Query parameters that only track how a job link was reached
+TRACKING_PARAMS = {
+    'trackingid', 'refid', 'position', 'pagenum', 'trk', 'trkinfo', 'from', 'tk',
+    'bb', 'xkcb', 'fccid', 'vjs', 'advn', 'adid', 'sjdu', 'ebp', 'originalsubdomain',
+}
+
+def canonicalize_url(url):
+    """
+    Reduce a job URL to a canonical form so links to the same posting compare equal
+    
+    LinkedIn and Indeed job links are rewritten to their bare job page URL;
+    other URLs lose their fragment and tracking parameters and get a lowercase
+    host and sorted query string.
+    
+    Args:
+        url (str): Job URL
+        
+    Returns:
+        str: Canonical URL (the input unchanged if it is not a URL)
+    """
+    if not url or not isinstance(url, str) or url == "#":
+        return url
+    
+    job_id = extract_job_id(url)
+    if job_id:
+        site, key = job_id.split(':', 1)
+        if site == 'linkedin':
+            return f"https://www.linkedin.com/jobs/view/{key}"
+        return f"https://www.indeed.com/viewjob?jk={key}"
+    
+    parts = urlsplit(url)
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith('utm_')
+    ]
+    query.sort()
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/') or '/', urlencode(query), ''))
+
+def archive_key(job):
+    """
+    Key of a job in the job archive
+    
+    Args:
+        job (dict): Job dictionary
+        
+    Returns:
+        str: Canonical URL of the job, or its title/company/location when it has no link
+    """
+    canonical_url = canonicalize_url(job.get('url'))
+    if canonical_url and canonical_url != '#':
+        return canonical_url
+    return '|'.join(str(job.get(field) or '').strip().lower() for field in ('title', 'company', 'location'))